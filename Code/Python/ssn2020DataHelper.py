@@ -20,6 +20,85 @@ pd.options.mode.chained_assignment = None #turn of pandas chained warnings
 import json
 import re
 import numpy as np
+from multiprocessing import Pool
+from functools import partial
+from collections import deque
+import hashlib
+import os
+
+# %% Settings
+
+#Version of the parsed data held in the cache. This is part of every cache key, so
+#it needs to be changed whenever the data returned by getSingleMatchData or
+#mergeMatchData changes, otherwise the old cached data will still be loaded
+cacheVersion = '1'
+
+#Names of the data dictionaries extracted from each match
+matchDataNames = ['matchInfo', 'teamInfo', 'playerInfo', 'scoreFlowData',
+                  'substitutionData', 'lineUpData', 'individualLineUpData',
+                  'playerStatsData', 'teamStatsData']
+
+#Columns within the data dictionaries that hold lists in each row. These are
+#stored as .json strings in the cached data files
+nestedDataColumns = {'matchInfo': ['periodSeconds'],
+                     'lineUpData': ['lineUpId', 'lineUpName']}
+
+#Names of the dataframes for each of the data dictionaries
+matchDataFrameNames = {'matchInfo': 'df_matchInfo', 'teamInfo': 'df_teamInfo',
+                       'playerInfo': 'df_playerInfo', 'scoreFlowData': 'df_scoreFlow',
+                       'substitutionData': 'df_substitutions', 'lineUpData': 'df_lineUp',
+                       'individualLineUpData': 'df_individualLineUp',
+                       'playerStatsData': 'df_playerStatsData',
+                       'teamStatsData': 'df_teamStatsData'}
+
+#Categories of the text and code columns with few unique values. These are fixed
+#so that every match has the same categories, and the dataframes of different
+#matches keep their categorical type when concatenated
+compactCategories = {'scoreName': pd.CategoricalDtype(['goal', 'miss', '2pt Goal', '2pt Miss']),
+                     'periodCategory': pd.CategoricalDtype(['standard', 'twoPoint']),
+                     'shotCircle': pd.CategoricalDtype(['innerCircle', 'outerCircle']),
+                     'distanceCode': pd.CategoricalDtype([0, 1, 2, 3]),
+                     'positionCode': pd.CategoricalDtype([0, 1, 2, 3]),
+                     'playerPosition': pd.CategoricalDtype(['GS', 'GA', 'WA', 'C', 'WD', 'GD', 'GK', 'S'])}
+
+#Compact data types for the score flow and lineup dataframes. Text columns with
+#few unique values are set as categories, and the integer columns are set to the
+#smallest type that fits the values seen in a season of data
+compactSchema = {'df_scoreFlow': {'roundNo': 'int8', 'matchNo': 'int8',
+                                  'homeScore': 'int16', 'awayScore': 'int16',
+                                  'preShotAhead': 'float32', 'postShotAhead': 'float32',
+                                  'preShotMargin': 'int16', 'postShotMargin': 'int16',
+                                  'period': 'int8', 'periodSeconds': 'int16',
+                                  'periodCategory': compactCategories['periodCategory'], 'matchSeconds': 'int16',
+                                  'playerId': 'int32', 'squadId': 'int32',
+                                  'scoreName': compactCategories['scoreName'], 'shotOutcome': 'bool',
+                                  'scorePoints': 'int8', 'distanceCode': compactCategories['distanceCode'],
+                                  'positionCode': compactCategories['positionCode'],
+                                  'shotCircle': compactCategories['shotCircle']},
+                 'df_lineUp': {'matchNo': 'int8', 'roundNo': 'int8', 'squadId': 'int32',
+                               'matchSecondsStart': 'int16', 'matchSecondsEnd': 'int16',
+                               'durationSeconds': 'int16', 'pointsFor': 'int16',
+                               'pointsAgainst': 'int16', 'plusMinus': 'int16'},
+                 'df_individualLineUp': {'playerId': 'int32', 'playerName': 'category',
+                                         'squadId': 'int32', 'playerPosition': compactCategories['playerPosition'],
+                                         'roundNo': 'int8', 'matchNo': 'int8',
+                                         'matchSecondsStart': 'int16', 'matchSecondsEnd': 'int16',
+                                         'durationSeconds': 'int16', 'pointsFor': 'int16',
+                                         'pointsAgainst': 'int16', 'plusMinus': 'int16'}}
+
+#Names of the axes of the shot count array from getShotCountCube, in order
+shotCountAxes = ['squadId', 'roundNo', 'matchNo', 'period', 'periodCategory',
+                 'shotCircle', 'shotType', 'shotOutcome']
+
+# %% sortedNicely
+
+def sortedNicely(l):
+    """ Sorts the given iterable in the way that is expected.
+    Required arguments:
+    l -- The iterable to be sorted. """
+    convert = lambda text: int(text) if text.isdigit() else text
+    alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
+    return sorted(l, key = alphanum_key)
 
 # %% getMatchData
 
@@ -28,8 +107,9 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                  exportTeamData = True, exportPlayerData = True,
                  exportMatchData = True, exportScoreData = True,
                  exportLineUpData = True, exportPlayerStatsData = True,
-                 exportTeamStatsData = True):
-    
+                 exportTeamStatsData = True, nProcesses = 1,
+                 cacheDir = None, compactDtypes = True):
+
     # Function for importing the Champion Data .json files for SSN 2020
     #
     # Input:    jsonFileList - list of .json files to import
@@ -37,10 +117,429 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
     #           exportDict - boolean flag whether to return to data dictionaries
     #           exportDf - boolean flag whether to export the dataframes
     #           exportTeamData - boolean flag whether to export the team data
-    #           exportPlayerData - boolean flag whether to export the player data 
+    #           exportPlayerData - boolean flag whether to export the player data
     #           exportMatchData - boolean flag whether to export the match data
     #           exportScoreData - boolean flag whether to export the score flow data
     #           exportLineUpData - boolean flag whether to export the line up data
+    #           nProcesses - number of processes to parse the .json files with.
+    #                        Values greater than 1 parse the files in a process
+    #                        pool (note that on Windows the calling script then
+    #                        needs an if __name__ == '__main__' guard)
+    #           cacheDir - directory to cache the parsed data in. The cache is
+    #                      keyed on the contents of each .json file and the
+    #                      squad lists, so only new or changed files are parsed.
+    #                      The default of None parses all files without caching
+    #           compactDtypes - boolean flag whether to set the score flow and
+    #                           lineup dataframes to the compact data types
+    #
+    # Output:   exportData - MatchData dictionary of the requested data. Any of
+    #                        the other data dictionaries or dataframes are
+    #                        extracted when first accessed with exportData[key]
+
+    #Sort json file list alpha-numerically so that round 1 remains first
+    jsonFileList = sortedNicely(jsonFileList)
+
+    #Identify the data that has been requested
+    exportFlags = {'matchInfo': exportMatchData, 'teamInfo': exportTeamData,
+                   'playerInfo': exportPlayerData, 'scoreFlowData': exportScoreData,
+                   'lineUpData': exportLineUpData, 'individualLineUpData': exportLineUpData,
+                   'playerStatsData': exportPlayerStatsData, 'teamStatsData': exportTeamStatsData}
+    dataNames = [dataName for dataName in exportFlags.keys() if exportFlags[dataName] is True]
+
+    #Set a dictionary to pack data in to. Only the requested data is extracted
+    #here, with any other data extracted when it is first accessed
+    exportData = MatchData(jsonFileList = jsonFileList, df_squadLists = df_squadLists,
+                           nProcesses = nProcesses, cacheDir = cacheDir,
+                           compactDtypes = compactDtypes)
+    exportData.addData(dataNames = dataNames, exportDict = exportDict, exportDf = exportDf)
+
+    # #Summarise substitution data
+    
+    # #Convert to dataframe
+    # df_substitutionData = pd.DataFrame.from_dict(substitutionData)
+    
+    # #Create a new column that converts substitution timing to be relative to
+    # #the quarter in the match (i.e. 0-1, 1-2, 2-3, 3-4)
+    # normSubTime = list()
+    # for ss in range(0,len(df_substitutionData)):
+        
+    #     #Get appropriate match and round timing data
+    #     roundBool = df_substitutionData['roundNo'][ss] == matchInfo['roundNo']
+    #     matchBool = df_substitutionData['matchNo'][ss] == matchInfo['matchNo']
+    #     bothBool = [a and b for a, b in zip(roundBool,matchBool)]
+    #     bothBoolInd = bothBool.index(bothBool == True) - 1
+    #     currPeriodSeconds = matchInfo['periodSeconds'][bothBoolInd]
+        
+    #     #Normalise current substitution data to period seconds
+    #     #Get current period index
+    #     periodInd = df_substitutionData['period'][ss]-1
+    #     #Normalise to seconds and append (ensure adding quarter val too)
+    #     normSubTime.append(df_substitutionData['periodSeconds'][ss] / currPeriodSeconds[periodInd] + periodInd)
+        
+    # #Append to dataframe
+    # df_substitutionData['normSubTime'] = normSubTime
+    
+    # #Calculate some summary substitution statistics
+    
+    # #Get unique squad ID's from substitution data
+    # squadIds = df_substitutionData['squadId'].unique()
+    # df_teamInfo = pd.DataFrame.from_dict(teamInfo)
+
+    # #Print heading
+    # print('Total number of substitutions by teams:')
+    
+    # #Loop through squads
+    # for tt in range(0,len(squadIds)):
+        
+    #     #Get the current squads total points
+    #     totalSubs = len(df_substitutionData.loc[(df_substitutionData['squadId'] == squadIds[tt]) &
+    #                                             (df_substitutionData['fromPos'] == 'S'),])
+        
+    #     #Get the total number of games played
+    #     totalGames = len(df_substitutionData['roundNo'].unique())
+        
+    #     #Calculate subs per game
+    #     perSubs = totalSubs/totalGames
+        
+    #     #Get the current team name
+    #     currTeamName = df_teamInfo.squadName[df_teamInfo['squadId'] == squadIds[tt]].reset_index()['squadName'][0]
+        
+    #     #Print results
+    #     print(currTeamName+': '+str(totalSubs)+' Total Subs ('+str(round(perSubs,2))+' per game)')
+        
+    # #Plot a histogram of normalised sub time to determine details of when they
+    # #are occurring
+    # from matplotlib import pyplot as plt
+    # num_bins = 40
+    # df_currSubs = df_substitutionData.loc[(df_substitutionData['fromPos'] == 'S')]
+    # plt.hist(df_currSubs['normSubTime'], num_bins, facecolor='blue', alpha=0.5)
+    # plt.show()
+    
+    # #Loop through squads and see if any differences
+    # colourDict = {'Fever': '#00953b',
+    #           'Firebirds': '#4b2c69',
+    #           'GIANTS': '#f57921',
+    #           'Lightning': '#fdb61c',
+    #           'Magpies': '#494b4a',
+    #           'Swifts': '#0082cd',
+    #           'Thunderbirds': '#e54078',
+    #           'Vixens': '#00a68e'}
+    
+    # for tt in range(0,len(squadIds)):    
+        
+    #     #Get current team name
+    #     currTeamName = df_teamInfo.squadNickname[df_teamInfo['squadId'] == squadIds[tt]].reset_index()['squadNickname'][0]
+    #     currColour = colourDict[currTeamName]
+        
+    #     #Plot histogram
+    #     num_bins = 40
+    #     plt.figure()
+    #     df_currSubs = df_substitutionData.loc[(df_substitutionData['squadId'] == squadIds[tt]) &
+    #                                           (df_substitutionData['fromPos'] == 'S')]
+    #     plt.hist(df_currSubs['normSubTime'], num_bins, facecolor = currColour, alpha=0.5)
+    #     plt.title(currTeamName)
+    #     plt.show()
+
+
+    #Return data dictionary
+    return exportData
+
+    ##### TODO: other dataframes once extracted
+    
+# %%
+
+# %% MatchData
+
+class MatchData(dict):
+
+    # Dictionary of the data returned by getMatchData. Data that wasn't requested
+    # is extracted from the .json files (or cache) the first time its key is
+    # accessed with matchData[key], and then kept in the dictionary. Note that
+    # checks such as 'key in matchData' and matchData.get(key) only see the data
+    # that has already been extracted
+
+    def __init__(self, jsonFileList = None, df_squadLists = None,
+                 nProcesses = 1, cacheDir = None, compactDtypes = True):
+
+        # Input:    jsonFileList - sorted list of .json files to import
+        #           df_squadLists - dataframe of players in each squad for look-up
+        #           nProcesses - number of processes to parse the .json files with
+        #           cacheDir - directory to cache the parsed data in (see getMatchData)
+        #           compactDtypes - boolean flag whether to set the score flow and
+        #                           lineup dataframes to the compact data types
+
+        super().__init__()
+        self.jsonFileList = jsonFileList
+        self.df_squadLists = df_squadLists
+        self.nProcesses = nProcesses
+        self.cacheDir = cacheDir
+        self.compactDtypes = compactDtypes
+
+    def addData(self, dataNames = None, exportDict = True, exportDf = True):
+
+        # Function for extracting data and adding it to the dictionary
+        #
+        # Input:    dataNames - list of the data dictionaries to add (see matchDataNames)
+        #           exportDict - boolean flag whether to add the data dictionaries
+        #           exportDf - boolean flag whether to add the dataframes
+
+        #Extract and merge the data
+        mergedData = getMergedData(jsonFileList = self.jsonFileList,
+                                   df_squadLists = self.df_squadLists,
+                                   nProcesses = self.nProcesses,
+                                   cacheDir = self.cacheDir,
+                                   dataNames = dataNames)
+
+        #Loop through the data and add it
+        for dataName in dataNames:
+            #Check and add data dictionary
+            if exportDict is True:
+                self[dataName] = mergedData[dataName]
+            #Set to dataframe and add
+            if exportDf is True:
+                dfName = matchDataFrameNames[dataName]
+                df_data = pd.DataFrame.from_dict(mergedData[dataName])
+                if self.compactDtypes is True and dfName in compactSchema:
+                    df_data = setCompactDtypes(df_data, dfName)
+                self[dfName] = df_data
+
+    def __missing__(self, key):
+
+        #Find the data dictionary that the key belongs to
+        keyNames = [dataName for dataName in matchDataNames if key in [dataName, matchDataFrameNames[dataName]]]
+        if len(keyNames) == 0:
+            raise KeyError(key)
+
+        #Extract the data, with both of the lineup tables added together
+        if keyNames[0] in ['lineUpData', 'individualLineUpData']:
+            keyNames = ['lineUpData', 'individualLineUpData']
+        self.addData(dataNames = keyNames)
+
+        return dict.__getitem__(self, key)
+
+# %% getMergedData
+
+def getMergedData(jsonFileList = None, df_squadLists = None,
+                  nProcesses = 1, cacheDir = None, dataNames = None):
+
+    # Function for extracting the data from each .json file and merging it
+    # together in the file order, using the season cache where available
+    #
+    # Input:    jsonFileList - sorted list of .json files to import
+    #           df_squadLists - dataframe of players in each squad for look-up
+    #           nProcesses - number of processes to parse the .json files with
+    #           cacheDir - directory to cache the parsed data in (see getMatchData)
+    #           dataNames - list of the data dictionaries to extract (see
+    #                       matchDataNames). The default of None extracts all data
+    #
+    # Output:   mergedData - dictionary of the merged data dictionaries
+
+    #Check for the merged season data in the cache
+    mergedData = None
+    if cacheDir is not None:
+        #Get the keys for each file and the season as a whole
+        squadListsHash = getSquadListsHash(df_squadLists)
+        fileKeys = [getFileHash(jsonFile, squadListsHash) for jsonFile in jsonFileList]
+        seasonKey = hashlib.sha1((cacheVersion + ''.join(fileKeys)).encode()).hexdigest()
+        #Load the season data if it is available
+        mergedData = loadDataCache(os.path.join(cacheDir, 'season', seasonKey), getExtractNames(dataNames))
+
+    #Extract and merge the data if it wasn't cached
+    if mergedData is None:
+
+        #Extract the data from each file
+        matchDataList = list(iterMatchDataDicts(jsonFileList = jsonFileList,
+                                                df_squadLists = df_squadLists,
+                                                nProcesses = nProcesses,
+                                                cacheDir = cacheDir,
+                                                dataNames = dataNames))
+
+        #Merge the match data together in the sorted round/match order
+        mergedData = mergeMatchData(matchDataList)
+
+        #Cache the merged season data
+        if cacheDir is not None:
+            saveDataCache(mergedData, os.path.join(cacheDir, 'season', seasonKey))
+
+    return mergedData
+
+# %% getExtractNames
+
+def getExtractNames(dataNames = None):
+
+    # Function for getting the data dictionaries that need to be extracted to
+    # get the requested data. The match, team and player details are always
+    # extracted as they are used throughout, and the lineups need the score flow
+    # and substitution data
+    #
+    # Input:    dataNames - list of the requested data dictionaries. The default
+    #                       of None requests all of matchDataNames
+    #
+    # Output:   extractNames - list of the data dictionaries to extract
+
+    #Set to all data if not specified
+    if dataNames is None:
+        dataNames = matchDataNames
+
+    #Add the data that is always extracted and that the lineups depend on
+    extractNames = ['matchInfo', 'teamInfo', 'playerInfo'] + list(dataNames)
+    if 'lineUpData' in extractNames or 'individualLineUpData' in extractNames:
+        extractNames = extractNames + ['scoreFlowData', 'substitutionData',
+                                       'lineUpData', 'individualLineUpData']
+
+    #Keep the extraction order of matchDataNames
+    extractNames = [dataName for dataName in matchDataNames if dataName in extractNames]
+
+    return extractNames
+
+# %% iterMatchData
+
+def iterMatchData(jsonFileList = None, df_squadLists = None,
+                  nProcesses = 1, cacheDir = None, compactDtypes = True,
+                  dataNames = None):
+
+    # Function for iterating through the Champion Data .json files for SSN 2020
+    # one match at a time. Only the current matches data is held in memory, so
+    # this can be used to process many seasons of data without building the
+    # whole set of tables that getMatchData returns
+    #
+    # Input:    jsonFileList - list of .json files to import
+    #           df_squadLists - dataframe of players in each squad for look-up
+    #           nProcesses - number of processes to parse the .json files with
+    #           cacheDir - directory to cache the parsed data in (see getMatchData)
+    #           compactDtypes - boolean flag whether to set the score flow and
+    #                           lineup dataframes to the compact data types
+    #           dataNames - list of the data dictionaries to extract (see
+    #                       matchDataNames). The default of None extracts all data
+    #
+    # Output:   matchTables - dictionary of dataframes for the current match, with
+    #                         the same names as those returned by getMatchData plus
+    #                         df_substitutions. Note that df_teamInfo holds the two
+    #                         teams in the match and df_playerInfo the players
+    #                         listed for the match. The match, team and player
+    #                         details are always included (see getExtractNames)
+
+    #Sort json file list alpha-numerically so that round 1 remains first
+    jsonFileList = sortedNicely(jsonFileList)
+
+    #Loop through the matches and convert their data to dataframes
+    for matchData in iterMatchDataDicts(jsonFileList = jsonFileList,
+                                        df_squadLists = df_squadLists,
+                                        nProcesses = nProcesses,
+                                        cacheDir = cacheDir,
+                                        dataNames = dataNames):
+        matchTables = dict()
+        for dataName in matchData.keys():
+            matchTables[matchDataFrameNames[dataName]] = pd.DataFrame.from_dict(matchData[dataName])
+            if compactDtypes is True and matchDataFrameNames[dataName] in compactSchema:
+                matchTables[matchDataFrameNames[dataName]] = setCompactDtypes(matchTables[matchDataFrameNames[dataName]],
+                                                                              matchDataFrameNames[dataName])
+        yield matchTables
+
+# %% iterMatchDataDicts
+
+def iterMatchDataDicts(jsonFileList = None, df_squadLists = None,
+                       nProcesses = 1, cacheDir = None, dataNames = None):
+
+    # Function for iterating through the data dictionaries of each match. The
+    # matches are returned in the order of the file list, and are loaded from
+    # the cache where available or parsed with getSingleMatchData otherwise
+    #
+    # Input:    jsonFileList - list of .json files to import
+    #           df_squadLists - dataframe of players in each squad for look-up
+    #           nProcesses - number of processes to parse the .json files with
+    #           cacheDir - directory to cache the parsed data in (see getMatchData)
+    #           dataNames - list of the data dictionaries to extract (see
+    #                       matchDataNames). The default of None extracts all data
+    #
+    # Output:   matchData - dictionary of the data dictionaries for the current match
+
+    #Get the cache location for each file
+    if cacheDir is not None:
+        squadListsHash = getSquadListsHash(df_squadLists)
+        cachePaths = [os.path.join(cacheDir, 'matches', getFileHash(jsonFile, squadListsHash)) for jsonFile in jsonFileList]
+        isCached = [checkDataCache(cachePath, getExtractNames(dataNames)) for cachePath in cachePaths]
+    else:
+        cachePaths = [None] * len(jsonFileList)
+        isCached = [False] * len(jsonFileList)
+
+    #Identify the files that need parsing
+    parseFiles = [jsonFileList[ff] for ff in range(0,len(jsonFileList)) if not isCached[ff]]
+    parseFunc = partial(getSingleMatchData, df_squadLists = df_squadLists,
+                        squadLookup = getSquadLookup(df_squadLists),
+                        dataNames = dataNames)
+
+    #Set the files to be parsed. In a process pool up to two files per process
+    #are parsed ahead of the current match, and are returned in the same order
+    #as the file list
+    if nProcesses > 1 and len(parseFiles) > 1:
+        pool = Pool(nProcesses)
+        parsedData = iterPoolResults(pool, parseFunc, parseFiles, maxPending = 2 * nProcesses)
+    else:
+        pool = None
+        parsedData = map(parseFunc, parseFiles)
+
+    try:
+        #Loop through the files and return each matches data
+        for ff in range(0,len(jsonFileList)):
+            if isCached[ff]:
+                matchData = loadDataCache(cachePaths[ff], getExtractNames(dataNames))
+            else:
+                matchData = next(parsedData)
+                if cachePaths[ff] is not None:
+                    saveDataCache(matchData, cachePaths[ff])
+            yield matchData
+    finally:
+        #Close the pool, including when the loop is stopped early
+        if pool is not None:
+            pool.terminate()
+
+# %% iterPoolResults
+
+def iterPoolResults(pool, func, funcInputs, maxPending = 2):
+
+    # Function for running a function over a list of inputs in a process pool
+    # and returning the results in order, with no more than a set number of
+    # inputs sent to the pool ahead of the results being used. This keeps the
+    # memory of the finished results bounded when they're used slower than the
+    # pool makes them
+    #
+    # Input:    pool - process pool to run the function in
+    #           func - function to run on each input
+    #           funcInputs - list of inputs to the function
+    #           maxPending - maximum number of inputs sent to the pool at once
+    #
+    # Output:   funcResult - generator of the result of each input, in order
+
+    #Send the inputs to the pool, waiting for the oldest result when full
+    pendingResults = deque()
+    for funcInput in funcInputs:
+        pendingResults.append(pool.apply_async(func, (funcInput,)))
+        if len(pendingResults) >= maxPending:
+            yield pendingResults.popleft().get()
+
+    #Return the remaining results
+    while len(pendingResults) > 0:
+        yield pendingResults.popleft().get()
+
+# %% getSingleMatchData
+
+def getSingleMatchData(jsonFile = None, df_squadLists = None, squadLookup = None,
+                       dataNames = None):
+
+    # Function for extracting the data from a single Champion Data .json file.
+    # This is kept separate to getMatchData so that the files can be parsed in
+    # a process pool, with each match returning its own blocks of data
+    #
+    # Input:    jsonFile - .json file to import
+    #           df_squadLists - dataframe of players in each squad for look-up
+    #           squadLookup - dictionary of player display names to squad
+    #                         nicknames from getSquadLookup. This is built from
+    #                         df_squadLists if not provided
+    #           dataNames - list of the data dictionaries to extract (see
+    #                       matchDataNames). The default of None extracts all data
+    #
+    # Output:   matchData - dictionary of the data dictionaries for the match
 
     #Create blank dictionaries to store data in
 
@@ -116,69 +615,78 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
     
     #Create a variable for starting positions
     starterPositions = ['GS','GA','WA','C','WD','GD','GK']
-    
-    #Sort json file list alpha-numerically so that round 1 remains first
-    def sortedNicely(l):
-        """ Sorts the given iterable in the way that is expected.
-        Required arguments:
-        l -- The iterable to be sorted. """
-        convert = lambda text: int(text) if text.isdigit() else text
-        alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
-        return sorted(l, key = alphanum_key)
-    jsonFileList = sortedNicely(jsonFileList)
-    
-    #Loop through file list and extract data
-    for ff in range(0,len(jsonFileList)):
+
+    #Build the squad look-up if it wasn't provided
+    if squadLookup is None:
+        squadLookup = getSquadLookup(df_squadLists)
+
+    #Identify the data to extract
+    extractNames = getExtractNames(dataNames)
+
+    #Load the .json data
+    with open(jsonFile) as json_file:
+        data = json.load(json_file)
         
-        #Load the .json data
-        with open(jsonFileList[ff]) as json_file:
-            data = json.load(json_file)
+    #Extract match details
+    matchInfo['id'].append(data['matchInfo']['matchId'][0])
+    matchInfo['homeSquadId'].append(data['matchInfo']['homeSquadId'][0])
+    matchInfo['awaySquadId'].append(data['matchInfo']['awaySquadId'][0])
+    matchInfo['startTime'].append(data['matchInfo']['localStartTime'][0])
+    matchInfo['roundNo'].append(data['matchInfo']['roundNumber'][0])
+    matchInfo['matchNo'].append(data['matchInfo']['matchNumber'][0])
+    matchInfo['venueId'].append(data['matchInfo']['venueId'][0])
+    matchInfo['venueName'].append(data['matchInfo']['venueName'][0])
+    qtrSeconds = list()
+    for qq in range(0,4):
+        qtrSeconds.append(data['periodInfo']['qtr'][qq]['periodSeconds'][0])
+    matchInfo['periodSeconds'].append(qtrSeconds)
+
+    #Extract the two teams details. Only those from round 1 are kept as the
+    #league team details when the matches are merged together
+    teamInfo['squadCode'].append(data['teamInfo']['team'][0]['squadCode'][0])
+    teamInfo['squadId'].append(data['teamInfo']['team'][0]['squadId'][0])
+    teamInfo['squadName'].append(data['teamInfo']['team'][0]['squadName'][0])
+    teamInfo['squadNickname'].append(data['teamInfo']['team'][0]['squadNickname'][0])
+    teamInfo['squadCode'].append(data['teamInfo']['team'][1]['squadCode'][0])
+    teamInfo['squadId'].append(data['teamInfo']['team'][1]['squadId'][0])
+    teamInfo['squadName'].append(data['teamInfo']['team'][1]['squadName'][0])
+    teamInfo['squadNickname'].append(data['teamInfo']['team'][1]['squadNickname'][0])
+
+    #Create look-ups for the player details, keyed by player ID and name
+    playerSquadIds = dict()
+    playerNames = dict()
+    playerNameSquadIds = dict()
+
+    #Create look-ups between the squad IDs and nicknames
+    squadIds = dict(zip(teamInfo['squadNickname'], teamInfo['squadId']))
+    squadNicknames = dict(zip(teamInfo['squadId'], teamInfo['squadNickname']))
+
+    #Extract player details from each team
+    for pp in range(0,len(data['playerInfo']['player'])):
+        #First, check if the player ID is in the current id list
+        if data['playerInfo']['player'][pp]['playerId'][0] not in playerSquadIds:
+            #Grab the new player details
+            playerInfo['playerId'].append(data['playerInfo']['player'][pp]['playerId'][0])
+            playerInfo['displayName'].append(data['playerInfo']['player'][pp]['displayName'][0])
+            playerInfo['firstName'].append(data['playerInfo']['player'][pp]['firstname'][0])
+            playerInfo['surname'].append(data['playerInfo']['player'][pp]['surname'][0])
+            playerInfo['shortDisplayName'].append(data['playerInfo']['player'][pp]['shortDisplayName'][0])
+            #Find which squad they belong to in the squad list look-up
+            currPlayerSquad = squadLookup[data['playerInfo']['player'][pp]['displayName'][0]]
+            #Get the squad ID from the team info and append to players info
+            currPlayerSquadId = squadIds[currPlayerSquad]
+            playerInfo['squadId'].append(currPlayerSquadId)
+            #Add the player to the look-ups
+            playerSquadIds[playerInfo['playerId'][-1]] = currPlayerSquadId
+            playerNames[playerInfo['playerId'][-1]] = playerInfo['displayName'][-1]
+            playerNameSquadIds.setdefault(playerInfo['displayName'][-1], currPlayerSquadId)
             
-        #Extract match details
-        matchInfo['id'].append(data['matchInfo']['matchId'][0])
-        matchInfo['homeSquadId'].append(data['matchInfo']['homeSquadId'][0])
-        matchInfo['awaySquadId'].append(data['matchInfo']['awaySquadId'][0])
-        matchInfo['startTime'].append(data['matchInfo']['localStartTime'][0])
-        matchInfo['roundNo'].append(data['matchInfo']['roundNumber'][0])
-        matchInfo['matchNo'].append(data['matchInfo']['matchNumber'][0])
-        matchInfo['venueId'].append(data['matchInfo']['venueId'][0])
-        matchInfo['venueName'].append(data['matchInfo']['venueName'][0])
-        qtrSeconds = list()
-        for qq in range(0,4):
-            qtrSeconds.append(data['periodInfo']['qtr'][qq]['periodSeconds'][0])
-        matchInfo['periodSeconds'].append(qtrSeconds)
-    
-        #If round 1, extract the league team details to lists
-        if data['matchInfo']['roundNumber'][0] == 1:
-            #Append the two teams details
-            teamInfo['squadCode'].append(data['teamInfo']['team'][0]['squadCode'][0])
-            teamInfo['squadId'].append(data['teamInfo']['team'][0]['squadId'][0])
-            teamInfo['squadName'].append(data['teamInfo']['team'][0]['squadName'][0])
-            teamInfo['squadNickname'].append(data['teamInfo']['team'][0]['squadNickname'][0])
-            teamInfo['squadCode'].append(data['teamInfo']['team'][1]['squadCode'][0])
-            teamInfo['squadId'].append(data['teamInfo']['team'][1]['squadId'][0])
-            teamInfo['squadName'].append(data['teamInfo']['team'][1]['squadName'][0])
-            teamInfo['squadNickname'].append(data['teamInfo']['team'][1]['squadNickname'][0])
-        
-        #Extract player details from each team     
-        for pp in range(0,len(data['playerInfo']['player'])):
-            #First, check if the player ID is in the current id list
-            currPlayerId = playerInfo['playerId']
-            if data['playerInfo']['player'][pp]['playerId'][0] not in currPlayerId:
-                #Grab the new player details
-                playerInfo['playerId'].append(data['playerInfo']['player'][pp]['playerId'][0])
-                playerInfo['displayName'].append(data['playerInfo']['player'][pp]['displayName'][0])
-                playerInfo['firstName'].append(data['playerInfo']['player'][pp]['firstname'][0])
-                playerInfo['surname'].append(data['playerInfo']['player'][pp]['surname'][0])
-                playerInfo['shortDisplayName'].append(data['playerInfo']['player'][pp]['shortDisplayName'][0])
-                #Find which squad they belong to in the squad list dataframe
-                currPlayerSquad = df_squadLists.loc[(df_squadLists['displayName'] == \
-                                                     data['playerInfo']['player'][pp]['displayName'][0]),\
-                                                    ].reset_index()['squadNickname'][0]
-                #Get the squad ID from the team info and append to players info
-                currPlayerSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(currPlayerSquad)]
-                playerInfo['squadId'].append(currPlayerSquadId)
-                
+    #Get the match seconds that each period starts at
+    periodOffsets = getPeriodOffsets(matchInfo['periodSeconds'][0])
+
+    #Extract score flow data if requested or needed for the lineups
+    if 'scoreFlowData' in extractNames:
+
         #Extract score flow data
         for ss in range(0,len(data['scoreFlow']['score'])):
             scoreFlowData['roundNo'].append(data['matchInfo']['roundNumber'][0])
@@ -189,18 +697,6 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                 scoreFlowData['periodCategory'].append('twoPoint')
             else:
                 scoreFlowData['periodCategory'].append('standard')
-            if data['scoreFlow']['score'][ss]['period'][0] == 1:
-                #Just use period seconds
-                scoreFlowData['matchSeconds'].append(data['scoreFlow']['score'][ss]['periodSeconds'][0])
-            elif data['scoreFlow']['score'][ss]['period'][0] == 2:
-                #Add the preceding period seconds
-                scoreFlowData['matchSeconds'].append(data['scoreFlow']['score'][ss]['periodSeconds'][0] + matchInfo['periodSeconds'][ff][0])
-            elif data['scoreFlow']['score'][ss]['period'][0] == 3:
-                #Add the preceding period seconds
-                scoreFlowData['matchSeconds'].append(data['scoreFlow']['score'][ss]['periodSeconds'][0] + matchInfo['periodSeconds'][ff][0] + matchInfo['periodSeconds'][ff][1])
-            elif data['scoreFlow']['score'][ss]['period'][0] == 4:
-                #Add the preceding period seconds
-                scoreFlowData['matchSeconds'].append(data['scoreFlow']['score'][ss]['periodSeconds'][0] + matchInfo['periodSeconds'][ff][0] + matchInfo['periodSeconds'][ff][1] + matchInfo['periodSeconds'][ff][2])
             scoreFlowData['playerId'].append(data['scoreFlow']['score'][ss]['playerId'][0])
             scoreFlowData['squadId'].append(data['scoreFlow']['score'][ss]['squadId'][0])
             scoreFlowData['scoreName'].append(data['scoreFlow']['score'][ss]['scoreName'][0])
@@ -219,97 +715,57 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                 scoreFlowData['shotOutcome'].append(False)
             else:
                 scoreFlowData['shotOutcome'].append(True)
-            #Get game score and margin
-            if ss == 0:
-                #Set starting details
-                currHomeScore = 0
-                currAwayScore = 0
-                preShotMargin = 0
-                preShotAhead = np.nan
-            else:
-                #Get curr length of score flow data and subsequent index to look up
-                nInd = len(scoreFlowData['preShotAhead']) - 1
-                #Set starting details
-                currHomeScore = scoreFlowData['homeScore'][nInd]
-                currAwayScore = scoreFlowData['awayScore'][nInd]
-                preShotMargin = scoreFlowData['postShotMargin'][nInd]
-                preShotAhead = scoreFlowData['postShotAhead'][nInd]            
-            #Check who scored and add to tally
-            if data['scoreFlow']['score'][ss]['squadId'][0] == matchInfo['homeSquadId'][ff]:
-                #Add to home score
-                currHomeScore = currHomeScore + data['scoreFlow']['score'][ss]['scorepoints'][0]
-            elif data['scoreFlow']['score'][ss]['squadId'][0] == matchInfo['awaySquadId'][ff]:
-                #Add to away score
-                currAwayScore = currAwayScore + data['scoreFlow']['score'][ss]['scorepoints'][0]
-            #Check who is now in front
-            if currHomeScore > currAwayScore:
-                postShotAhead = matchInfo['homeSquadId'][ff]
-            elif currAwayScore > currHomeScore:
-                postShotAhead = matchInfo['awaySquadId'][ff]
-            else:
-                postShotAhead = np.nan
-            #Calculate margin (home score up = positive)
-            postShotMargin = currHomeScore - currAwayScore
-            #Append to dictionary
-            scoreFlowData['homeScore'].append(currHomeScore)
-            scoreFlowData['awayScore'].append(currAwayScore)
-            scoreFlowData['preShotAhead'].append(preShotAhead)
-            scoreFlowData['postShotAhead'].append(postShotAhead)
-            scoreFlowData['preShotMargin'].append(preShotMargin)
-            scoreFlowData['postShotMargin'].append(postShotMargin)
-            
+
+        #Calculate the match seconds, game score and margin columns across the
+        #whole score flow at once
+        df_scoreState = calcScoreFlowState(df_scoreFlow = pd.DataFrame.from_dict({colName: scoreFlowData[colName] for colName in ['roundNo', 'matchNo', 'period', 'periodSeconds', 'squadId', 'scorePoints']}),
+                                           df_matchInfo = pd.DataFrame.from_dict(matchInfo))
+        for colName in ['matchSeconds', 'homeScore', 'awayScore',
+                        'preShotAhead', 'postShotAhead', 'preShotMargin', 'postShotMargin']:
+            scoreFlowData[colName] = df_scoreState[colName].tolist()
+
+    #Extract substitution data if requested or needed for the lineups
+    if 'substitutionData' in extractNames:
+
         #Extract substitution data
         for ss in range(0,len(data['playerSubs']['player'])):
             #Get current round and match number from match data
-            substitutionData['roundNo'].append(matchInfo['roundNo'][ff])
-            substitutionData['matchNo'].append(matchInfo['matchNo'][ff])
+            substitutionData['roundNo'].append(matchInfo['roundNo'][0])
+            substitutionData['matchNo'].append(matchInfo['matchNo'][0])
             #Get period and period seconds
             substitutionData['period'].append(data['playerSubs']['player'][ss]['period'][0])
             substitutionData['periodSeconds'].append(data['playerSubs']['player'][ss]['periodSeconds'][0])
-            #Convert to match seconds based on match info and period number
-            if data['playerSubs']['player'][ss]['period'][0] == 1:
-                #Just use the period seconds
-                substitutionData['matchSeconds'].append(data['playerSubs']['player'][ss]['periodSeconds'][0])
-            elif data['playerSubs']['player'][ss]['period'][0] == 2:
-                #Add the matches period 1 seconds to the total
-                newSeconds = data['playerSubs']['player'][ss]['periodSeconds'][0] + matchInfo['periodSeconds'][ff][0]
-                #Add to data dictionary
-                substitutionData['matchSeconds'].append(newSeconds)
-            elif data['playerSubs']['player'][ss]['period'][0] == 3:
-                #Add the matches period 1 & 2 seconds to the total
-                newSeconds = data['playerSubs']['player'][ss]['periodSeconds'][0] + matchInfo['periodSeconds'][ff][0] + matchInfo['periodSeconds'][ff][1]
-                #Add to data dictionary
-                substitutionData['matchSeconds'].append(newSeconds)
-            elif data['playerSubs']['player'][ss]['period'][0] == 4:
-                #Add the matches period 1, 2 & 3 seconds to the total
-                newSeconds = data['playerSubs']['player'][ss]['periodSeconds'][0] + matchInfo['periodSeconds'][ff][0] + matchInfo['periodSeconds'][ff][1] + matchInfo['periodSeconds'][ff][2]
-                #Add to data dictionary
-                substitutionData['matchSeconds'].append(newSeconds)
+            #Convert to match seconds by adding the preceding periods seconds
+            substitutionData['matchSeconds'].append(data['playerSubs']['player'][ss]['periodSeconds'][0] + \
+                                                    periodOffsets[data['playerSubs']['player'][ss]['period'][0]-1])
             #Get player and squad ID's
             substitutionData['playerId'].append(data['playerSubs']['player'][ss]['playerId'][0])
             substitutionData['squadId'].append(data['playerSubs']['player'][ss]['squadId'][0])
             #Get substitution positions
             substitutionData['fromPos'].append(data['playerSubs']['player'][ss]['fromPos'][0])
             substitutionData['toPos'].append(data['playerSubs']['player'][ss]['toPos'][0])
-                    
+
+    #Extract lineup data if requested
+    if 'lineUpData' in extractNames:
+
         #Extract lineup data
-        
+    
         ##### TODO: consider adding durations for within one/two-point periods
-        
+    
         #Get the squad ID and name order
         if data['teamInfo']['team'][0]['squadId'][0] < data['teamInfo']['team'][1]['squadId'][0]:
             lineUpSquadId1 = data['teamInfo']['team'][0]['squadId'][0]
-            lineUpSquadName1 = teamInfo['squadNickname'][teamInfo['squadId'].index(lineUpSquadId1)]
+            lineUpSquadName1 = squadNicknames[lineUpSquadId1]
             lineUpSquadId2 = data['teamInfo']['team'][1]['squadId'][0]
-            lineUpSquadName2 = teamInfo['squadNickname'][teamInfo['squadId'].index(lineUpSquadId2)]
+            lineUpSquadName2 = squadNicknames[lineUpSquadId2]
         else:
             lineUpSquadId1 = data['teamInfo']['team'][1]['squadId'][0]
-            lineUpSquadName1 = teamInfo['squadNickname'][teamInfo['squadId'].index(lineUpSquadId1)]
+            lineUpSquadName1 = squadNicknames[lineUpSquadId1]
             lineUpSquadId2 = data['teamInfo']['team'][0]['squadId'][0]
-            lineUpSquadName2 = teamInfo['squadNickname'][teamInfo['squadId'].index(lineUpSquadId2)]
-        
+            lineUpSquadName2 = squadNicknames[lineUpSquadId2]
+    
         #Get the starting lineups
-        
+    
         #Find the first player in the player list that matches the first squad ID.
         #This should theoretically always be at index 0
         #Set starting search parameters
@@ -320,14 +776,14 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
             #Get current player name
             currPlayerName = data['playerInfo']['player'][playerNo]['displayName'][0]
             #Get this players squad ID
-            currPlayerSquadId = playerInfo['squadId'][playerInfo['displayName'].index(currPlayerName)]
+            currPlayerSquadId = playerNameSquadIds[currPlayerName]
             #Check if it matches the first squad ID and append if so. This should exit the loop
             if currPlayerSquadId == lineUpSquadId1:
                 startIndSquad1.append(playerNo)
             else:
                 #Add to the search index for player no
                 playerNo = playerNo + 1
-                
+            
         #Find the first player in the player list that matches the second squad ID.
         #Set starting search parameters
         playerNo = 0
@@ -337,47 +793,53 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
             #Get current player name
             currPlayerName = data['playerInfo']['player'][playerNo]['displayName'][0]
             #Get this players squad ID
-            currPlayerSquadId = playerInfo['squadId'][playerInfo['displayName'].index(currPlayerName)]
+            currPlayerSquadId = playerNameSquadIds[currPlayerName]
             #Check if it matches the first squad ID and append if so. This should exit the loop
             if currPlayerSquadId == lineUpSquadId2:
                 startIndSquad2.append(playerNo)
             else:
                 #Add to the search index for player no
                 playerNo = playerNo + 1
-                
-        #Convert the current substitution data dictionary to a dataframe to use
-        #Only extract the subs for the current round and match number
-        df_subChecker = pd.DataFrame.from_dict(substitutionData).loc[(pd.DataFrame.from_dict(substitutionData)['roundNo'] == matchInfo['roundNo'][ff]) &
-                                                                     (pd.DataFrame.from_dict(substitutionData)['matchNo'] == matchInfo['matchNo'][ff]),]
-        
-        #Convert the current score flow data dictionary to a dataframe to use
-        #Only extract the scores for the current round and match number
-        df_scoreChecker = pd.DataFrame.from_dict(scoreFlowData).loc[(pd.DataFrame.from_dict(scoreFlowData)['roundNo'] == matchInfo['roundNo'][ff]) &
-                                                                    (pd.DataFrame.from_dict(scoreFlowData)['matchNo'] == matchInfo['matchNo'][ff]),]
-        
+            
+        #Convert the current substitution data dictionary to a dataframe to use.
+        #This only contains the subs for the current match, so is built once here
+        df_subChecker = pd.DataFrame.from_dict(substitutionData)
+    
+        #Convert the current score flow data dictionary to a dataframe to use.
+        #This only contains the scores for the current match, so is built once here
+        df_scoreChecker = pd.DataFrame.from_dict(scoreFlowData)
+    
+        #Split the substitutions by squad and player once, rather than searching
+        #through the substitutions for each lineup and player
+        subCheckerSquads = {squadId: df_group.reset_index(drop = True) for squadId, df_group in df_subChecker.groupby('squadId', sort = False)}
+        subCheckerPlayers = {playerId: df_group.reset_index(drop = True) for playerId, df_group in df_subChecker.groupby('playerId', sort = False)}
+    
+        #Set lists to collect the score flow intervals of each lineup in. The points
+        #for and against are calculated for all of the lineups at once after the loop
+        lineUpIntervals = {'squadId': [], 'lowerSeconds': [], 'upperSeconds': []}
+
         #Extract each squads lineups
         for nn in range(0,2):
-            
+        
             #Set current squad details within loop
             if nn == 0:
                 currStartIndSquad = startIndSquad1
                 currLineUpSquadId = lineUpSquadId1
-                
+            
             else:
                 currStartIndSquad = startIndSquad2
                 currLineUpSquadId = lineUpSquadId2
-        
+    
             #Get the starting lineup
             startLineUpId = list()
             startLineUpName = list()
             for pp in range(currStartIndSquad[0],currStartIndSquad[0]+7):
                 startLineUpId.append(data['playerInfo']['player'][pp]['playerId'][0])
                 startLineUpName.append(data['playerInfo']['player'][pp]['displayName'][0])
-            
+        
             #Get subs for the current squad
-            df_subCheckerTeam = df_subChecker.loc[(df_subChecker['squadId'] == currLineUpSquadId),]  
-            df_subCheckerTeam.reset_index(drop=True, inplace=True)
-            
+            df_subCheckerTeam = subCheckerSquads.get(currLineUpSquadId, df_subChecker.iloc[0:0])
+        
             #First check if dataframe is empty if a team makes no subs
             if len(df_subCheckerTeam) == 0:
                 #No subs made by this team
@@ -387,26 +849,17 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                 lineUpData['lineUpName'].append(startLineUpName)
                 lineUpData['squadId'].append(currLineUpSquadId)
                 #Set match and round numbers
-                lineUpData['roundNo'].append(matchInfo['roundNo'][ff])
-                lineUpData['matchNo'].append(matchInfo['matchNo'][ff])
+                lineUpData['roundNo'].append(matchInfo['roundNo'][0])
+                lineUpData['matchNo'].append(matchInfo['matchNo'][0])
                 #Set match seconds start and end to 0 and match length
                 lineUpData['matchSecondsStart'].append(0)
-                lineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][ff]))
-                lineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][ff]))
-                #Set points for the lineup
-                #Simply across the whole match
-                lineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId),
-                                                                   ['scorePoints']].sum()['scorePoints'])
-                #Set points against the lineup
+                lineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][0]))
+                lineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][0]))
+                #Set the score flow interval for the points for and against
                 #Simply across the whole match
-                lineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId),
-                                                                       ['scorePoints']].sum()['scorePoints'])
-                #Calculate plus/minus
-                plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId),
-                                                ['scorePoints']].sum()['scorePoints'] - \
-                    df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId),
-                                        ['scorePoints']].sum()['scorePoints']
-                lineUpData['plusMinus'].append(plusMinus)
+                lineUpIntervals['squadId'].append(currLineUpSquadId)
+                lineUpIntervals['lowerSeconds'].append(-np.inf)
+                lineUpIntervals['upperSeconds'].append(np.inf)
             else:
                 #Set the first lineup data based on the first substituion made by the team
                 #Set lineup ID and names
@@ -414,62 +867,49 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                 lineUpData['lineUpName'].append(startLineUpName)
                 lineUpData['squadId'].append(currLineUpSquadId)
                 #Set match and round numbers
-                lineUpData['roundNo'].append(matchInfo['roundNo'][ff])
-                lineUpData['matchNo'].append(matchInfo['matchNo'][ff])
+                lineUpData['roundNo'].append(matchInfo['roundNo'][0])
+                lineUpData['matchNo'].append(matchInfo['matchNo'][0])
                 #Set match seconds start and end to 0 and the first substitution
                 lineUpData['matchSecondsStart'].append(0)
                 lineUpData['matchSecondsEnd'].append(df_subCheckerTeam['matchSeconds'][0])
                 lineUpData['durationSeconds'].append(df_subCheckerTeam['matchSeconds'][0])
-                #Set points for the lineup
+                #Set the score flow interval for the points for and against
                 #Search in score flow for less than the substitution end time
-                lineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId) &
-                                                                   (df_scoreChecker['matchSeconds'] <= df_subCheckerTeam['matchSeconds'][0]),
-                                                                   ['scorePoints']].sum()['scorePoints'])
-                #Set points against the lineup
-                #Simply across the whole match
-                lineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId) &
-                                                                   (df_scoreChecker['matchSeconds'] <= df_subCheckerTeam['matchSeconds'][0]),
-                                                                   ['scorePoints']].sum()['scorePoints'])
-                #Calculate plus/minus
-                plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId) &
-                                                (df_scoreChecker['matchSeconds'] <= df_subCheckerTeam['matchSeconds'][0]),
-                                                ['scorePoints']].sum()['scorePoints'] - \
-                    df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId) &
-                                        (df_scoreChecker['matchSeconds'] <= df_subCheckerTeam['matchSeconds'][0]),
-                                        ['scorePoints']].sum()['scorePoints']
-                lineUpData['plusMinus'].append(plusMinus)
-                
+                lineUpIntervals['squadId'].append(currLineUpSquadId)
+                lineUpIntervals['lowerSeconds'].append(-np.inf)
+                lineUpIntervals['upperSeconds'].append(df_subCheckerTeam['matchSeconds'][0])
+            
                 #Loop through substitutions, identify lineups and calculate data
-                
+            
                 #Identify the substitutions that are grouped together
                 uniqueSubs = df_subCheckerTeam['matchSeconds'].unique()
                 #Loop through unique subs
                 for uu in range(0,len(uniqueSubs)):
-        
+    
                     #Get substitutions for current time point
                     #Only take the ones that shift into a lineup position
                     df_currSubs = df_subCheckerTeam.loc[(df_subCheckerTeam['matchSeconds'] == uniqueSubs[uu]) &
                                                         (df_subCheckerTeam['toPos'] != 'S'),]
                     df_currSubs.reset_index(drop=True, inplace=True)
-                    
+                
                     #If current subs dataframe is empty, this is an error or even the
                     #random situation of a player being sent off (i.e. GIANTS match
                     #in round 5). This needs to be accounted for by pulling the position
                     #from the lineup
                     if len(df_currSubs) == 0:
-                        
+                    
                         #Extract the player going to the bench in isolation
                         df_currSubs = df_subCheckerTeam.loc[(df_subCheckerTeam['matchSeconds'] == uniqueSubs[uu]) &
                                                             (df_subCheckerTeam['toPos'] == 'S'),]    
                         df_currSubs.reset_index(drop=True, inplace=True)
-                        
+                    
                         #Create a new lineup variable to edit from the previous lineup
                         newLineUpId = list()
                         newLineUpName = list()
                         for pp in range(0,7):
                             newLineUpId.append(lineUpData['lineUpId'][len(lineUpData['lineUpId'])-1][pp])
                             newLineUpName.append(lineUpData['lineUpName'][len(lineUpData['lineUpName'])-1][pp])
-                            
+                        
                         #Loop through substitutions and replace the lineup with an
                         #empty value where appropriate
                         for cc in range(0,len(df_currSubs)):
@@ -509,16 +949,16 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                                 newLineUpId[6] = []
                                 #Replace player name
                                 newLineUpName[6] = []
-                        
-                    else:
                     
+                    else:
+                
                         #Create a new lineup variable to edit from the previous lineup
                         newLineUpId = list()
                         newLineUpName = list()
                         for pp in range(0,7):
                             newLineUpId.append(lineUpData['lineUpId'][len(lineUpData['lineUpId'])-1][pp])
                             newLineUpName.append(lineUpData['lineUpName'][len(lineUpData['lineUpName'])-1][pp])
-                        
+                    
                         #Loop through substitutions and replace the lineup
                         for cc in range(0,len(df_currSubs)):
                             #Check for position and replace appropriately
@@ -526,53 +966,53 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                                 #Replace player ID
                                 newLineUpId[0] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[0])]
+                                newPlayerName = playerNames[newLineUpId[0]]
                                 newLineUpName[0] = newPlayerName
                             elif df_currSubs['toPos'][cc] == 'GA':
                                 #Replace player ID
                                 newLineUpId[1] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[1])]
+                                newPlayerName = playerNames[newLineUpId[1]]
                                 newLineUpName[1] = newPlayerName
                             elif df_currSubs['toPos'][cc] == 'WA':
                                 #Replace player ID
                                 newLineUpId[2] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[2])]
+                                newPlayerName = playerNames[newLineUpId[2]]
                                 newLineUpName[2] = newPlayerName
                             elif df_currSubs['toPos'][cc] == 'C':
                                 #Replace player ID
                                 newLineUpId[3] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[3])]
+                                newPlayerName = playerNames[newLineUpId[3]]
                                 newLineUpName[3] = newPlayerName
                             elif df_currSubs['toPos'][cc] == 'WD':
                                 #Replace player ID
                                 newLineUpId[4] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[4])]
+                                newPlayerName = playerNames[newLineUpId[4]]
                                 newLineUpName[4] = newPlayerName
                             elif df_currSubs['toPos'][cc] == 'GD':
                                 #Replace player ID
                                 newLineUpId[5] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[5])]
+                                newPlayerName = playerNames[newLineUpId[5]]
                                 newLineUpName[5] = newPlayerName
                             elif df_currSubs['toPos'][cc] == 'GK':
                                 #Replace player ID
                                 newLineUpId[6] = df_currSubs['playerId'][cc]
                                 #Get and replace player name
-                                newPlayerName = playerInfo['displayName'][playerInfo['playerId'].index(newLineUpId[6])]
+                                newPlayerName = playerNames[newLineUpId[6]]
                                 newLineUpName[6] = newPlayerName
-                        
+                    
                     #Calculate and set data in lineup structure
                     #Set lineup ID and names
                     lineUpData['lineUpId'].append(newLineUpId)
                     lineUpData['lineUpName'].append(newLineUpName)
                     lineUpData['squadId'].append(currLineUpSquadId)
                     #Set match and round numbers
-                    lineUpData['roundNo'].append(matchInfo['roundNo'][ff])
-                    lineUpData['matchNo'].append(matchInfo['matchNo'][ff])
+                    lineUpData['roundNo'].append(matchInfo['roundNo'][0])
+                    lineUpData['matchNo'].append(matchInfo['matchNo'][0])
                     #Set match seconds start and end to 0 and the first substitution
                     lineUpData['matchSecondsStart'].append(uniqueSubs[uu]+1)
                     #Match seconds end will be next sub or match end when last sub
@@ -580,53 +1020,34 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                         lineUpData['matchSecondsEnd'].append(uniqueSubs[uu+1])
                         lineUpData['durationSeconds'].append(uniqueSubs[uu+1] - uniqueSubs[uu])
                     else:
-                        lineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][ff]))
-                        lineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][ff]) - uniqueSubs[uu])
-                    #Search in score flow for less than the substitution end time
+                        lineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][0]))
+                        lineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][0]) - uniqueSubs[uu])
+                    #Set the score flow interval for the points for and against
                     #If last sub need to only search for greater than the seconds time
+                    lineUpIntervals['squadId'].append(currLineUpSquadId)
+                    lineUpIntervals['lowerSeconds'].append(uniqueSubs[uu]+1)
                     if uu < len(uniqueSubs)-1:
-                        #Set points for the lineup
-                        lineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId) &
-                                                                       (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1) & 
-                                                                       (df_scoreChecker['matchSeconds'] <= uniqueSubs[uu+1]),
-                                                                       ['scorePoints']].sum()['scorePoints'])
-                        #Set points against the lineup
-                        lineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId) &
-                                                                       (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1) & 
-                                                                       (df_scoreChecker['matchSeconds'] <= uniqueSubs[uu+1]),
-                                                                       ['scorePoints']].sum()['scorePoints'])
-                        #Calculate plus/minus
-                        plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId) &
-                                                        (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1) & 
-                                                        (df_scoreChecker['matchSeconds'] <= uniqueSubs[uu+1]),
-                                                        ['scorePoints']].sum()['scorePoints'] - \
-                            df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId) &
-                                                (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1) & 
-                                                (df_scoreChecker['matchSeconds'] <= uniqueSubs[uu+1]),
-                                                ['scorePoints']].sum()['scorePoints']
-                        lineUpData['plusMinus'].append(plusMinus)
+                        lineUpIntervals['upperSeconds'].append(uniqueSubs[uu+1])
                     else:
-                        #Set points for the lineup
-                        lineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId) &
-                                                                       (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1),
-                                                                       ['scorePoints']].sum()['scorePoints'])
-                        #Set points against the lineup
-                        lineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId) &
-                                                                       (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1),
-                                                                       ['scorePoints']].sum()['scorePoints'])
-                        #Calculate plus/minus
-                        plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currLineUpSquadId) &
-                                                        (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1),
-                                                        ['scorePoints']].sum()['scorePoints'] - \
-                            df_scoreChecker.loc[(df_scoreChecker['squadId'] != currLineUpSquadId) &
-                                                (df_scoreChecker['matchSeconds'] > uniqueSubs[uu]+1),
-                                                ['scorePoints']].sum()['scorePoints']
-                        lineUpData['plusMinus'].append(plusMinus)
-                        
+                        lineUpIntervals['upperSeconds'].append(np.inf)
+                    
+        #Calculate the points for and against each lineup from the score flow
+        pointsFor, pointsAgainst = getIntervalPoints(df_scoreChecker = df_scoreChecker,
+                                                     squadIds = lineUpIntervals['squadId'],
+                                                     lowerSeconds = lineUpIntervals['lowerSeconds'],
+                                                     upperSeconds = lineUpIntervals['upperSeconds'])
+        lineUpData['pointsFor'] = list(pointsFor)
+        lineUpData['pointsAgainst'] = list(pointsAgainst)
+        lineUpData['plusMinus'] = list(pointsFor - pointsAgainst)
+
+        #Set lists to collect the score flow intervals of each player in
+        individualIntervals = {'squadId': [], 'lowerSeconds': [], 'upperSeconds': [],
+                               'plusMinusLowerSeconds': []}
+
         #Extract individual player 'lineup' data
         #Loop through two teams
         for nn in range(0,2):
-            
+        
             #Set current squad details within loop
             if nn == 0:
                 currStartIndSquad = startIndSquad1
@@ -640,32 +1061,31 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                     currEndIndSquad = startIndSquad1
                 else:
                     currEndIndSquad = [len(data['playerInfo']['player'])]    
-        
+    
             #Start with first squad players
             for pp in range(currStartIndSquad[0],currEndIndSquad[0]):
-                
+            
                 #Extract current player info
                 currPlayerId = data['playerInfo']['player'][pp]['playerId'][0]
                 currPlayerName = data['playerInfo']['player'][pp]['displayName'][0]
-                currPlayerSquadId = playerInfo['squadId'][playerInfo['playerId'].index(currPlayerId)]
-                
+                currPlayerSquadId = playerSquadIds[currPlayerId]
+            
                 #Check if player is in starting lineup
                 if pp <= (currStartIndSquad[0] + 6):
                     isStarter = True
                 else:
                     isStarter = False
-                
+            
                 #Grab the substitution data that contains this players id
-                df_subCheckerPlayer = df_subChecker.loc[(df_subChecker['playerId'] == currPlayerId),]
-                df_subCheckerPlayer.reset_index(drop=True, inplace=True)
-                
+                df_subCheckerPlayer = subCheckerPlayers.get(currPlayerId, df_subChecker.iloc[0:0])
+            
                 #Check combinations of starter vs. no starter and number of subs
                 if len(df_subCheckerPlayer) == 0:
-                    
+                
                     #If the player started the game and had no subs, they played the whole game
                     #If they didn't then we won't add them as they didn't play
                     if isStarter:
-                    
+                
                         #Player started and played the whole game
                         #Set player/squad ID and names
                         individualLineUpData['playerId'].append(currPlayerId)
@@ -673,42 +1093,34 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                         individualLineUpData['playerPosition'].append(starterPositions[pp - currStartIndSquad[0]])
                         individualLineUpData['squadId'].append(currPlayerSquadId)
                         #Set match and round numbers
-                        individualLineUpData['roundNo'].append(matchInfo['roundNo'][ff])
-                        individualLineUpData['matchNo'].append(matchInfo['matchNo'][ff])
+                        individualLineUpData['roundNo'].append(matchInfo['roundNo'][0])
+                        individualLineUpData['matchNo'].append(matchInfo['matchNo'][0])
                         #Set match seconds start and end to 0 and match length
                         individualLineUpData['matchSecondsStart'].append(0)
-                        individualLineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][ff]))
-                        individualLineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][ff]))
-                        #Set points for the lineup
+                        individualLineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][0]))
+                        individualLineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][0]))
+                        #Set the score flow interval for the points for and against
                         #Simply across the whole match
-                        individualLineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId),
-                                                                           ['scorePoints']].sum()['scorePoints'])
-                        #Set points against the lineup
-                        #Simply across the whole match
-                        individualLineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId),
-                                                                               ['scorePoints']].sum()['scorePoints'])
-                        #Calculate plus/minus
-                        plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId),
-                                                        ['scorePoints']].sum()['scorePoints'] - \
-                            df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId),
-                                                ['scorePoints']].sum()['scorePoints']
-                        individualLineUpData['plusMinus'].append(plusMinus)
-                    
+                        individualIntervals['squadId'].append(currPlayerSquadId)
+                        individualIntervals['lowerSeconds'].append(-np.inf)
+                        individualIntervals['upperSeconds'].append(np.inf)
+                        individualIntervals['plusMinusLowerSeconds'].append(-np.inf)
+                
                 else:
-                    
+                
                     #Player incurred some form of substitution and game time
-                    
+                
                     #Loop through substitutions and address accordingly
                     for ss in range(0,len(df_subCheckerPlayer)+1):
-                        
+                    
                         #Set player/squad ID and names
                         individualLineUpData['playerId'].append(currPlayerId)
                         individualLineUpData['playerName'].append(currPlayerName)
                         individualLineUpData['squadId'].append(currPlayerSquadId)
                         #Set match and round numbers
-                        individualLineUpData['roundNo'].append(matchInfo['roundNo'][ff])
-                        individualLineUpData['matchNo'].append(matchInfo['matchNo'][ff])
-                        
+                        individualLineUpData['roundNo'].append(matchInfo['roundNo'][0])
+                        individualLineUpData['matchNo'].append(matchInfo['matchNo'][0])
+                    
                         #Check substitution number and code accordingly
                         if ss == 0:
                             #Starters first substitution involvement                    
@@ -721,53 +1133,29 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                             individualLineUpData['matchSecondsStart'].append(0)
                             individualLineUpData['durationSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss])
                             individualLineUpData['matchSecondsEnd'].append(df_subCheckerPlayer['matchSeconds'][ss])
-                            #Set points for and against the lineup
-                            individualLineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId) &
-                                                                                         (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                                                         ['scorePoints']].sum()['scorePoints'])
-                            individualLineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId) &
-                                                                                         (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                                                         ['scorePoints']].sum()['scorePoints'])
-                            #Calculate plus/minus
-                            plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId) &
-                                                            (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                            ['scorePoints']].sum()['scorePoints'] - \
-                                df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId) &
-                                                    (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                    ['scorePoints']].sum()['scorePoints']
-                            individualLineUpData['plusMinus'].append(plusMinus)    
-                            
+                            #Set the score flow interval for the points for and against
+                            individualIntervals['squadId'].append(currPlayerSquadId)
+                            individualIntervals['lowerSeconds'].append(-np.inf)
+                            individualIntervals['upperSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss])
+                            individualIntervals['plusMinusLowerSeconds'].append(-np.inf)
+                        
                         elif ss == len(df_subCheckerPlayer):
-                            
+                        
                             #Starters last substituion involvement
                             #Set starting position
                             individualLineUpData['playerPosition'].append(df_subCheckerPlayer['toPos'][ss-1])
                             #Set match start and duration
                             individualLineUpData['matchSecondsStart'].append(df_subCheckerPlayer['matchSeconds'][ss-1]+1)
-                            individualLineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][ff]) - df_subCheckerPlayer['matchSeconds'][ss-1]+1)
-                            individualLineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][ff]))
-                            #Set points for and against the lineup
-                            individualLineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId) &
-                                                                                         (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]) & 
-                                                                                         (df_scoreChecker['matchSeconds'] <= sum(matchInfo['periodSeconds'][ff])),
-                                                                                         ['scorePoints']].sum()['scorePoints'])
-                            individualLineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId) &
-                                                                                         (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]) & 
-                                                                                         (df_scoreChecker['matchSeconds'] <= sum(matchInfo['periodSeconds'][ff])),
-                                                                                         ['scorePoints']].sum()['scorePoints'])
-                            #Calculate plus/minus
-                            plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId) &
-                                                            (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]) & 
-                                                            (df_scoreChecker['matchSeconds'] <= sum(matchInfo['periodSeconds'][ff])),
-                                                            ['scorePoints']].sum()['scorePoints'] - \
-                                df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId) &
-                                                    (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]) & 
-                                                    (df_scoreChecker['matchSeconds'] <= sum(matchInfo['periodSeconds'][ff])),
-                                                    ['scorePoints']].sum()['scorePoints']
-                            individualLineUpData['plusMinus'].append(plusMinus)
-                            
+                            individualLineUpData['durationSeconds'].append(sum(matchInfo['periodSeconds'][0]) - df_subCheckerPlayer['matchSeconds'][ss-1]+1)
+                            individualLineUpData['matchSecondsEnd'].append(sum(matchInfo['periodSeconds'][0]))
+                            #Set the score flow interval for the points for and against
+                            individualIntervals['squadId'].append(currPlayerSquadId)
+                            individualIntervals['lowerSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss-1])
+                            individualIntervals['upperSeconds'].append(sum(matchInfo['periodSeconds'][0]))
+                            individualIntervals['plusMinusLowerSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss-1])
+                        
                         else:
-                            
+                        
                             #Substitutions throughout match
                             #Set substituting position
                             individualLineUpData['playerPosition'].append(df_subCheckerPlayer['toPos'][ss-1])
@@ -775,44 +1163,48 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
                             individualLineUpData['matchSecondsStart'].append(df_subCheckerPlayer['matchSeconds'][ss-1]+1)
                             individualLineUpData['durationSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss] - df_subCheckerPlayer['matchSeconds'][ss-1]+1)
                             individualLineUpData['matchSecondsEnd'].append(df_subCheckerPlayer['matchSeconds'][ss])
-                            #Set points for and against the lineup
-                            individualLineUpData['pointsFor'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId) &
-                                                                                         (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]) & 
-                                                                                         (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                                                         ['scorePoints']].sum()['scorePoints'])
-                            individualLineUpData['pointsAgainst'].append(df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId) &
-                                                                                         (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]) & 
-                                                                                         (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                                                         ['scorePoints']].sum()['scorePoints'])                
-                            #Calculate plus/minus
-                            plusMinus = df_scoreChecker.loc[(df_scoreChecker['squadId'] == currPlayerSquadId) &
-                                                            (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]+1) & 
-                                                            (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                            ['scorePoints']].sum()['scorePoints'] - \
-                                df_scoreChecker.loc[(df_scoreChecker['squadId'] != currPlayerSquadId) &
-                                                    (df_scoreChecker['matchSeconds'] > df_subCheckerPlayer['matchSeconds'][ss-1]+1) & 
-                                                    (df_scoreChecker['matchSeconds'] <= df_subCheckerPlayer['matchSeconds'][ss]),
-                                                    ['scorePoints']].sum()['scorePoints']
-                            individualLineUpData['plusMinus'].append(plusMinus)
-                    
+                            #Set the score flow interval for the points for and against.
+                            #Note the plus/minus interval starts a second later
+                            individualIntervals['squadId'].append(currPlayerSquadId)
+                            individualIntervals['lowerSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss-1])
+                            individualIntervals['upperSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss])
+                            individualIntervals['plusMinusLowerSeconds'].append(df_subCheckerPlayer['matchSeconds'][ss-1]+1)
+                
+        #Calculate the points for and against each individual interval from the
+        #score flow, with the plus/minus using its own interval start
+        pointsFor, pointsAgainst = getIntervalPoints(df_scoreChecker = df_scoreChecker,
+                                                     squadIds = individualIntervals['squadId'],
+                                                     lowerSeconds = individualIntervals['lowerSeconds'],
+                                                     upperSeconds = individualIntervals['upperSeconds'])
+        plusMinusFor, plusMinusAgainst = getIntervalPoints(df_scoreChecker = df_scoreChecker,
+                                                           squadIds = individualIntervals['squadId'],
+                                                           lowerSeconds = individualIntervals['plusMinusLowerSeconds'],
+                                                           upperSeconds = individualIntervals['upperSeconds'])
+        individualLineUpData['pointsFor'] = list(pointsFor)
+        individualLineUpData['pointsAgainst'] = list(pointsAgainst)
+        individualLineUpData['plusMinus'] = list(plusMinusFor - plusMinusAgainst)
+
+    #Extract player statistic data if requested
+    if 'playerStatsData' in extractNames:
+
         #Extract game statistic data
-        
+    
         #### TODO: why did I copy-paste rather than put in loop???????
-        
+    
         #Loop through the player by period list
         for pp in range(0,len(data['playerPeriodStats']['player'])):
-            
+        
             #Get player, round, match details
-            
+        
             #Extract statistics from current player and period
             playerStatsData['playerId'].append(data['playerPeriodStats']['player'][pp]['playerId'][0])
-            playerStatsData['playerName'].append(playerInfo['displayName'][playerInfo['playerId'].index(data['playerPeriodStats']['player'][pp]['playerId'][0])])
+            playerStatsData['playerName'].append(playerNames[data['playerPeriodStats']['player'][pp]['playerId'][0]])
             playerStatsData['squadId'].append(data['playerPeriodStats']['player'][pp]['squadId'][0])
-            playerStatsData['matchNo'].append(matchInfo['matchNo'][ff])
-            playerStatsData['matchId'].append(matchInfo['id'][ff])
-            playerStatsData['roundNo'].append(matchInfo['roundNo'][ff])
+            playerStatsData['matchNo'].append(matchInfo['matchNo'][0])
+            playerStatsData['matchId'].append(matchInfo['id'][0])
+            playerStatsData['roundNo'].append(matchInfo['roundNo'][0])
             playerStatsData['period'].append(data['playerPeriodStats']['player'][pp]['period'][0])
-            
+        
             #Extract statistical data
             playerStatsData['attempt_from_zone1'].append(data['playerPeriodStats']['player'][pp]['attempt_from_zone1'][0])
             playerStatsData['attempt_from_zone2'].append(data['playerPeriodStats']['player'][pp]['attempt_from_zone2'][0])
@@ -852,17 +1244,20 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
             playerStatsData['possessions'].append(data['playerPeriodStats']['player'][pp]['possessions'][0])
             playerStatsData['rebounds'].append(data['playerPeriodStats']['player'][pp]['rebounds'][0])
             playerStatsData['tossUpWin'].append(data['playerPeriodStats']['player'][pp]['tossUpWin'][0])
-    
+
+    #Extract team statistic data if requested
+    if 'teamStatsData' in extractNames:
+
         #Loop through team and period list
         for tt in range(0,len(data['teamPeriodStats']['team'])):
-            
+        
             #Get team, match and period details
             teamStatsData['squadId'].append(data['teamPeriodStats']['team'][tt]['squadId'][0])
-            teamStatsData['matchNo'].append(matchInfo['matchNo'][ff])
-            teamStatsData['matchId'].append(matchInfo['id'][ff])
-            teamStatsData['roundNo'].append(matchInfo['roundNo'][ff])
+            teamStatsData['matchNo'].append(matchInfo['matchNo'][0])
+            teamStatsData['matchId'].append(matchInfo['id'][0])
+            teamStatsData['roundNo'].append(matchInfo['roundNo'][0])
             teamStatsData['period'].append(data['teamPeriodStats']['team'][tt]['period'][0])
-            
+        
             #Extract statistical data
             teamStatsData['attempt_from_zone1'].append(data['teamPeriodStats']['team'][tt]['attempt_from_zone1'][0])
             teamStatsData['attempt_from_zone2'].append(data['teamPeriodStats']['team'][tt]['attempt_from_zone2'][0])
@@ -907,184 +1302,464 @@ def getMatchData(jsonFileList = None, df_squadLists = None,
             teamStatsData['rebounds'].append(data['teamPeriodStats']['team'][tt]['rebounds'][0])
             teamStatsData['tossUpWin'].append(data['teamPeriodStats']['team'][tt]['tossUpWin'][0])
 
-    
-    
-    # #Summarise substitution data
-    
-    # #Convert to dataframe
-    # df_substitutionData = pd.DataFrame.from_dict(substitutionData)
-    
-    # #Create a new column that converts substitution timing to be relative to
-    # #the quarter in the match (i.e. 0-1, 1-2, 2-3, 3-4)
-    # normSubTime = list()
-    # for ss in range(0,len(df_substitutionData)):
-        
-    #     #Get appropriate match and round timing data
-    #     roundBool = df_substitutionData['roundNo'][ss] == matchInfo['roundNo']
-    #     matchBool = df_substitutionData['matchNo'][ss] == matchInfo['matchNo']
-    #     bothBool = [a and b for a, b in zip(roundBool,matchBool)]
-    #     bothBoolInd = bothBool.index(bothBool == True) - 1
-    #     currPeriodSeconds = matchInfo['periodSeconds'][bothBoolInd]
-        
-    #     #Normalise current substitution data to period seconds
-    #     #Get current period index
-    #     periodInd = df_substitutionData['period'][ss]-1
-    #     #Normalise to seconds and append (ensure adding quarter val too)
-    #     normSubTime.append(df_substitutionData['periodSeconds'][ss] / currPeriodSeconds[periodInd] + periodInd)
-        
-    # #Append to dataframe
-    # df_substitutionData['normSubTime'] = normSubTime
-    
-    # #Calculate some summary substitution statistics
-    
-    # #Get unique squad ID's from substitution data
-    # squadIds = df_substitutionData['squadId'].unique()
-    # df_teamInfo = pd.DataFrame.from_dict(teamInfo)
+    #Pack the extracted match data dictionaries together
+    matchData = {'matchInfo': matchInfo, 'teamInfo': teamInfo,
+                 'playerInfo': playerInfo, 'scoreFlowData': scoreFlowData,
+                 'substitutionData': substitutionData, 'lineUpData': lineUpData,
+                 'individualLineUpData': individualLineUpData,
+                 'playerStatsData': playerStatsData, 'teamStatsData': teamStatsData}
+    matchData = {dataName: matchData[dataName] for dataName in matchDataNames if dataName in extractNames}
 
-    # #Print heading
-    # print('Total number of substitutions by teams:')
-    
-    # #Loop through squads
-    # for tt in range(0,len(squadIds)):
-        
-    #     #Get the current squads total points
-    #     totalSubs = len(df_substitutionData.loc[(df_substitutionData['squadId'] == squadIds[tt]) &
-    #                                             (df_substitutionData['fromPos'] == 'S'),])
-        
-    #     #Get the total number of games played
-    #     totalGames = len(df_substitutionData['roundNo'].unique())
-        
-    #     #Calculate subs per game
-    #     perSubs = totalSubs/totalGames
-        
-    #     #Get the current team name
-    #     currTeamName = df_teamInfo.squadName[df_teamInfo['squadId'] == squadIds[tt]].reset_index()['squadName'][0]
-        
-    #     #Print results
-    #     print(currTeamName+': '+str(totalSubs)+' Total Subs ('+str(round(perSubs,2))+' per game)')
-        
-    # #Plot a histogram of normalised sub time to determine details of when they
-    # #are occurring
-    # from matplotlib import pyplot as plt
-    # num_bins = 40
-    # df_currSubs = df_substitutionData.loc[(df_substitutionData['fromPos'] == 'S')]
-    # plt.hist(df_currSubs['normSubTime'], num_bins, facecolor='blue', alpha=0.5)
-    # plt.show()
-    
-    # #Loop through squads and see if any differences
-    # colourDict = {'Fever': '#00953b',
-    #           'Firebirds': '#4b2c69',
-    #           'GIANTS': '#f57921',
-    #           'Lightning': '#fdb61c',
-    #           'Magpies': '#494b4a',
-    #           'Swifts': '#0082cd',
-    #           'Thunderbirds': '#e54078',
-    #           'Vixens': '#00a68e'}
-    
-    # for tt in range(0,len(squadIds)):    
-        
-    #     #Get current team name
-    #     currTeamName = df_teamInfo.squadNickname[df_teamInfo['squadId'] == squadIds[tt]].reset_index()['squadNickname'][0]
-    #     currColour = colourDict[currTeamName]
-        
-    #     #Plot histogram
-    #     num_bins = 40
-    #     plt.figure()
-    #     df_currSubs = df_substitutionData.loc[(df_substitutionData['squadId'] == squadIds[tt]) &
-    #                                           (df_substitutionData['fromPos'] == 'S')]
-    #     plt.hist(df_currSubs['normSubTime'], num_bins, facecolor = currColour, alpha=0.5)
-    #     plt.title(currTeamName)
-    #     plt.show()
-        
-        
-    
-    
-    
-    
-    
-    #Export data
-    
-    #Set a dictionary to pack data in to
-    exportData = dict()
-    
-    #Team info
-    if exportTeamData is True:
-        #Set to dataframe
-        df_teamInfo = pd.DataFrame.from_dict(teamInfo)
-        #Check and return data
-        if exportDict is True:
-            exportData['teamInfo'] = teamInfo
-        if exportDf is True:
-            exportData['df_teamInfo'] = df_teamInfo
-        
-    #Player info
-    if exportPlayerData is True:
-        #Set to dataframe
-        df_playerInfo = pd.DataFrame.from_dict(playerInfo)
-        #Check and return data
-        if exportDict is True:
-            exportData['playerInfo'] = playerInfo
-        if exportDf is True:
-            exportData['df_playerInfo'] =df_playerInfo
-        
-    #Match info
-    if exportMatchData is True:
-        #Set to dataframe
-        df_matchInfo = pd.DataFrame.from_dict(matchInfo)
-        #Check and return data
-        if exportDict is True:
-            exportData['matchInfo'] = matchInfo
-        if exportDf is True:
-            exportData['df_matchInfo'] = df_matchInfo
-    
-    #Score flow data
-    if exportScoreData is True:
-        #Set to dataframe
-        df_scoreFlow = pd.DataFrame.from_dict(scoreFlowData)
-        #Check and return data
-        if exportDict is True:
-            exportData['scoreFlowData'] = scoreFlowData
-        if exportDf is True:
-            exportData['df_scoreFlow'] = df_scoreFlow
-    
-    #Lineup data
-    if exportLineUpData is True:
-        #Set to dataframe
-        df_lineUp = pd.DataFrame.from_dict(lineUpData)
-        df_individualLineUp = pd.DataFrame.from_dict(individualLineUpData)
-        #Check and return data
-        if exportDict is True:
-            exportData['lineUpData'] = lineUpData
-            exportData['individualLineUpData'] = individualLineUpData
-        if exportDf is True:
-            exportData['df_lineUp'] = df_lineUp
-            exportData['df_individualLineUp'] = df_individualLineUp
-            
-    #Player stats data
-    if exportPlayerStatsData is True:
-        #Set to dataframe
-        df_playerStatsData = pd.DataFrame.from_dict(playerStatsData)
-        #Check and return data
-        if exportDict is True:
-            exportData['playerStatsData'] = playerStatsData
-        if exportDf is True:
-            exportData['df_playerStatsData'] = df_playerStatsData
-            
-    #Team stats data
-    if exportTeamStatsData is True:
+    return matchData
+
+# %% getPeriodOffsets
+
+def getPeriodOffsets(periodSeconds):
+
+    # Function for getting the match seconds that each period starts at
+    #
+    # Input:    periodSeconds - list of the length of each period in seconds
+    #
+    # Output:   periodOffsets - list of the summed seconds of the preceding periods
+
+    #Sum the preceding periods
+    periodOffsets = [0]
+    for qq in range(0,len(periodSeconds)-1):
+        periodOffsets.append(periodOffsets[qq] + periodSeconds[qq])
+
+    return periodOffsets
+
+# %% calcScoreFlowState
+
+def calcScoreFlowState(df_scoreFlow = None, df_matchInfo = None):
+
+    # Function for calculating the match seconds and the game score and margin
+    # state around each shot in the score flow. The columns are calculated over
+    # the whole dataframe at once, with running totals grouped by match, so this
+    # can be used on a single match or a full season of score flow data
+    #
+    # Input:    df_scoreFlow - score flow dataframe with the roundNo, matchNo,
+    #                          period, periodSeconds, squadId and scorePoints columns
+    #           df_matchInfo - match info dataframe for the matches in the score flow
+    #
+    # Output:   df_scoreFlow - copy of the score flow dataframe with the matchSeconds,
+    #                          homeScore, awayScore, preShotAhead, postShotAhead,
+    #                          preShotMargin and postShotMargin columns added
+
+    #Copy the dataframe to add the columns to
+    df_scoreFlow = df_scoreFlow.copy()
+
+    #Find the match that each score belongs to
+    matchKeys = pd.MultiIndex.from_arrays([df_matchInfo['roundNo'], df_matchInfo['matchNo']])
+    matchInd = matchKeys.get_indexer(pd.MultiIndex.from_arrays([df_scoreFlow['roundNo'], df_scoreFlow['matchNo']]))
+
+    #Get the home and away squads for each score
+    homeSquadId = df_matchInfo['homeSquadId'].to_numpy()[matchInd]
+    awaySquadId = df_matchInfo['awaySquadId'].to_numpy()[matchInd]
+
+    #Convert the period seconds to match seconds using the period start times
+    periodOffsets = np.array([getPeriodOffsets(periodSeconds) for periodSeconds in df_matchInfo['periodSeconds']], dtype = np.int64).reshape(len(df_matchInfo),-1)
+    df_scoreFlow['matchSeconds'] = df_scoreFlow['periodSeconds'].to_numpy() + \
+        periodOffsets[matchInd, df_scoreFlow['period'].to_numpy()-1]
+
+    #Sum the home and away scores through each match
+    squadId = df_scoreFlow['squadId'].to_numpy()
+    scorePoints = df_scoreFlow['scorePoints'].to_numpy()
+    df_scoreFlow['homeScore'] = pd.Series(np.where(squadId == homeSquadId, scorePoints, 0),
+                                          index = df_scoreFlow.index).groupby(matchInd).cumsum()
+    df_scoreFlow['awayScore'] = pd.Series(np.where(squadId == awaySquadId, scorePoints, 0),
+                                          index = df_scoreFlow.index).groupby(matchInd).cumsum()
+
+    #Calculate margin (home score up = positive) and who is in front after the shot
+    homeScore = df_scoreFlow['homeScore'].to_numpy()
+    awayScore = df_scoreFlow['awayScore'].to_numpy()
+    df_scoreFlow['postShotMargin'] = homeScore - awayScore
+    df_scoreFlow['postShotAhead'] = np.where(homeScore > awayScore, homeSquadId,
+                                             np.where(awayScore > homeScore, awaySquadId, np.nan))
+
+    #Take the pre shot details from the previous shot in the match
+    df_scoreFlow['preShotMargin'] = df_scoreFlow['postShotMargin'].groupby(matchInd).shift(1, fill_value = 0)
+    df_scoreFlow['preShotAhead'] = df_scoreFlow['postShotAhead'].groupby(matchInd).shift(1)
+
+    return df_scoreFlow
+
+# %% setCompactDtypes
+
+def setCompactDtypes(df_data, dfName):
+
+    # Function for setting a dataframe to the compact data types in compactSchema.
+    # Integer columns are only downcast when all of their values fit in the
+    # compact type, and columns with fixed categories are only set when all of
+    # their values are in the categories, otherwise they are left as is
+    #
+    # Input:    df_data - dataframe to set the data types of
+    #           dfName - name of the dataframe in compactSchema (e.g. 'df_scoreFlow')
+    #
+    # Output:   df_data - dataframe with the compact data types
+
+    #Loop through the columns in the schema
+    compactTypes = dict()
+    for colName, colType in compactSchema[dfName].items():
+        #Skip columns that aren't in the dataframe
+        if colName not in df_data.columns:
+            continue
+        #Check columns with fixed categories only hold those categories
+        if isinstance(colType, pd.CategoricalDtype):
+            if not df_data[colName].isin(colType.categories).all():
+                continue
+        #Check integer columns fit in the compact type
+        elif colType.startswith('int') and len(df_data) > 0:
+            typeInfo = np.iinfo(colType)
+            if df_data[colName].min() < typeInfo.min or df_data[colName].max() > typeInfo.max:
+                continue
+        compactTypes[colName] = colType
+
+    return df_data.astype(compactTypes)
+
+# %% getSquadLookup
+
+def getSquadLookup(df_squadLists):
+
+    # Function for creating a look-up of the squad each player belongs to
+    #
+    # Input:    df_squadLists - dataframe of players in each squad for look-up
+    #
+    # Output:   squadLookup - dictionary of player display names to squad
+    #                         nicknames. The first listing of a player is used
+
+    #Loop through the squad lists and add each player
+    squadLookup = dict()
+    for displayName, squadNickname in zip(df_squadLists['displayName'], df_squadLists['squadNickname']):
+        squadLookup.setdefault(displayName, squadNickname)
+
+    return squadLookup
+
+# %% getIntervalPoints
+
+def getIntervalPoints(df_scoreChecker = None, squadIds = None,
+                      lowerSeconds = None, upperSeconds = None):
+
+    # Function for summing the points scored for and against squads across a
+    # set of intervals within a match. Each score is assigned to the intervals
+    # with a search over the cumulative points, so all intervals are done at once
+    #
+    # Input:    df_scoreChecker - score flow dataframe for the match
+    #           squadIds - list of the squad ID for each interval
+    #           lowerSeconds - list of the match seconds each interval starts
+    #                          after (i.e. scores at this time are excluded)
+    #           upperSeconds - list of the match seconds each interval ends at
+    #                          (i.e. scores at this time are included)
+    #
+    # Output:   pointsFor - array of points scored by the squad in each interval
+    #           pointsAgainst - array of points scored against the squad in each interval
+
+    #Convert the intervals to arrays
+    squadIds = np.array(squadIds)
+    lowerSeconds = np.array(lowerSeconds, dtype = float)
+    upperSeconds = np.array(upperSeconds, dtype = float)
+
+    #Sort the scores by time
+    sortInd = np.argsort(df_scoreChecker['matchSeconds'].to_numpy(), kind = 'stable')
+    scoreSeconds = df_scoreChecker['matchSeconds'].to_numpy()[sortInd]
+    scoreSquadIds = df_scoreChecker['squadId'].to_numpy()[sortInd]
+    scorePoints = df_scoreChecker['scorePoints'].to_numpy()[sortInd]
+
+    #Find the scores that fall within each interval
+    startInd = np.searchsorted(scoreSeconds, lowerSeconds, side = 'right')
+    endInd = np.maximum(np.searchsorted(scoreSeconds, upperSeconds, side = 'right'), startInd)
+
+    #Loop through the squads and sum their points in the intervals
+    pointsFor = np.zeros(len(squadIds), dtype = np.int64)
+    pointsAgainst = np.zeros(len(squadIds), dtype = np.int64)
+    for squadId in np.unique(squadIds):
+        #Get the cumulative points for and against the squad
+        cumPointsFor = np.concatenate(([0], np.cumsum(np.where(scoreSquadIds == squadId, scorePoints, 0))))
+        cumPointsAgainst = np.concatenate(([0], np.cumsum(np.where(scoreSquadIds != squadId, scorePoints, 0))))
+        #Take the difference across each of the squads intervals
+        squadInd = squadIds == squadId
+        pointsFor[squadInd] = cumPointsFor[endInd[squadInd]] - cumPointsFor[startInd[squadInd]]
+        pointsAgainst[squadInd] = cumPointsAgainst[endInd[squadInd]] - cumPointsAgainst[startInd[squadInd]]
+
+    return pointsFor, pointsAgainst
+
+# %% mergeMatchData
+
+def mergeMatchData(matchDataList):
+
+    # Function for merging the data dictionaries extracted from individual
+    # matches by getSingleMatchData
+    #
+    # Input:    matchDataList - list of match data dictionaries, sorted in the
+    #                           round/match order they should be merged in
+    #
+    # Output:   mergedData - dictionary of the merged data dictionaries
+
+    #Create blank dictionaries with the same columns as the match data
+    mergedData = dict()
+    for dataName in matchDataList[0].keys():
+        mergedData[dataName] = {colName: [] for colName in matchDataList[0][dataName].keys()}
+
+    #Set a check for the players that have already been added
+    mergedPlayerIds = set()
+
+    #Loop through matches and append their data
+    for matchData in matchDataList:
+        for dataName in matchData.keys():
+
+            #Only keep the team details from round 1 as the league teams
+            if dataName == 'teamInfo':
+                if matchData['matchInfo']['roundNo'][0] != 1:
+                    continue
+
+            #Only add players the first time they appear
+            if dataName == 'playerInfo':
+                for pp in range(0,len(matchData['playerInfo']['playerId'])):
+                    if matchData['playerInfo']['playerId'][pp] not in mergedPlayerIds:
+                        mergedPlayerIds.add(matchData['playerInfo']['playerId'][pp])
+                        for colName in mergedData['playerInfo'].keys():
+                            mergedData['playerInfo'][colName].append(matchData['playerInfo'][colName][pp])
+                continue
+
+            #Append the current matches data
+            for colName in matchData[dataName].keys():
+                mergedData[dataName][colName].extend(matchData[dataName][colName])
+
+    return mergedData
+
+# %% getSquadListsHash
+
+def getSquadListsHash(df_squadLists):
+
+    # Function for hashing the contents of the squad lists dataframe, so that
+    # cached data is refreshed if the squad lists change
+    #
+    # Input:    df_squadLists - dataframe of players in each squad for look-up
+    #
+    # Output:   squadListsHash - hex digest of the squad lists contents
+
+    #Hash the column names and row contents
+    hasher = hashlib.sha1()
+    hasher.update(json.dumps([str(colName) for colName in df_squadLists.columns]).encode())
+    hasher.update(pd.util.hash_pandas_object(df_squadLists, index = True).values.tobytes())
+
+    return hasher.hexdigest()
+
+# %% getFileHash
+
+def getFileHash(jsonFile, squadListsHash = ''):
+
+    # Function for getting the cache key of a .json file
+    #
+    # Input:    jsonFile - .json file to get the key for
+    #           squadListsHash - hash of the squad lists used to parse the file
+    #
+    # Output:   fileHash - hex digest of the cache version, file contents and
+    #                      squad lists hash
+
+    #Hash the cache version and the file contents in blocks
+    hasher = hashlib.sha1()
+    hasher.update(cacheVersion.encode())
+    with open(jsonFile, 'rb') as json_file:
+        for fileBlock in iter(lambda: json_file.read(1 << 20), b''):
+            hasher.update(fileBlock)
+    hasher.update(squadListsHash.encode())
+
+    return hasher.hexdigest()
+
+# %% saveDataCache
+
+def saveDataCache(dataDict, cachePath):
+
+    # Function for saving a set of data dictionaries to Feather files
+    #
+    # Input:    dataDict - dictionary of data dictionaries, as returned by
+    #                      getSingleMatchData or mergeMatchData
+    #           cachePath - directory to save the Feather files in
+
+    #Create the cache directory
+    os.makedirs(cachePath, exist_ok = True)
+
+    #Loop through the data and save each table
+    for dataName in dataDict.keys():
         #Set to dataframe
-        df_teamStatsData = pd.DataFrame.from_dict(teamStatsData)
-        #Check and return data
-        if exportDict is True:
-            exportData['teamStatsData'] = teamStatsData
-        if exportDf is True:
-            exportData['df_teamStatsData'] = df_teamStatsData
-    
-    #Return data dictionary
-    return exportData
-    
-    ##### TODO: other dataframes once extracted
-    
-# %%
-    
-    
\ No newline at end of file
+        df_data = pd.DataFrame.from_dict(dataDict[dataName])
+        #Store the list columns as .json strings (the ids in the lists can be
+        #numpy integers, so these are converted to integers)
+        for colName in nestedDataColumns.get(dataName, []):
+            df_data[colName] = [json.dumps(val, default = int) for val in df_data[colName]]
+        #Write to a temporary file and then move it in to place, so that an
+        #interrupted run doesn't leave a partial file in the cache
+        cacheFile = os.path.join(cachePath, dataName+'.feather')
+        df_data.to_feather(cacheFile+'.tmp')
+        os.replace(cacheFile+'.tmp', cacheFile)
+
+# %% checkDataCache
+
+def checkDataCache(cachePath, dataNames = None):
+
+    # Function for checking whether a set of data dictionaries is cached
+    #
+    # Input:    cachePath - directory the Feather files are saved in
+    #           dataNames - list of the data dictionaries to check for. The
+    #                       default of None checks for all of matchDataNames
+    #
+    # Output:   isCached - boolean of whether all of the tables are available
+
+    #Set to check all tables if not specified
+    if dataNames is None:
+        dataNames = matchDataNames
+
+    #Check for each table
+    for dataName in dataNames:
+        if not os.path.isfile(os.path.join(cachePath, dataName+'.feather')):
+            return False
+
+    return True
+
+# %% loadDataCache
+
+def loadDataCache(cachePath, dataNames = None):
+
+    # Function for loading a set of data dictionaries saved by saveDataCache
+    #
+    # Input:    cachePath - directory the Feather files are saved in
+    #           dataNames - list of the data dictionaries to load. The default
+    #                       of None loads all of matchDataNames
+    #
+    # Output:   dataDict - dictionary of data dictionaries, or None if any of
+    #                      the tables are missing from the cache
+
+    #Set to load all tables if not specified
+    if dataNames is None:
+        dataNames = matchDataNames
+
+    #Check that all of the tables are available
+    if not checkDataCache(cachePath, dataNames):
+        return None
+
+    #Loop through and load each table
+    dataDict = dict()
+    for dataName in dataNames:
+        df_data = pd.read_feather(os.path.join(cachePath, dataName+'.feather'))
+        #Convert the .json strings back to lists
+        for colName in nestedDataColumns.get(dataName, []):
+            df_data[colName] = [json.loads(val) for val in df_data[colName]]
+        #Set back to data dictionary
+        dataDict[dataName] = df_data.to_dict('list')
+
+    return dataDict
+
+# %% getShotCountCube
+
+def getShotCountCube(df_scoreFlow = None, df_matchInfo = None):
+
+    # Function for counting the shots in the score flow by team, round, match,
+    # quarter, period category, shot circle, shot type and outcome. The counts
+    # are taken with a single groupby and stored in one array, so the counts
+    # for each analysis can be taken from this with sumShotCounts
+    #
+    # Input:    df_scoreFlow - score flow dataframe from getMatchData
+    #           df_matchInfo - match info dataframe from getMatchData
+    #
+    # Output:   shotCounts - dictionary of the 'counts' array, along with the
+    #                        labels of each of its axes (see shotCountAxes)
+
+    #Set the labels of each axis. The teams, rounds, matches and quarters are
+    #taken from the match info so that any without shots are still included
+    shotCounts = {'squadId': [int(squadId) for squadId in np.unique(np.concatenate((df_matchInfo['homeSquadId'], df_matchInfo['awaySquadId'])))],
+                  'roundNo': [int(roundNo) for roundNo in np.unique(df_matchInfo['roundNo'])],
+                  'matchNo': [int(matchNo) for matchNo in np.unique(df_matchInfo['matchNo'])],
+                  'period': list(range(1, max([len(periodSeconds) for periodSeconds in df_matchInfo['periodSeconds']])+1)),
+                  'periodCategory': ['standard', 'twoPoint'],
+                  'shotCircle': ['innerCircle', 'outerCircle'],
+                  'shotType': ['standard', 'super'],
+                  'shotOutcome': [False, True]}
+
+    #Get the columns to group the shots by, with the shot type set from the score name
+    df_shots = pd.DataFrame({axisName: df_scoreFlow[axisName].to_numpy() for axisName in shotCountAxes if axisName != 'shotType'})
+    df_shots['shotType'] = np.where(df_scoreFlow['scoreName'].isin(['2pt Goal', '2pt Miss']), 'super', 'standard')
+
+    #Count the shots in each group
+    groupCounts = df_shots.groupby(shotCountAxes).size()
+
+    #Find where each group sits in the array
+    countInd = tuple(pd.Index(shotCounts[axisName]).get_indexer(groupCounts.index.get_level_values(axisName)) for axisName in shotCountAxes)
+    if any([(axisInd < 0).any() for axisInd in countInd]):
+        raise ValueError('Score flow contains shots that are not in the match info.')
+
+    #Place the counts in the array
+    counts = np.zeros([len(shotCounts[axisName]) for axisName in shotCountAxes], dtype = int)
+    counts[countInd] = groupCounts.to_numpy()
+    shotCounts['counts'] = counts
+
+    return shotCounts
+
+# %% sumShotCounts
+
+def sumShotCounts(shotCounts = None, keepAxes = None, **axisLabels):
+
+    # Function for summing the shot counts from getShotCountCube
+    #
+    # Input:    shotCounts - dictionary of shot counts from getShotCountCube
+    #           keepAxes - list of the axes to keep (in order), with the counts
+    #                      summed across the others. The default of None sums
+    #                      across all axes
+    #           axisLabels - labels to select on any axis, given by the axis name
+    #                        (e.g. squadId = 801, periodCategory = 'twoPoint'). A
+    #                        list of labels selects each of those labels in order
+    #
+    # Output:   shotSum - array of the summed counts with the keepAxes as its
+    #                     axes, or the total count if no axes are kept
+
+    #Set to sum across all axes if not specified
+    if keepAxes is None:
+        keepAxes = []
+
+    #Select the labels on each axis
+    counts = shotCounts['counts']
+    for axisName, labels in axisLabels.items():
+        if not isinstance(labels, list):
+            labels = [labels]
+        labelInd = [shotCounts[axisName].index(label) for label in labels]
+        counts = np.take(counts, labelInd, axis = shotCountAxes.index(axisName))
+
+    #Sum across the axes that aren't kept
+    counts = counts.sum(axis = tuple([shotCountAxes.index(axisName) for axisName in shotCountAxes if axisName not in keepAxes]))
+
+    #Put the kept axes in the requested order
+    keptAxes = [axisName for axisName in shotCountAxes if axisName in keepAxes]
+    shotSum = counts.transpose([keptAxes.index(axisName) for axisName in keepAxes])
+
+    return shotSum
+
+# %% getOpponentShotCounts
+
+def getOpponentShotCounts(shotCounts = None, df_matchInfo = None):
+
+    # Function for swapping the shot counts from getShotCountCube over to the
+    # opposition team in each match, giving the shots taken against each team
+    #
+    # Input:    shotCounts - dictionary of shot counts from getShotCountCube
+    #           df_matchInfo - match info dataframe from getMatchData
+    #
+    # Output:   oppShotCounts - dictionary of shot counts in the same format,
+    #                           with the squadId axis being the defending team
+
+    #Find the round, match and teams of each match in the array
+    roundInd = pd.Index(shotCounts['roundNo']).get_indexer(df_matchInfo['roundNo'])
+    matchInd = pd.Index(shotCounts['matchNo']).get_indexer(df_matchInfo['matchNo'])
+    homeInd = pd.Index(shotCounts['squadId']).get_indexer(df_matchInfo['homeSquadId'])
+    awayInd = pd.Index(shotCounts['squadId']).get_indexer(df_matchInfo['awaySquadId'])
+
+    #Swap the home and away teams counts in each match
+    oppCounts = np.zeros_like(shotCounts['counts'])
+    oppCounts[homeInd, roundInd, matchInd] = shotCounts['counts'][awayInd, roundInd, matchInd]
+    oppCounts[awayInd, roundInd, matchInd] = shotCounts['counts'][homeInd, roundInd, matchInd]
+
+    #Set the swapped counts with the same labels
+    oppShotCounts = dict(shotCounts)
+    oppShotCounts['counts'] = oppCounts
+
+    return oppShotCounts
+
+# %%
\ No newline at end of file
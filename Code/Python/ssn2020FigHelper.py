@@ -492,7 +492,9 @@ def indCompSimVis(df_compSimResults, team1, team2, compProps, colourDict,
     
     # Function to plot distributions of competitive sims for two teams
     #
-    # Input:    df_compSimResults - results dataframe of simulations
+    # Input:    df_compSimResults - results dataframe of simulations, or an index of
+    #                               the simulations (see SimResultsIndex in the
+    #                               sim helper)
     #           team1 - team name for first team
     #           team2 - team name for second team
     #           compProps - proportions of super shots being compared
@@ -541,17 +543,24 @@ def indCompSimVis(df_compSimResults, team1, team2, compProps, colourDict,
             #Extract current match up
             #This needs a condition in place to grab the appropriate 
             #proportions for the relevant teams based on position in 
-            #the team list
+            #the team list. The match up is taken straight from the index
+            #if one is given
             if tt < cc:
-                df_currComp = df_compSimResults.loc[(df_compSimResults['teamName'] == team1) &
-                                                    (df_compSimResults['opponentName'] == team2) &
-                                                    (df_compSimResults['teamSuperProp'] == compProps[p2]) &
-                                                    (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
+                if isinstance(df_compSimResults, pd.DataFrame):
+                    df_currComp = df_compSimResults.loc[(df_compSimResults['teamName'] == team1) &
+                                                        (df_compSimResults['opponentName'] == team2) &
+                                                        (df_compSimResults['teamSuperProp'] == compProps[p2]) &
+                                                        (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
+                else:
+                    df_currComp = df_compSimResults.getCell(team1, team2, compProps[p2], compProps[p1])
             elif cc < tt:
-                df_currComp = df_compSimResults.loc[(df_compSimResults['teamName'] == team2) &
-                                                    (df_compSimResults['opponentName'] == team1) &
-                                                    (df_compSimResults['teamSuperProp'] == compProps[p1]) &
-                                                    (df_compSimResults['opponentSuperProp'] == compProps[p2]),]
+                if isinstance(df_compSimResults, pd.DataFrame):
+                    df_currComp = df_compSimResults.loc[(df_compSimResults['teamName'] == team2) &
+                                                        (df_compSimResults['opponentName'] == team1) &
+                                                        (df_compSimResults['teamSuperProp'] == compProps[p1]) &
+                                                        (df_compSimResults['opponentSuperProp'] == compProps[p2]),]
+                else:
+                    df_currComp = df_compSimResults.getCell(team2, team1, compProps[p1], compProps[p2]).copy()
                 #Similarly, if the team order is flipped, the margins
                 #for these comparisons need to be inverted to plot
                 #properly
@@ -751,7 +760,9 @@ def allCompSimVis(df_compSimResults, teamName, compProps, colourDict, saveDir =
     
     # Function to plot distributions of competitive sims for one team
     #
-    # Input:    df_compSimResults - results dataframe of simulations
+    # Input:    df_compSimResults - results dataframe of simulations, or an index of
+    #                               the simulations (see SimResultsIndex in the
+    #                               sim helper)
     #           teamName - name of team for current visualisation
     #           compProps - proportions of super shots being compared
     #           colourDict - colour dictionary for team colours on plots
@@ -792,14 +803,23 @@ def allCompSimVis(df_compSimResults, teamName, compProps, colourDict, saveDir =
             #Extract current teams data and the relevant proportions
             #Note this is done separately to account for the fact that sometimes
             #the current team might be the 'team' or the 'opponent'
-            df_currComp1 = df_compSimResults.loc[(df_compSimResults['teamName'] == teamName) &
-                                                 (df_compSimResults['teamSuperProp'] == compProps[p2])&
-                                                 (df_compSimResults['opponentName'] != teamName) &
-                                                 (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
-            df_currComp2 = df_compSimResults.loc[(df_compSimResults['opponentName'] == teamName) &
-                                                 (df_compSimResults['opponentSuperProp'] == compProps[p2]) &
-                                                 (df_compSimResults['teamName'] != teamName) &
-                                                 (df_compSimResults['teamSuperProp'] == compProps[p1]),]
+            if isinstance(df_compSimResults, pd.DataFrame):
+                df_currComp1 = df_compSimResults.loc[(df_compSimResults['teamName'] == teamName) &
+                                                     (df_compSimResults['teamSuperProp'] == compProps[p2])&
+                                                     (df_compSimResults['opponentName'] != teamName) &
+                                                     (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
+                df_currComp2 = df_compSimResults.loc[(df_compSimResults['opponentName'] == teamName) &
+                                                     (df_compSimResults['opponentSuperProp'] == compProps[p2]) &
+                                                     (df_compSimResults['teamName'] != teamName) &
+                                                     (df_compSimResults['teamSuperProp'] == compProps[p1]),]
+            #Or take the blocks of the match ups from the index
+            else:
+                df_currComp1 = df_compSimResults.getCells(teamName = teamName,
+                                                          teamSuperProp = compProps[p2],
+                                                          opponentSuperProp = compProps[p1])
+                df_currComp2 = df_compSimResults.getCells(opponentName = teamName,
+                                                          opponentSuperProp = compProps[p2],
+                                                          teamSuperProp = compProps[p1])
             #For the second dataframe, the margin needs to be flipped to be
             #relative to the current team of interest
             df_currComp2['margin'] = df_currComp2['margin'] * -1
@@ -1006,7 +1026,9 @@ def groupedCompSimVis(df_compSimResults, compProps, saveDir = os.getcwd()):
     
     # Function to plot distributions of competitive sims for two teams
     #
-    # Input:    df_compSimResults - results dataframe of simulations
+    # Input:    df_compSimResults - results dataframe of simulations, or an index of
+    #                               the simulations (see SimResultsIndex in the
+    #                               sim helper)
     #           compProps - proportions of super shots being compared
     #           saveDir - directory to save files in to
     
@@ -1040,10 +1062,17 @@ def groupedCompSimVis(df_compSimResults, compProps, saveDir = os.getcwd()):
             #Extract all teams data and the relevant proportions
             #Note this is done separately to account for the fact that sometimes
             #the current team might be the 'team' or the 'opponent'
-            df_currComp1 = df_compSimResults.loc[(df_compSimResults['teamSuperProp'] == compProps[p2])&
-                                                 (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
-            df_currComp2 = df_compSimResults.loc[(df_compSimResults['opponentSuperProp'] == compProps[p2]) &
-                                                 (df_compSimResults['teamSuperProp'] == compProps[p1]),]
+            if isinstance(df_compSimResults, pd.DataFrame):
+                df_currComp1 = df_compSimResults.loc[(df_compSimResults['teamSuperProp'] == compProps[p2])&
+                                                     (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
+                df_currComp2 = df_compSimResults.loc[(df_compSimResults['opponentSuperProp'] == compProps[p2]) &
+                                                     (df_compSimResults['teamSuperProp'] == compProps[p1]),]
+            #Or take the blocks of the proportions from the index
+            else:
+                df_currComp1 = df_compSimResults.getCells(teamSuperProp = compProps[p2],
+                                                          opponentSuperProp = compProps[p1])
+                df_currComp2 = df_compSimResults.getCells(opponentSuperProp = compProps[p2],
+                                                          teamSuperProp = compProps[p1])
             #For the second dataframe, the margin needs to be flipped to be
             #relative to the current team of interest
             df_currComp2['margin'] = df_currComp2['margin'] * -1
@@ -1208,7 +1237,9 @@ def marginCompSimVis(df_compSimMargins, compProps, colourDict, saveDir = os.getc
     
     # Function to plot distributions of competitive sims for two teams
     #
-    # Input:    df_compSimMargins - results dataframe of simulations
+    # Input:    df_compSimMargins - results dataframe of simulations, or a view of
+    #                               the match ups of the simulations (see
+    #                               MatchupView in the sim helper)
     #           compProps - proportions of super shots being compared
     #           colourDict - colour dictionary for team colours on plots
     #           saveDir - directory to save files in to
@@ -1227,8 +1258,12 @@ def marginCompSimVis(df_compSimMargins, compProps, colourDict, saveDir = os.getc
         for p2 in range(0,len(compProps)):
     
             #Split to get example of 0% prop vs. 100% prop opponent
-            df_currPlot = df_compSimMargins.loc[(df_compSimMargins['teamSuperProp'] == compProps[p1]) &
-                                                (df_compSimMargins['opponentSuperProp'] == compProps[p2]),]
+            if isinstance(df_compSimMargins, pd.DataFrame):
+                df_currPlot = df_compSimMargins.loc[(df_compSimMargins['teamSuperProp'] == compProps[p1]) &
+                                                    (df_compSimMargins['opponentSuperProp'] == compProps[p2]),]
+            else:
+                df_currPlot = df_compSimMargins.getMatchups(teamSuperProp = compProps[p1],
+                                                            opponentSuperProp = compProps[p2])
     
             #Plot data
             sns.boxplot(x = 'teamName', y = 'margin',
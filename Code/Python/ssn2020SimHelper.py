@@ -0,0 +1,2646 @@
+# -*- coding: utf-8 -*-
+"""
+This helper script contains a series of functions that are used for
+running the Super Shot period simulations with batched NumPy calls.
+
+"""
+
+# %% Import packages
+
+import pandas as pd
+import numpy as np
+import scipy.stats as stats
+import random
+import math
+import re
+from multiprocessing import Pool
+from functools import partial
+from collections import deque
+
+# %% Settings
+
+#Upper edges of the super shot proportion bins. Each bin includes its upper edge
+#(e.g. a proportion of 0.1 sits in the 0%-10% bin)
+superPropEdges = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+#Names of the super shot proportion bins
+superPropCats = ['0%-10%', '10%-20%', '20%-30%', '30%-40%', '40%-50%',
+                 '50%-60%', '60%-70%', '70%-80%', '80%-90%', '90%-100%']
+
+#Shot, score and margin columns of the sim results tables, which are stored as 16
+#bit integers in the typed results (see getTypedResults)
+typedCountColumns = ['nShots', 'nStandard', 'nSuper', 'totalPts',
+                     'teamShots', 'teamSuperShots', 'teamStandardShots',
+                     'opponentShots', 'opponentSuperShots', 'opponentStandardShots',
+                     'teamScore', 'opponentScore', 'margin']
+
+#Name columns of the sim results tables, which are stored as categories in the
+#typed results
+typedNameColumns = ['squadNickname', 'superPropCat', 'teamName', 'opponentName']
+
+# %% getShotCountDist
+
+def getShotCountDist(totalShotsM, totalShotsSD, nQuarters):
+
+    # Function for getting the truncated normal distribution that the number of
+    # shots in a Power 5 period is sampled from. This is truncated at the 95% CI
+    # of the mean number of shots per quarter
+    #
+    # Input:    totalShotsM - mean number of shots per quarter
+    #           totalShotsSD - standard deviation of shots per quarter
+    #           nQuarters - number of quarters the mean and SD were taken from
+    #
+    # Output:   shotCountDist - frozen scipy truncated normal distribution
+
+    #Set the limits at the 95% CI of the mean
+    lowLim = totalShotsM - (1.96 * (totalShotsSD / math.sqrt(nQuarters)))
+    uppLim = totalShotsM + (1.96 * (totalShotsSD / math.sqrt(nQuarters)))
+
+    #Create the distribution
+    shotCountDist = stats.truncnorm((lowLim - totalShotsM) / totalShotsSD,
+                                    (uppLim - totalShotsM) / totalShotsSD,
+                                    loc = totalShotsM, scale = totalShotsSD)
+
+    return shotCountDist
+
+# %% getSuperPropCats
+
+def getSuperPropCats(superProp):
+
+    # Function for getting the super shot proportion bin of each proportion
+    #
+    # Input:    superProp - array of super shot proportions
+    #
+    # Output:   propCatInd - array of the index of each proportions bin in superPropCats
+
+    #Search for the first bin edge each proportion is less than or equal to
+    propCatInd = np.searchsorted(superPropEdges, superProp, side = 'left')
+
+    return propCatInd
+
+# %% getUnitGenerator
+
+def getUnitGenerator(seedEntropy, unitKey):
+
+    # Function for getting the random generator of a sim work unit. Each unit gets
+    # an independent stream spawned from the seed with the unit key, so its results
+    # don't depend on which process runs it or the order the units are run in
+    #
+    # Input:    seedEntropy - entropy of the seed sequence for the whole run
+    #           unitKey - tuple of integers identifying the unit (e.g. team index)
+    #
+    # Output:   rng - numpy random generator for the unit
+
+    rng = np.random.default_rng(np.random.SeedSequence(seedEntropy, spawn_key = unitKey))
+
+    return rng
+
+# %% getCounterUniforms
+
+def getCounterUniforms(seedEntropy, unitKey, simStart = 0, nSims = 1):
+
+    # Function for getting the uniform random numbers of a range of sims from a
+    # counter based (Philox) generator. The generator of a unit is keyed by the
+    # seed and unit key, and each sim takes the four numbers from its own block of
+    # the counter. Any sim, or range of sims, can therefore be regenerated without
+    # running the sims before it
+    #
+    # Input:    seedEntropy - entropy of the seed sequence for the whole run
+    #           unitKey - tuple of integers identifying the unit (e.g. team index)
+    #           simStart - index of the first sim to get the numbers of
+    #           nSims - number of sims to get the numbers of
+    #
+    # Output:   simUniforms - array of the uniform random numbers of each sim, with
+    #                         four numbers for each sim
+
+    #Set the generator key from the seed and unit
+    philoxKey = np.random.SeedSequence(seedEntropy, spawn_key = unitKey).generate_state(2, dtype = np.uint64)
+
+    #Start the generator at the first sims block and get the numbers
+    rng = np.random.Generator(np.random.Philox(key = philoxKey, counter = simStart))
+    simUniforms = rng.random(nSims * 4).reshape(nSims, 4)
+
+    return simUniforms
+
+# %% runSimUnits
+
+def runSimUnits(unitFunc, simUnits, nProcesses = 1):
+
+    # Function for running sim work units, either one after the other or in a
+    # process pool. The results are returned in the same order as the units
+    #
+    # Input:    unitFunc - function that takes a unit and returns its results
+    #           simUnits - list of the units to run
+    #           nProcesses - number of processes to run the units with. Note that
+    #                        on Windows a process pool requires the call to sit
+    #                        under an if __name__ == '__main__' guard
+    #
+    # Output:   unitResults - list of the results of each unit
+
+    #Run the units in a process pool if requested
+    if nProcesses > 1 and len(simUnits) > 1:
+        with Pool(nProcesses) as pool:
+            unitResults = pool.map(unitFunc, simUnits)
+    else:
+        unitResults = list(map(unitFunc, simUnits))
+
+    return unitResults
+
+# %% iterSimUnits
+
+def iterSimUnits(unitFunc, simUnits, nProcesses = 1):
+
+    # Function for running sim work units and getting the results of each unit as
+    # it finishes, so that the results of earlier units can be written to file
+    # and released while the later units run (see runSimUnits). No more than two
+    # units for each process are sent to the pool ahead of the results being used,
+    # so finished results don't build up when they're used slower than they're made
+    #
+    # Input:    unitFunc - function that takes a unit and returns its results
+    #           simUnits - list of the units to run
+    #           nProcesses - number of processes to run the units with
+    #
+    # Output:   unitResult - generator of the results of each unit, in the same
+    #                        order as the units
+
+    #Run the units in a process pool if requested
+    if nProcesses > 1 and len(simUnits) > 1:
+        with Pool(nProcesses) as pool:
+
+            #Send the units to the pool, waiting for the oldest result when full
+            pendingResults = deque()
+            for simUnit in simUnits:
+                pendingResults.append(pool.apply_async(unitFunc, (simUnit,)))
+                if len(pendingResults) >= 2 * nProcesses:
+                    yield pendingResults.popleft().get()
+
+            #Return the remaining results
+            while len(pendingResults) > 0:
+                yield pendingResults.popleft().get()
+    else:
+        for simUnit in simUnits:
+            yield unitFunc(simUnit)
+
+# %% runStandardSimUnit
+
+def runStandardSimUnit(teamInd, teamShotStats = None, superShotProps = None,
+                       nSims = 1000, seedEntropy = None, batchInd = None):
+
+    # Function for running the 'standard' sims of one team for all proportions,
+    # with the teams own random generator (see runStandardSims)
+    #
+    # Input:    teamInd - index of the team in teamShotStats
+    #           teamShotStats - dictionary of lists of the teams shot statistics
+    #           superShotProps - list of super shot proportions to simulate
+    #           nSims - number of sims to run for each proportion
+    #           seedEntropy - entropy of the seed sequence for the whole run
+    #           batchInd - index of the batch of sims when a teams sims are run in
+    #                      batches, with each batch getting its own random generator.
+    #                      The default of None runs all of the teams sims at once
+    #
+    # Output:   nShots - array of the shots in each sim with dimensions of proportion
+    #                    and sim, leaving out sims where the team gets no shots
+    #           nSuper - as above for the super shots
+    #           madeStandard - as above for the made standard shots
+    #           madeSuper - as above for the made super shots
+
+    #Get the teams random generator
+    if batchInd is None:
+        rng = getUnitGenerator(seedEntropy, (teamInd,))
+    else:
+        rng = getUnitGenerator(seedEntropy, (teamInd, batchInd))
+
+    #Sample the number of shots for the teams sims and round to whole numbers
+    shotCountDist = getShotCountDist(teamShotStats['totalShotsM'][teamInd],
+                                     teamShotStats['totalShotsSD'][teamInd],
+                                     teamShotStats['nQuarters'][teamInd])
+    nShotVals = np.around(shotCountDist.rvs(nSims, random_state = rng)).astype(int)
+
+    #Get the standard and super shots for each proportion and sim, only
+    #keeping the sims where the team gets shots
+    superShotProps = np.array(superShotProps, dtype = float).reshape(-1,1)
+    nShots = np.broadcast_to(nShotVals[nShotVals > 0], (len(superShotProps), np.sum(nShotVals > 0)))
+    nSuper = np.around(nShots * superShotProps).astype(int)
+    nStandard = nShots - nSuper
+
+    #Draw the made shots for each sim
+    madeStandard = rng.binomial(nStandard, teamShotStats['madeStandard'][teamInd] / \
+                                (teamShotStats['madeStandard'][teamInd] + teamShotStats['missedStandard'][teamInd]))
+    madeSuper = rng.binomial(nSuper, teamShotStats['madeSuper'][teamInd] / \
+                             (teamShotStats['madeSuper'][teamInd] + teamShotStats['missedSuper'][teamInd]))
+
+    return nShots.astype(np.int16), nSuper.astype(np.int16), madeStandard.astype(np.int16), madeSuper.astype(np.int16)
+
+# %% getStandardUnitResults
+
+def getStandardUnitResults(teamInd, unitResult, teamShotStats = None):
+
+    # Function for getting the results of one teams 'standard' sims in the
+    # format of runStandardSims
+    #
+    # Input:    teamInd - index of the team in teamShotStats
+    #           unitResult - tuple of the arrays returned by runStandardSimUnit
+    #           teamShotStats - dictionary of lists of the teams shot statistics
+    #
+    # Output:   teamSimResults - dictionary of compact arrays of the teams sim
+    #                            results, ordered by proportion and sim. The team
+    #                            name and proportion bin are given as their index
+
+    #Get the teams sim results
+    nShots, nSuper, madeStandard, madeSuper = unitResult
+    superProp = (nSuper / nShots).ravel()
+    teamSimResults = {'squadId': np.full(nShots.size, teamShotStats['squadId'][teamInd], dtype = np.int32),
+                      'squadNickname': np.full(nShots.size, teamInd, dtype = np.int8),
+                      'nShots': nShots.ravel(),
+                      'nStandard': (nShots - nSuper).ravel(),
+                      'nSuper': nSuper.ravel(),
+                      'madeStandard': madeStandard.ravel(),
+                      'madeSuper': madeSuper.ravel(),
+                      'superProp': superProp,
+                      'superPropCat': getSuperPropCats(superProp).astype(np.int8),
+                      'totalPts': (madeStandard + (madeSuper * 2)).ravel()}
+
+    return teamSimResults
+
+# %% runStandardSims
+
+def runStandardSims(teamShotStats = None, superShotProps = None,
+                    nSims = 1000, seed = None, nProcesses = 1):
+
+    # Function for running the 'standard' super shot sims for each team. The
+    # sims for a team are drawn together across all proportions and sims. Each
+    # shot in the original sims is made with a probability drawn from a beta
+    # distribution of the teams made and missed shots. As these draws are
+    # independent, the number of made shots is binomial with the mean of that
+    # beta distribution, so the made shots are drawn as one binomial count for
+    # each sim rather than shot by shot. Each team is a separate work unit with
+    # its own random generator, so the results are the same for any number of
+    # processes
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadId, squadNickname,
+    #                           totalShotsM, totalShotsSD, nQuarters, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           superShotProps - list of super shot proportions to simulate
+    #           nSims - number of sims to run for each team and proportion
+    #           seed - seed for the random generators
+    #           nProcesses - number of processes to run the teams sims with
+    #
+    # Output:   superSimResults - dictionary of compact arrays of the sim results,
+    #                             ordered by team, proportion and sim. Sims where
+    #                             a team gets no shots are left out. The made shot
+    #                             counts are given in place of the lists of shot
+    #                             outcomes
+
+    #Run the sims for each team
+    unitFunc = partial(runStandardSimUnit, teamShotStats = teamShotStats,
+                       superShotProps = superShotProps, nSims = nSims,
+                       seedEntropy = np.random.SeedSequence(seed).entropy)
+    unitResults = runSimUnits(unitFunc, list(range(len(teamShotStats['squadId']))),
+                              nProcesses = nProcesses)
+
+    #Get the number of results for each team
+    nTeamResults = [unitResults[tt][0].size for tt in range(len(unitResults))]
+    nResults = int(np.sum(nTeamResults))
+
+    #Set dictionary of compact arrays to store the results in
+    superSimResults = {'squadId': np.zeros(nResults, dtype = np.int32),
+                       'squadNickname': np.zeros(nResults, dtype = np.int8),
+                       'nShots': np.zeros(nResults, dtype = np.int16),
+                       'nStandard': np.zeros(nResults, dtype = np.int16),
+                       'nSuper': np.zeros(nResults, dtype = np.int16),
+                       'madeStandard': np.zeros(nResults, dtype = np.int16),
+                       'madeSuper': np.zeros(nResults, dtype = np.int16),
+                       'superProp': np.zeros(nResults, dtype = float),
+                       'superPropCat': np.zeros(nResults, dtype = np.int8),
+                       'totalPts': np.zeros(nResults, dtype = np.int16)}
+
+    #Loop through teams and store their results
+    startInd = 0
+    for tt in range(len(teamShotStats['squadId'])):
+        teamSimResults = getStandardUnitResults(tt, unitResults[tt], teamShotStats = teamShotStats)
+        teamInd = slice(startInd, startInd + nTeamResults[tt])
+        for colName in superSimResults.keys():
+            superSimResults[colName][teamInd] = teamSimResults[colName]
+        startInd = startInd + nTeamResults[tt]
+
+    #Set the team names and proportion bins as categories
+    superSimResults['squadNickname'] = pd.Categorical.from_codes(superSimResults['squadNickname'],
+                                                                 categories = teamShotStats['squadNickname'])
+    superSimResults['superPropCat'] = pd.Categorical.from_codes(superSimResults['superPropCat'],
+                                                                categories = superPropCats)
+
+    return superSimResults
+
+# %% iterStandardSims
+
+def iterStandardSims(teamShotStats = None, superShotProps = None,
+                     nSims = 1000, seed = None, nProcesses = 1):
+
+    # Function for running the 'standard' super shot sims and getting the results
+    # one team at a time, so that only one teams sims are held in memory (e.g. to
+    # stream to file with writeSimResults). The results are the same as from
+    # runStandardSims with the same seed
+    #
+    # Input:    teamShotStats - dictionary of lists of the teams shot statistics
+    #           superShotProps - list of super shot proportions to simulate
+    #           nSims - number of sims to run for each team and proportion
+    #           seed - seed for the random generators
+    #           nProcesses - number of processes to run the teams sims with
+    #
+    # Output:   teamSimResults - generator of dictionaries of compact arrays of
+    #                            each teams sim results (see runStandardSims)
+
+    #Run the sims for each team
+    unitFunc = partial(runStandardSimUnit, teamShotStats = teamShotStats,
+                       superShotProps = superShotProps, nSims = nSims,
+                       seedEntropy = np.random.SeedSequence(seed).entropy)
+    unitResults = iterSimUnits(unitFunc, list(range(len(teamShotStats['squadId']))),
+                               nProcesses = nProcesses)
+
+    #Get the results of each team as it finishes
+    for tt, unitResult in enumerate(unitResults):
+        teamSimResults = getStandardUnitResults(tt, unitResult, teamShotStats = teamShotStats)
+
+        #Set the team names and proportion bins as categories
+        teamSimResults['squadNickname'] = pd.Categorical.from_codes(teamSimResults['squadNickname'],
+                                                                    categories = teamShotStats['squadNickname'])
+        teamSimResults['superPropCat'] = pd.Categorical.from_codes(teamSimResults['superPropCat'],
+                                                                   categories = superPropCats)
+
+        yield teamSimResults
+
+# %% getShotCountPmf
+
+def getShotCountPmf(totalShotsM, totalShotsSD, nQuarters):
+
+    # Function for getting the exact probability of each number of shots in a
+    # Power 5 period. This is the chance of a value sampled from the truncated
+    # normal distribution rounding to each whole number of shots. Only shot
+    # numbers above zero are kept, as the sims without shots are not analysed
+    #
+    # Input:    totalShotsM - mean number of shots per quarter
+    #           totalShotsSD - standard deviation of shots per quarter
+    #           nQuarters - number of quarters the mean and SD were taken from
+    #
+    # Output:   nShotVals - array of the possible numbers of shots
+    #           nShotProbs - array of the probability of each number of shots,
+    #                        given that the team gets at least one shot
+
+    #Get the distribution the number of shots is sampled from
+    shotCountDist = getShotCountDist(totalShotsM, totalShotsSD, nQuarters)
+
+    #Get the whole numbers of shots that fall within the distribution limits
+    lowLim, uppLim = shotCountDist.support()
+    nShotVals = np.arange(max(np.around(lowLim), 1), np.around(uppLim) + 1).astype(int)
+
+    #Get the probability of a sample rounding to each number of shots
+    nShotProbs = shotCountDist.cdf(nShotVals + 0.5) - shotCountDist.cdf(nShotVals - 0.5)
+
+    #Remove any numbers of shots that can't occur
+    nShotVals = nShotVals[nShotProbs > 0]
+    nShotProbs = nShotProbs[nShotProbs > 0]
+
+    return nShotVals, nShotProbs / np.sum(nShotProbs)
+
+# %% getScorePmf
+
+def getScorePmf(nStandard, nSuper, probStandard, probSuper):
+
+    # Function for getting the exact probability of each total score from a set
+    # number of standard and super shots. The made shots of each type are
+    # binomial, and the standard shot points and doubled super shot points are
+    # convolved to give the total score
+    #
+    # Input:    nStandard - number of standard shots
+    #           nSuper - number of super shots
+    #           probStandard - probability of making a standard shot
+    #           probSuper - probability of making a super shot
+    #
+    # Output:   scorePmf - array of the probability of each total score, indexed
+    #                      by the score
+
+    #Get the probability of each number of made shots
+    standardPmf = stats.binom.pmf(np.arange(nStandard + 1), nStandard, probStandard)
+    superMadePmf = stats.binom.pmf(np.arange(nSuper + 1), nSuper, probSuper)
+
+    #Spread the super shot probabilities on to the two point scores
+    superPmf = np.zeros(nSuper * 2 + 1)
+    superPmf[::2] = superMadePmf
+
+    #Combine the standard and super shot points
+    scorePmf = np.convolve(standardPmf, superPmf)
+
+    return scorePmf
+
+# %% getStandardScorePmfs
+
+def getStandardScorePmfs(teamShotStats = None, superShotProps = None):
+
+    # Function for getting the exact distribution of the total points for each
+    # team and super shot proportion in the 'standard' sims. Each shot in the
+    # sims is made with a probability drawn from a beta distribution of the teams
+    # made and missed shots. As these draws are independent, the number of made
+    # shots is binomial with the mean of that beta distribution. The score
+    # distributions for each number of shots are then averaged over the chance
+    # of getting that number of shots
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadId, squadNickname,
+    #                           totalShotsM, totalShotsSD, nQuarters, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           superShotProps - list of super shot proportions to examine
+    #
+    # Output:   scorePmfs - dictionary of lists with the probability (prob) of each
+    #                       total score (totalPts) for each team and proportion
+
+    #Set dictionary to store the score distributions in
+    scorePmfs = {'squadId': [], 'squadNickname': [],
+                 'superShotProp': [], 'totalPts': [], 'prob': []}
+
+    #Loop through teams
+    for tt in range(len(teamShotStats['squadId'])):
+
+        #Get the teams shot probabilities
+        probStandard = teamShotStats['madeStandard'][tt] / \
+            (teamShotStats['madeStandard'][tt] + teamShotStats['missedStandard'][tt])
+        probSuper = teamShotStats['madeSuper'][tt] / \
+            (teamShotStats['madeSuper'][tt] + teamShotStats['missedSuper'][tt])
+
+        #Get the chance of each number of shots
+        nShotVals, nShotProbs = getShotCountPmf(teamShotStats['totalShotsM'][tt],
+                                                teamShotStats['totalShotsSD'][tt],
+                                                teamShotStats['nQuarters'][tt])
+
+        #Loop through the proportions
+        for pp in range(len(superShotProps)):
+
+            #Sum the score distributions across the numbers of shots
+            propPmf = np.zeros(max(nShotVals) * 2 + 1)
+            for kk in range(len(nShotVals)):
+                nSuper = int(np.around(nShotVals[kk] * superShotProps[pp]))
+                scorePmf = getScorePmf(nShotVals[kk] - nSuper, nSuper, probStandard, probSuper)
+                propPmf[0:len(scorePmf)] = propPmf[0:len(scorePmf)] + (scorePmf * nShotProbs[kk])
+
+            #Store the scores that can occur
+            ptsVals = np.nonzero(propPmf)[0]
+            scorePmfs['squadId'].extend([teamShotStats['squadId'][tt]] * len(ptsVals))
+            scorePmfs['squadNickname'].extend([teamShotStats['squadNickname'][tt]] * len(ptsVals))
+            scorePmfs['superShotProp'].extend([superShotProps[pp]] * len(ptsVals))
+            scorePmfs['totalPts'].extend(ptsVals.tolist())
+            scorePmfs['prob'].extend(propPmf[ptsVals].tolist())
+
+    return scorePmfs
+
+# %% getStandardSimSummary
+
+def getStandardSimSummary(teamShotStats = None, superShotProps = None):
+
+    # Function for getting the exact proportion of sims in which each super shot
+    # proportion bin gives the maximum and minimum score for each team. This
+    # matches the summary of the 'standard' sims without sampling. Where scores
+    # are tied the smaller proportion is taken for the maximum and the larger
+    # proportion for the minimum, as in the sims summary
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadId, squadNickname,
+    #                           totalShotsM, totalShotsSD, nQuarters, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           superShotProps - list of super shot proportions to examine, in
+    #                            increasing order
+    #
+    # Output:   summaryMaxSimResults - dictionary of lists with the proportion of
+    #                                  sims each bin gives the max score for each
+    #                                  team, along with the mean, min and max shots
+    #           summaryMinSimResults - as above for the min score
+
+    #Set dictionaries to store data into
+    summaryMaxSimResults = {'squadNickname': []}
+    summaryMinSimResults = {'squadNickname': []}
+    for propCat in superPropCats:
+        summaryMaxSimResults[propCat] = []
+        summaryMinSimResults[propCat] = []
+    for shotLabel in ['meanShots', 'minShots', 'maxShots']:
+        summaryMaxSimResults[shotLabel] = []
+        summaryMinSimResults[shotLabel] = []
+
+    #Loop through teams
+    for tt in range(len(teamShotStats['squadId'])):
+
+        #Get the teams shot probabilities
+        probStandard = teamShotStats['madeStandard'][tt] / \
+            (teamShotStats['madeStandard'][tt] + teamShotStats['missedStandard'][tt])
+        probSuper = teamShotStats['madeSuper'][tt] / \
+            (teamShotStats['madeSuper'][tt] + teamShotStats['missedSuper'][tt])
+
+        #Get the chance of each number of shots
+        nShotVals, nShotProbs = getShotCountPmf(teamShotStats['totalShotsM'][tt],
+                                                teamShotStats['totalShotsSD'][tt],
+                                                teamShotStats['nQuarters'][tt])
+
+        #Set arrays to sum the chance of each bin giving the max and min score
+        maxBinProbs = np.zeros(len(superPropCats))
+        minBinProbs = np.zeros(len(superPropCats))
+
+        #Loop through the numbers of shots
+        for kk in range(len(nShotVals)):
+
+            #Get the score distribution for each proportion, padded to the same scores
+            nSuper = np.around(nShotVals[kk] * np.array(superShotProps)).astype(int)
+            scorePmfs = np.zeros((len(superShotProps), nShotVals[kk] * 2 + 1))
+            for pp in range(len(superShotProps)):
+                scorePmf = getScorePmf(nShotVals[kk] - nSuper[pp], nSuper[pp], probStandard, probSuper)
+                scorePmfs[pp,0:len(scorePmf)] = scorePmf
+
+            #Get the chance of each proportion scoring at most (lessEqual) and less
+            #than (lessThan) each score
+            lessEqual = np.cumsum(scorePmfs, axis = 1)
+            lessThan = lessEqual - scorePmfs
+
+            #Get the chance of each proportion giving the max and min score. The
+            #earlier proportions must score less to not take the tie for the max,
+            #and the later proportions must score more to not take the tie for the min
+            for pp in range(len(superShotProps)):
+                maxProb = np.sum(scorePmfs[pp] * np.prod(lessThan[:pp], axis = 0) *
+                                 np.prod(lessEqual[pp+1:], axis = 0))
+                minProb = np.sum(scorePmfs[pp] * np.prod(1 - lessThan[:pp], axis = 0) *
+                                 np.prod(1 - lessEqual[pp+1:], axis = 0))
+                #Add to the bin of the proportions actual super shot proportion
+                propCatInd = getSuperPropCats(nSuper[pp] / nShotVals[kk])
+                maxBinProbs[propCatInd] = maxBinProbs[propCatInd] + (maxProb * nShotProbs[kk])
+                minBinProbs[propCatInd] = minBinProbs[propCatInd] + (minProb * nShotProbs[kk])
+
+        #Store the teams results
+        summaryMaxSimResults['squadNickname'].append(teamShotStats['squadNickname'][tt])
+        summaryMinSimResults['squadNickname'].append(teamShotStats['squadNickname'][tt])
+        for cc in range(len(superPropCats)):
+            summaryMaxSimResults[superPropCats[cc]].append(maxBinProbs[cc])
+            summaryMinSimResults[superPropCats[cc]].append(minBinProbs[cc])
+        for summaryResults in [summaryMaxSimResults, summaryMinSimResults]:
+            summaryResults['meanShots'].append(np.sum(nShotVals * nShotProbs))
+            summaryResults['minShots'].append(min(nShotVals))
+            summaryResults['maxShots'].append(max(nShotVals))
+
+    return summaryMaxSimResults, summaryMinSimResults
+
+# %% getStandardMaxMinSummary
+
+def getStandardMaxMinSummary(df_superSimResults, teamNames, superShotProps):
+
+    # Function for getting the proportion of the 'standard' sims in which each
+    # super shot proportion bin gives the maximum and minimum score for each team,
+    # from the results of each sim. Where scores are tied the smallest actual
+    # proportion is taken for the maximum and the largest for the minimum, at the
+    # first proportion simulated with that actual proportion
+    #
+    # Input:    df_superSimResults - dataframe of 'standard' sim results, with the
+    #                                sims of each team ordered by proportion
+    #           teamNames - list of the team names
+    #           superShotProps - list of super shot proportions simulated
+    #
+    # Output:   summaryMaxSimResults - dictionary of lists with the proportion of
+    #                                  sims each bin gives the max score for each
+    #                                  team, along with the mean, min and max shots
+    #           summaryMinSimResults - as above for the min score
+
+    #Set dictionaries to store data into
+    summaryMaxSimResults = {'squadNickname': []}
+    summaryMinSimResults = {'squadNickname': []}
+    for propCat in superPropCats:
+        summaryMaxSimResults[propCat] = []
+        summaryMinSimResults[propCat] = []
+    for shotLabel in ['meanShots', 'minShots', 'maxShots']:
+        summaryMaxSimResults[shotLabel] = []
+        summaryMinSimResults[shotLabel] = []
+
+    #Loop through teams
+    for teamName in teamNames:
+
+        #Get the teams results as arrays with dimensions of proportion and sim
+        df_currTeamSims = df_superSimResults.loc[(df_superSimResults['squadNickname'] == teamName),]
+        nTeamSims = int(len(df_currTeamSims) / len(superShotProps))
+        totalPts, superProp, nShots = [df_currTeamSims[colName].to_numpy()[:len(superShotProps)*nTeamSims].reshape(len(superShotProps), nTeamSims)
+                                       for colName in ['totalPts', 'superProp', 'nShots']]
+        simInd = np.arange(nTeamSims)
+
+        #Find the proportion with the max and min score in each sim
+        for summaryResults, isBest, tiedProp, otherProp in [(summaryMaxSimResults, totalPts == np.max(totalPts, axis = 0), np.min, np.inf),
+                                                            (summaryMinSimResults, totalPts == np.min(totalPts, axis = 0), np.max, -np.inf)]:
+
+            #Take the first proportion with the best score, or where scores are
+            #tied the first proportion with the smallest (max) or largest (min)
+            #actual proportion of those tied
+            bestProp = tiedProp(np.where(isBest, superProp, otherProp), axis = 0)
+            bestInd = np.where(np.sum(isBest, axis = 0) > 1,
+                               np.argmax(superProp == bestProp, axis = 0),
+                               np.argmax(isBest, axis = 0))
+
+            #Store the teams results
+            bestShots = nShots[bestInd,simInd]
+            propCatCounts = np.bincount(getSuperPropCats(superProp[bestInd,simInd]), minlength = len(superPropCats))
+            summaryResults['squadNickname'].append(teamName)
+            for cc in range(len(superPropCats)):
+                summaryResults[superPropCats[cc]].append(propCatCounts[cc] / nTeamSims)
+            summaryResults['meanShots'].append(np.mean(bestShots))
+            summaryResults['minShots'].append(np.min(bestShots))
+            summaryResults['maxShots'].append(np.max(bestShots))
+
+    return summaryMaxSimResults, summaryMinSimResults
+
+# %% runTeamCompSims
+
+def runTeamCompSims(teamShotStats = None, teamInd = None, compProps = None,
+                    teamShots = None, seed = None):
+
+    # Function for simulating a teams scores for each super shot proportion in the
+    # 'competitive' sims. The shots are taken one by one after setting the numpy
+    # and random seeds, in the same order as the original competitive sims, so
+    # the results are the same as those from the original loops
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           teamInd - index of the team to simulate in teamShotStats
+    #           compProps - list of super shot proportions to simulate
+    #           teamShots - array of the number of shots the team gets in each sim
+    #           seed - seed for the numpy and random generators
+    #
+    # Output:   teamScores - dictionary of lists of the sim results, ordered by
+    #                        proportion and sim
+
+    #Set seed to same for each team
+    np.random.seed(seed)
+    random.seed(seed)
+
+    #Set dictionary to store the results in
+    teamScores = {'score': [], 'shots': [], 'superShots': [], 'standardShots': [],
+                  'superProp': [], 'standardOutcomes': [], 'superOutcomes': []}
+
+    #Loop through the proportions
+    for pp in range(len(compProps)):
+
+        #Loop through the number of simulations
+        for nn in range(len(teamShots)):
+
+            #Calculate number of standard and super shots to 'take'
+            superShots = np.around(teamShots[nn] * compProps[pp])
+            standardShots = teamShots[nn] - superShots
+
+            #Set variable to tally current score
+            currScore = 0
+
+            #Set list to store standard shot outcomes in
+            standardOutcomes = []
+            #Loop through standard shots and add to total
+            if standardShots > 0:
+                #Sample shot success probability from teams data
+                shotProb = np.random.beta(teamShotStats['madeStandard'][teamInd],
+                                          teamShotStats['missedStandard'][teamInd],
+                                          size = int(standardShots))
+                #Loop through shots and check shot success
+                for ss in range(int(standardShots)):
+                    if random.random() < shotProb[ss]:
+                        currScore = currScore + 1
+                        standardOutcomes.append('made')
+                    else:
+                        standardOutcomes.append('miss')
+
+            #Set list to store super shot outcomes in
+            superOutcomes = []
+            #Loop through super shots and add to total
+            if superShots > 0:
+                #Sample shot success probability from teams data
+                shotProb = np.random.beta(teamShotStats['madeSuper'][teamInd],
+                                          teamShotStats['missedSuper'][teamInd],
+                                          size = int(superShots))
+                #Loop through shots and check shot success
+                for ss in range(int(superShots)):
+                    if random.random() < shotProb[ss]:
+                        currScore = currScore + 2
+                        superOutcomes.append('made')
+                    else:
+                        superOutcomes.append('miss')
+
+            #Append data to the results
+            teamScores['score'].append(currScore)
+            teamScores['shots'].append(teamShots[nn])
+            teamScores['superShots'].append(superShots)
+            teamScores['standardShots'].append(standardShots)
+            teamScores['superProp'].append(compProps[pp])
+            teamScores['standardOutcomes'].append(standardOutcomes)
+            teamScores['superOutcomes'].append(superOutcomes)
+
+    return teamScores
+
+# %% getCachedTeamScores
+
+def getCachedTeamScores(scoreCache = None, teamShotStats = None, teamInd = None,
+                        compProps = None, teamShots = None, shotModel = None,
+                        seed = None):
+
+    # Function for getting a teams simulated scores in the 'competitive' sims from
+    # a cache, so that each team is only simulated once rather than for every
+    # match up. The scores are simulated with runTeamCompSims and stored if they
+    # aren't in the cache yet. The sims for each proportion follow on from the
+    # previous proportion after seeding, so the full list of proportions is
+    # used in the key
+    #
+    # Input:    scoreCache - dictionary to store the simulated scores in
+    #           teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           teamInd - index of the team to simulate in teamShotStats
+    #           compProps - list of super shot proportions to simulate
+    #           teamShots - array of the number of shots the team gets in each sim
+    #           shotModel - name of the shots given in teamShots (e.g. 'matchedTeamA')
+    #           seed - seed for the numpy and random generators
+    #
+    # Output:   teamScores - dictionary of lists of the sim results (see runTeamCompSims)
+
+    #Set the key for the teams scores
+    cacheKey = (teamShotStats['squadNickname'][teamInd], tuple(compProps), shotModel, seed)
+
+    #Simulate the scores if they aren't in the cache
+    if cacheKey not in scoreCache:
+        scoreCache[cacheKey] = runTeamCompSims(teamShotStats = teamShotStats, teamInd = teamInd,
+                                               compProps = compProps, teamShots = teamShots,
+                                               seed = seed)
+
+    return scoreCache[cacheKey]
+
+# %% CompSimResults
+
+class CompSimResults:
+
+    # Results of the batched 'competitive' sims from runCompSims, stored as arrays
+    # rather than lists. The made shots of each team are kept for the team (A) and
+    # opponent (B) numbers of shots, and the scores and margins of every match up
+    # are calculated from these when needed
+
+    def __init__(self, teamNames = None, compProps = None,
+                 teamShots = None, oppShots = None,
+                 teamSuperShots = None, oppSuperShots = None,
+                 teamMadeStandard = None, teamMadeSuper = None,
+                 oppMadeStandard = None, oppMadeSuper = None):
+
+        # Input:    teamNames - list of the team names
+        #           compProps - array of the super shot proportions simulated
+        #           teamShots - array of the team (A) number of shots in each sim
+        #           oppShots - array of the opponent (B) number of shots in each sim
+        #           teamSuperShots - array of the team super shots with dimensions
+        #                            of proportion and sim
+        #           oppSuperShots - as above for the opponent number of shots
+        #           teamMadeStandard - array of the made standard shots of each team
+        #                              using the team number of shots, with dimensions
+        #                              of team, proportion and sim
+        #           teamMadeSuper - as above for the made super shots
+        #           oppMadeStandard - as above for the opponent number of shots
+        #           oppMadeSuper - as above for the opponent made super shots
+
+        self.teamNames = list(teamNames)
+        self.compProps = np.array(compProps)
+        self.teamShots = teamShots
+        self.oppShots = oppShots
+        self.teamSuperShots = teamSuperShots
+        self.oppSuperShots = oppSuperShots
+        self.teamMadeStandard = teamMadeStandard
+        self.teamMadeSuper = teamMadeSuper
+        self.oppMadeStandard = oppMadeStandard
+        self.oppMadeSuper = oppMadeSuper
+
+    def getScores(self):
+
+        # Function for getting the score of each team in each sim
+        #
+        # Output:   teamScores - array of the scores using the team number of shots,
+        #                        with dimensions of team, proportion and sim
+        #           oppScores - as above using the opponent number of shots
+
+        teamScores = self.teamMadeStandard + (self.teamMadeSuper * 2)
+        oppScores = self.oppMadeStandard + (self.oppMadeSuper * 2)
+
+        return teamScores, oppScores
+
+    def getMargins(self):
+
+        # Function for getting the margin of every match up in each sim. Note that
+        # this holds every team against every opponent, so can take a large amount
+        # of memory with many sims
+        #
+        # Output:   margins - array of the team score minus the opponent score, with
+        #                     dimensions of team, opponent, team proportion, opponent
+        #                     proportion and sim. Teams against themselves are included
+        #                     but aren't a real match up
+
+        teamScores, oppScores = self.getScores()
+        margins = teamScores[:,np.newaxis,:,np.newaxis,:] - oppScores[np.newaxis,:,np.newaxis,:,:]
+
+        return margins
+
+    def toDataFrame(self, pairInds = None):
+
+        # Function for getting the results in the same long format as the original
+        # competitive sims, with each team against the teams after it in the list.
+        # The made shot counts are given in place of the lists of shot outcomes
+        #
+        # Input:    pairInds - index or list of indices of the team and opponent
+        #                      pairs to get, in the order of the pairs in the
+        #                      results. The default of None gets all pairs
+        #
+        # Output:   df_compSimResults - dataframe of the sim results, ordered by team,
+        #                               opponent, opponent proportion, team proportion
+        #                               and sim
+
+        #Get the index of each team, opponent, proportion and sim in the results
+        teamInd, oppInd = np.triu_indices(len(self.teamNames), 1)
+        if pairInds is not None:
+            teamInd, oppInd = np.atleast_1d(teamInd[pairInds]), np.atleast_1d(oppInd[pairInds])
+        teamInd, oppInd, p2, p1, nn = [ind.ravel() for ind in np.broadcast_arrays(teamInd[:,None,None,None],
+                                                                                     oppInd[:,None,None,None],
+                                                                                     np.arange(len(self.compProps))[None,:,None,None],
+                                                                                     np.arange(len(self.compProps))[None,None,:,None],
+                                                                                     np.arange(len(self.teamShots))[None,None,None,:])]
+
+        #Get the results for each index
+        teamScores, oppScores = self.getScores()
+        df_compSimResults = pd.DataFrame({'teamName': pd.Categorical.from_codes(teamInd, categories = self.teamNames),
+                                          'teamSuperProp': self.compProps[p1],
+                                          'teamShots': self.teamShots[nn],
+                                          'teamSuperShots': self.teamSuperShots[p1,nn],
+                                          'teamStandardShots': self.teamShots[nn] - self.teamSuperShots[p1,nn],
+                                          'teamMadeStandard': self.teamMadeStandard[teamInd,p1,nn],
+                                          'teamMadeSuper': self.teamMadeSuper[teamInd,p1,nn],
+                                          'opponentName': pd.Categorical.from_codes(oppInd, categories = self.teamNames),
+                                          'opponentSuperProp': self.compProps[p2],
+                                          'opponentShots': self.oppShots[nn],
+                                          'opponentSuperShots': self.oppSuperShots[p2,nn],
+                                          'opponentStandardShots': self.oppShots[nn] - self.oppSuperShots[p2,nn],
+                                          'opponentMadeStandard': self.oppMadeStandard[oppInd,p2,nn],
+                                          'opponentMadeSuper': self.oppMadeSuper[oppInd,p2,nn],
+                                          'teamScore': teamScores[teamInd,p1,nn],
+                                          'opponentScore': oppScores[oppInd,p2,nn]})
+        df_compSimResults['margin'] = df_compSimResults['teamScore'] - df_compSimResults['opponentScore']
+
+        return df_compSimResults
+
+    def iterDataFrames(self):
+
+        # Function for getting the results of toDataFrame one team and opponent
+        # pair at a time, so that the full dataframe doesn't need to be held in
+        # memory (e.g. to stream to file with writeSimResults)
+        #
+        # Output:   df_compSimResults - generator of dataframes of the sim results
+        #                               of each pair, in the order of toDataFrame
+
+        for pairInd in range(len(self.teamNames) * (len(self.teamNames) - 1) // 2):
+            yield self.toDataFrame(pairInds = pairInd)
+
+# %% runCompSimUnit
+
+def runCompSimUnit(simUnit, teamShotStats = None, compProps = None,
+                   simShots = None, seedEntropy = None, counterBased = False,
+                   simStart = 0, batchInd = None):
+
+    # Function for running the 'competitive' sims of one team with either the team
+    # or opponent numbers of shots at one proportion, with the units own random
+    # generator (see runCompSims)
+    #
+    # Input:    simUnit - tuple of the team index, shots index (0 = team shots,
+    #                     1 = opponent shots) and proportion index
+    #           teamShotStats - dictionary of lists of the teams made and missed shots
+    #           compProps - list of super shot proportions to simulate
+    #           simShots - tuple of the team and opponent shot arrays
+    #           seedEntropy - entropy of the seed sequence for the whole run
+    #           counterBased - boolean flag whether to use counter based random
+    #                          numbers (see getCounterUniforms). The made shots are
+    #                          then taken from the inverse binomial distribution
+    #                          with the first two numbers of each sim
+    #           simStart - index of the first sim in the shot arrays, used with
+    #                      counter based random numbers to run part of the sims
+    #           batchInd - index of the batch of sims when the sims are run in
+    #                      batches without counter based random numbers, with each
+    #                      batch getting its own random generator. The default of
+    #                      None runs all of the sims at once
+    #
+    # Output:   madeStandard - array of the made standard shots in each sim
+    #           madeSuper - array of the made super shots in each sim
+
+    teamInd, shotsInd, propInd = simUnit
+
+    #Get the standard and super shots for each sim. Sims with no shots (or less)
+    #don't score
+    nShots = np.clip(np.asarray(simShots[shotsInd]), 0, None).astype(np.int16)
+    superShots = np.around(nShots * compProps[propInd]).astype(np.int16)
+    standardShots = nShots - superShots
+
+    #Get the teams shot probabilities
+    probStandard = teamShotStats['madeStandard'][teamInd] / \
+        (teamShotStats['madeStandard'][teamInd] + teamShotStats['missedStandard'][teamInd])
+    probSuper = teamShotStats['madeSuper'][teamInd] / \
+        (teamShotStats['madeSuper'][teamInd] + teamShotStats['missedSuper'][teamInd])
+
+    #Get the made shots for each sim from the counter based random numbers
+    if counterBased:
+        simUniforms = getCounterUniforms(seedEntropy, simUnit, simStart = simStart, nSims = len(nShots))
+        madeStandard = np.clip(stats.binom.ppf(simUniforms[:,0], standardShots, probStandard), 0, None)
+        madeSuper = np.clip(stats.binom.ppf(simUniforms[:,1], superShots, probSuper), 0, None)
+
+    #Otherwise draw the made shots from the units random generator, or from the
+    #generator of the units batch of sims
+    else:
+        if batchInd is None:
+            rng = getUnitGenerator(seedEntropy, simUnit)
+        else:
+            rng = getUnitGenerator(seedEntropy, simUnit + (batchInd,))
+        madeStandard = rng.binomial(standardShots, probStandard)
+        madeSuper = rng.binomial(superShots, probSuper)
+
+    return madeStandard.astype(np.int16), madeSuper.astype(np.int16)
+
+# %% runCompSims
+
+def runCompSims(teamShotStats = None, compProps = None,
+                teamShotsA = None, teamShotsB = None, seed = None,
+                nProcesses = 1, counterBased = False, simStart = 0,
+                batchInd = None):
+
+    # Function for running the 'competitive' sims for every team at once. Each
+    # team is simulated with both the team (A) and opponent (B) numbers of shots,
+    # and every match up is formed from these as a teams score doesn't depend on
+    # its opponent. As in runStandardSims, the made shots are drawn as binomial
+    # counts with the mean of each teams beta distribution. This works for the
+    # matched shots sims with fixed shot numbers or the variable shots sims with
+    # the shots from the league values. Each team, shots and proportion is a
+    # separate work unit with its own random generator, so the results are the
+    # same for any number of processes
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           compProps - list of super shot proportions to simulate
+    #           teamShotsA - array of the team number of shots in each sim
+    #           teamShotsB - array of the opponent number of shots in each sim
+    #           seed - seed for the random generators
+    #           nProcesses - number of processes to run the units with
+    #           counterBased - boolean flag whether to use counter based random
+    #                          numbers, so that any sim can be regenerated with
+    #                          getCompSimReplicates
+    #           simStart - index of the first sim in the shot arrays, used with
+    #                      counter based random numbers to run part of the sims
+    #           batchInd - index of the batch of sims when the sims are run in
+    #                      batches without counter based random numbers (see
+    #                      runCompSimUnit)
+    #
+    # Output:   compSimResults - CompSimResults object of the sim results
+
+    #Set the units for each team, shots and proportion
+    nTeams = len(teamShotStats['squadNickname'])
+    simUnits = [(tt, ss, pp) for tt in range(nTeams) for ss in range(2) for pp in range(len(compProps))]
+
+    #Run the sims for each unit
+    unitFunc = partial(runCompSimUnit, teamShotStats = teamShotStats, compProps = compProps,
+                       simShots = (teamShotsA, teamShotsB),
+                       seedEntropy = np.random.SeedSequence(seed).entropy,
+                       counterBased = counterBased, simStart = simStart, batchInd = batchInd)
+    unitResults = runSimUnits(unitFunc, simUnits, nProcesses = nProcesses)
+
+    #Set the made shots into arrays of team, proportion and sim for each set of shots
+    madeShots = np.zeros((2, 2, nTeams, len(compProps), len(teamShotsA)), dtype = np.int16)
+    for uu in range(len(simUnits)):
+        tt, ss, pp = simUnits[uu]
+        madeShots[ss,0,tt,pp] = unitResults[uu][0]
+        madeShots[ss,1,tt,pp] = unitResults[uu][1]
+
+    #Get the shots for each set of shots and proportion
+    propVals = np.array(compProps, dtype = float).reshape(-1,1)
+    teamShots = np.clip(np.asarray(teamShotsA), 0, None).astype(np.int16)
+    oppShots = np.clip(np.asarray(teamShotsB), 0, None).astype(np.int16)
+
+    #Store the results
+    compSimResults = CompSimResults(teamNames = teamShotStats['squadNickname'], compProps = compProps,
+                                    teamShots = teamShots, oppShots = oppShots,
+                                    teamSuperShots = np.around(teamShots * propVals).astype(np.int16),
+                                    oppSuperShots = np.around(oppShots * propVals).astype(np.int16),
+                                    teamMadeStandard = madeShots[0,0], teamMadeSuper = madeShots[0,1],
+                                    oppMadeStandard = madeShots[1,0], oppMadeSuper = madeShots[1,1])
+
+    return compSimResults
+
+# %% getCompSimReplicates
+
+def getCompSimReplicates(teamShotStats = None, compProps = None,
+                         teamShotsA = None, teamShotsB = None, seed = None,
+                         teamInd = None, oppInd = None, teamPropInd = None,
+                         oppPropInd = None, simStart = 0, nSims = 1):
+
+    # Function for regenerating a range of sims of one match up from runCompSims
+    # run with counter based random numbers, without running any other sims
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           compProps - list of super shot proportions used in the sims
+    #           teamShotsA - array of the team number of shots in each sim
+    #           teamShotsB - array of the opponent number of shots in each sim
+    #           seed - seed used in the sims
+    #           teamInd - index of the team in teamShotStats
+    #           oppInd - index of the opponent in teamShotStats
+    #           teamPropInd - index of the team proportion in compProps
+    #           oppPropInd - index of the opponent proportion in compProps
+    #           simStart - index of the first sim to regenerate
+    #           nSims - number of sims to regenerate
+    #
+    # Output:   simReplicates - dictionary of arrays of the made shots, scores and
+    #                           margins of each sim
+
+    #Get the shots of the sims to regenerate
+    simInds = slice(simStart, simStart + nSims)
+    simShots = (np.asarray(teamShotsA)[simInds], np.asarray(teamShotsB)[simInds])
+    seedEntropy = np.random.SeedSequence(seed).entropy
+
+    #Regenerate the team and opponent made shots
+    teamMadeStandard, teamMadeSuper = runCompSimUnit((teamInd, 0, teamPropInd), teamShotStats = teamShotStats,
+                                                     compProps = compProps, simShots = simShots,
+                                                     seedEntropy = seedEntropy, counterBased = True,
+                                                     simStart = simStart)
+    oppMadeStandard, oppMadeSuper = runCompSimUnit((oppInd, 1, oppPropInd), teamShotStats = teamShotStats,
+                                                   compProps = compProps, simShots = simShots,
+                                                   seedEntropy = seedEntropy, counterBased = True,
+                                                   simStart = simStart)
+
+    #Store the results
+    simReplicates = {'teamMadeStandard': teamMadeStandard, 'teamMadeSuper': teamMadeSuper,
+                     'opponentMadeStandard': oppMadeStandard, 'opponentMadeSuper': oppMadeSuper,
+                     'teamScore': teamMadeStandard + (teamMadeSuper * 2),
+                     'opponentScore': oppMadeStandard + (oppMadeSuper * 2)}
+    simReplicates['margin'] = simReplicates['teamScore'] - simReplicates['opponentScore']
+
+    return simReplicates
+
+# %% getShotCountPairPmf
+
+def getShotCountPairPmf(leagueShotsM, leagueShotsSD, leaguePropsM, leaguePropsSD,
+                        tailSD = 8):
+
+    # Function for getting the exact probability of each pair of team and
+    # opponent shot numbers in the 'competitive' sims with variable shots. The
+    # league shots in a Power 5 period are rounded from a normal distribution, and
+    # the team gets a rounded share of these from a normal distribution of the
+    # home team proportions. The opponent gets the rest of the league shots, so
+    # the team and opponent shots always add to the league shots
+    #
+    # Input:    leagueShotsM - mean number of league shots per Power 5 period
+    #           leagueShotsSD - standard deviation of league shots per Power 5 period
+    #           leaguePropsM - mean proportion of the shots taken by the home team
+    #           leaguePropsSD - standard deviation of the home team proportions
+    #           tailSD - number of standard deviations either side of the means to
+    #                    include. The default of 8 leaves out a negligible chance
+    #
+    # Output:   teamShotVals - array of the team number of shots in each pair
+    #           oppShotVals - array of the opponent number of shots in each pair
+    #           pairProbs - array of the probability of each pair
+
+    #Get the chance of each number of league shots
+    leagueShotDist = stats.norm(leagueShotsM, leagueShotsSD)
+    leagueShotVals = np.arange(np.floor(leagueShotsM - (tailSD * leagueShotsSD)),
+                               np.ceil(leagueShotsM + (tailSD * leagueShotsSD)) + 1)
+    leagueShotProbs = leagueShotDist.cdf(leagueShotVals + 0.5) - leagueShotDist.cdf(leagueShotVals - 0.5)
+
+    #Set the distribution of the home team proportions
+    leaguePropDist = stats.norm(leaguePropsM, leaguePropsSD)
+    propLims = np.array([leaguePropsM - (tailSD * leaguePropsSD), leaguePropsM + (tailSD * leaguePropsSD)])
+
+    #Loop through the league shots and get the chance of each team share
+    teamShotVals = list()
+    oppShotVals = list()
+    pairProbs = list()
+    for ll in range(len(leagueShotVals)):
+
+        #The team and opponent get no shots if there are no league shots
+        if leagueShotVals[ll] == 0:
+            teamShotVals.append(np.array([0.0]))
+            oppShotVals.append(np.array([0.0]))
+            pairProbs.append(np.array([leagueShotProbs[ll]]))
+            continue
+
+        #Get the team shots that can be rounded to from the share of league shots
+        shareLims = np.sort(leagueShotVals[ll] * propLims)
+        teamVals = np.arange(np.around(shareLims[0]), np.around(shareLims[1]) + 1)
+
+        #Get the chance of the share rounding to each number of shots
+        teamProbs = np.abs(leaguePropDist.cdf((teamVals + 0.5) / leagueShotVals[ll]) -
+                           leaguePropDist.cdf((teamVals - 0.5) / leagueShotVals[ll]))
+
+        #Store the pairs with the opponent getting the remaining shots
+        teamShotVals.append(teamVals)
+        oppShotVals.append(leagueShotVals[ll] - teamVals)
+        pairProbs.append(teamProbs * leagueShotProbs[ll])
+
+    #Join the pairs together and remove any that can't occur
+    teamShotVals = np.concatenate(teamShotVals)
+    oppShotVals = np.concatenate(oppShotVals)
+    pairProbs = np.concatenate(pairProbs)
+    teamShotVals = teamShotVals[pairProbs > 0]
+    oppShotVals = oppShotVals[pairProbs > 0]
+    pairProbs = pairProbs[pairProbs > 0]
+
+    return teamShotVals, oppShotVals, pairProbs / np.sum(pairProbs)
+
+# %% getMarginPmfs
+
+def getMarginPmfs(teamShotStats = None, compProps = None, shotPairs = None):
+
+    # Function for getting the exact margin distribution of each team against each
+    # opponent for each pair of super shot proportions in the 'competitive' sims.
+    # The score distributions of the two teams for each pair of shot numbers are
+    # combined into the joint score distribution, which is then summed along
+    # each margin. This works for the matched shots sims by giving the one pair of
+    # shot numbers, or the variable shots sims with getShotCountPairPmf
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           compProps - list of super shot proportions to compare
+    #           shotPairs - tuple of the team shot numbers, opponent shot numbers and
+    #                       the probability of each pair (see getShotCountPairPmf)
+    #
+    # Output:   marginVals - array of the margins (team score - opponent score)
+    #           marginPmfs - array of the probability of each margin, with dimensions
+    #                        of team, opponent, team proportion, opponent proportion
+    #                        and margin. As with the sims, the team takes the team
+    #                        shots against the teams after it in the list, and the
+    #                        opponent shots against the teams before it with the
+    #                        margins flipped. Teams aren't compared against
+    #                        themselves, so these are left as zero
+
+    #Get the different numbers of shots and the index of each shot pair in these
+    teamShotVals, oppShotVals, pairProbs = shotPairs
+    shotVals = np.unique(np.concatenate([teamShotVals, oppShotVals])).astype(int)
+    teamInd = np.searchsorted(shotVals, teamShotVals)
+    oppInd = np.searchsorted(shotVals, oppShotVals)
+
+    #Set the chance of each pair of shot numbers in a matrix of team by opponent shots
+    pairWeights = np.zeros((len(shotVals), len(shotVals)))
+    np.add.at(pairWeights, (teamInd, oppInd), pairProbs)
+
+    #Get the score distributions for each team, proportion and number of shots
+    maxScore = max(shotVals.max(), 0) * 2
+    nTeams = len(teamShotStats['squadNickname'])
+    scorePmfs = np.zeros((nTeams, len(compProps), len(shotVals), maxScore + 1))
+    for tt in range(nTeams):
+        probStandard = teamShotStats['madeStandard'][tt] / \
+            (teamShotStats['madeStandard'][tt] + teamShotStats['missedStandard'][tt])
+        probSuper = teamShotStats['madeSuper'][tt] / \
+            (teamShotStats['madeSuper'][tt] + teamShotStats['missedSuper'][tt])
+        for pp in range(len(compProps)):
+            for kk in range(len(shotVals)):
+                #Teams without shots don't score
+                if shotVals[kk] <= 0:
+                    scorePmfs[tt,pp,kk,0] = 1
+                    continue
+                superShots = int(np.around(shotVals[kk] * compProps[pp]))
+                scorePmf = getScorePmf(shotVals[kk] - superShots, superShots, probStandard, probSuper)
+                scorePmfs[tt,pp,kk,0:len(scorePmf)] = scorePmf
+
+    #Get the margin of each team and opponent score
+    marginVals = np.arange(-maxScore, maxScore + 1)
+    marginInd = (np.arange(maxScore + 1).reshape(-1,1) - np.arange(maxScore + 1)) + maxScore
+
+    #Loop through the match ups against the teams later in the list and proportions
+    marginPmfs = np.zeros((nTeams, nTeams, len(compProps), len(compProps), len(marginVals)))
+    for tt in range(nTeams):
+        for cc in range(tt+1, nTeams):
+            for p1 in range(len(compProps)):
+                #Get the team scores weighted by the chance of each opponent shot number
+                teamWeights = scorePmfs[tt,p1].T @ pairWeights
+                for p2 in range(len(compProps)):
+                    #Get the joint score distribution and sum along each margin
+                    jointPmf = teamWeights @ scorePmfs[cc,p2]
+                    marginPmfs[tt,cc,p1,p2] = np.bincount(marginInd.ravel(), weights = jointPmf.ravel(),
+                                                          minlength = len(marginVals))
+            #Set the opponents side of the match up, swapping the proportions and
+            #flipping the margins (which are symmetric around zero)
+            marginPmfs[cc,tt] = marginPmfs[tt,cc].transpose(1,0,2)[..., ::-1]
+
+    return marginVals, marginPmfs
+
+# %% getMarginSummary
+
+def getMarginSummary(marginVals, marginPmfs, teamNames, compProps):
+
+    # Function for getting the win, draw and loss probabilities and the margin
+    # moments of each match up from the exact margin distributions
+    #
+    # Input:    marginVals - array of the margins from getMarginPmfs
+    #           marginPmfs - array of the margin probabilities from getMarginPmfs
+    #           teamNames - list of the team names in the same order as the margins
+    #           compProps - list of the super shot proportions compared
+    #
+    # Output:   marginSummary - dictionary of lists with the winProb, drawProb,
+    #                           lossProb, marginMean and marginSD of each team,
+    #                           opponent and pair of proportions
+
+    #Calculate the results for every match up at once
+    winProb = np.sum(marginPmfs[..., marginVals > 0], axis = -1)
+    drawProb = np.sum(marginPmfs[..., marginVals == 0], axis = -1)
+    lossProb = np.sum(marginPmfs[..., marginVals < 0], axis = -1)
+    marginMean = np.sum(marginPmfs * marginVals, axis = -1)
+    marginSD = np.sqrt(np.clip(np.sum(marginPmfs * (marginVals ** 2), axis = -1) - (marginMean ** 2), 0, None))
+
+    #Set dictionary to store the summary in
+    marginSummary = {'teamName': [], 'teamSuperProp': [],
+                     'opponentName': [], 'opponentSuperProp': [],
+                     'winProb': [], 'drawProb': [], 'lossProb': [],
+                     'marginMean': [], 'marginSD': []}
+
+    #Loop through the match ups and proportions and store the results
+    for tt in range(len(teamNames)):
+        for cc in range(len(teamNames)):
+            if tt == cc:
+                continue
+            for p1 in range(len(compProps)):
+                for p2 in range(len(compProps)):
+                    marginSummary['teamName'].append(teamNames[tt])
+                    marginSummary['teamSuperProp'].append(compProps[p1])
+                    marginSummary['opponentName'].append(teamNames[cc])
+                    marginSummary['opponentSuperProp'].append(compProps[p2])
+                    marginSummary['winProb'].append(winProb[tt,cc,p1,p2])
+                    marginSummary['drawProb'].append(drawProb[tt,cc,p1,p2])
+                    marginSummary['lossProb'].append(lossProb[tt,cc,p1,p2])
+                    marginSummary['marginMean'].append(marginMean[tt,cc,p1,p2])
+                    marginSummary['marginSD'].append(marginSD[tt,cc,p1,p2])
+
+    return marginSummary
+
+# %% addValueCounts
+
+def addValueCounts(valCounts, valOffset, vals):
+
+    # Function for adding integer values to the counts of each value, with the
+    # range of the counts extended to fit the new values where needed
+    #
+    # Input:    valCounts - array of the counts of each value, with the cells first
+    #                       and the values along the last dimension
+    #           valOffset - value of the first count in valCounts
+    #           vals - integer array of the values to add, with the same cells first
+    #                  and the values of each cell along the last dimension
+    #
+    # Output:   valCounts - array of the updated counts
+    #           valOffset - value of the first count in the updated counts
+
+    #Check for values to add
+    if vals.size == 0:
+        return valCounts, valOffset
+
+    #Extend the range of the counts to fit the new values
+    lowVal = int(vals.min())
+    highVal = int(vals.max())
+    if valCounts.shape[-1] > 0:
+        lowVal = min(lowVal, valOffset)
+        highVal = max(highVal, valOffset + valCounts.shape[-1] - 1)
+    valCounts = padValueCounts(valCounts, valOffset, lowVal, highVal)
+
+    #Count the values of each cell at once
+    nCells = int(np.prod(valCounts.shape[:-1]))
+    nVals = valCounts.shape[-1]
+    cellInd = np.arange(nCells).reshape(valCounts.shape[:-1] + (1,))
+    countInd = (cellInd * nVals) + (vals.astype(np.int64) - lowVal)
+    valCounts = valCounts + np.bincount(countInd.ravel(), minlength = nCells * nVals).reshape(valCounts.shape)
+
+    return valCounts, lowVal
+
+# %% padValueCounts
+
+def padValueCounts(valCounts, valOffset, lowVal, highVal):
+
+    # Function for extending the counts of each value to a wider range of values
+    #
+    # Input:    valCounts - array of the counts of each value (see addValueCounts)
+    #           valOffset - value of the first count in valCounts
+    #           lowVal - lowest value of the extended counts
+    #           highVal - highest value of the extended counts
+    #
+    # Output:   paddedCounts - array of the counts from lowVal to highVal
+
+    paddedCounts = np.zeros(valCounts.shape[:-1] + (highVal - lowVal + 1,), dtype = np.int64)
+    if valCounts.shape[-1] > 0:
+        paddedCounts[..., valOffset-lowVal:valOffset-lowVal+valCounts.shape[-1]] = valCounts
+
+    return paddedCounts
+
+# %% sumValueCounts
+
+def sumValueCounts(countsA, offsetA, countsB, offsetB):
+
+    # Function for adding two sets of value counts that can cover different
+    # ranges of values
+    #
+    # Input:    countsA - array of the counts of each value (see addValueCounts)
+    #           offsetA - value of the first count in countsA
+    #           countsB - as above for the second set of counts
+    #           offsetB - as above for the second set of counts
+    #
+    # Output:   valCounts - array of the summed counts
+    #           valOffset - value of the first count in the summed counts
+
+    #Check for empty counts
+    if countsB.shape[-1] == 0:
+        return countsA, offsetA
+    if countsA.shape[-1] == 0:
+        return countsB, offsetB
+
+    #Extend both counts to the full range and add them
+    lowVal = min(offsetA, offsetB)
+    highVal = max(offsetA + countsA.shape[-1], offsetB + countsB.shape[-1]) - 1
+    valCounts = padValueCounts(countsA, offsetA, lowVal, highVal) + padValueCounts(countsB, offsetB, lowVal, highVal)
+
+    return valCounts, lowVal
+
+# %% mergeMoments
+
+def mergeMoments(countA, meanA, m2A, countB, meanB, m2B):
+
+    # Function for merging the running means and sums of squared deviations of
+    # two sets of results (i.e. Welford's algorithm for a batch of results)
+    #
+    # Input:    countA - number of results in the first set
+    #           meanA - array of the means of the first set
+    #           m2A - array of the sums of squared deviations of the first set
+    #           countB - number of results in the second set
+    #           meanB - as above for the second set
+    #           m2B - as above for the second set
+    #
+    # Output:   mergedMean - array of the means of both sets
+    #           mergedM2 - array of the sums of squared deviations of both sets
+
+    #Get the total results, avoiding a divide by zero for empty sets
+    countAB = np.maximum(countA + countB, 1)
+
+    #Merge the moments
+    meanDelta = meanB - meanA
+    mergedMean = meanA + (meanDelta * (countB / countAB))
+    mergedM2 = m2A + m2B + ((meanDelta ** 2) * (countA * countB / countAB))
+
+    return mergedMean, mergedM2
+
+# %% StandardSimAccumulator
+
+class StandardSimAccumulator:
+
+    # Running summaries of the 'standard' sims, for running large numbers of sims
+    # without keeping the result of each sim. The points of each team and
+    # proportion are kept as a running mean and standard deviation and the
+    # counts of each score, along with the counts of the proportion bins that
+    # give each teams max and min score in each sim. The memory used doesn't
+    # grow with the number of sims
+
+    def __init__(self, teamNames = None, superShotProps = None):
+
+        # Input:    teamNames - list of the team names
+        #           superShotProps - list of super shot proportions simulated
+
+        self.teamNames = list(teamNames)
+        self.superShotProps = np.array(superShotProps, dtype = float)
+        nTeams = len(self.teamNames)
+        nProps = len(self.superShotProps)
+        self.nSims = np.zeros(nTeams, dtype = np.int64)
+        self.ptsMean = np.zeros((nTeams, nProps))
+        self.ptsM2 = np.zeros((nTeams, nProps))
+        self.ptsCounts = np.zeros((nTeams, nProps, 0), dtype = np.int64)
+        self.ptsOffset = 0
+        self.maxPropCounts = np.zeros((nTeams, len(superPropCats)), dtype = np.int64)
+        self.minPropCounts = np.zeros((nTeams, len(superPropCats)), dtype = np.int64)
+        self.shotsSum = np.zeros(nTeams, dtype = np.int64)
+        self.shotsMin = np.full(nTeams, np.iinfo(np.int64).max, dtype = np.int64)
+        self.shotsMax = np.zeros(nTeams, dtype = np.int64)
+
+    def update(self, teamInd, unitResult):
+
+        # Function for adding a teams sims to the summaries
+        #
+        # Input:    teamInd - index of the team
+        #           unitResult - tuple of the arrays returned by runStandardSimUnit
+
+        #Get the points of each proportion and sim
+        nShots, nSuper, madeStandard, madeSuper = unitResult
+        totalPts = madeStandard.astype(np.int64) + (madeSuper.astype(np.int64) * 2)
+        nNewSims = totalPts.shape[1]
+        if nNewSims == 0:
+            return
+
+        #Update the running moments of the points
+        self.ptsMean[teamInd], self.ptsM2[teamInd] = mergeMoments(self.nSims[teamInd], self.ptsMean[teamInd], self.ptsM2[teamInd],
+                                                                  nNewSims, np.mean(totalPts, axis = 1),
+                                                                  np.sum((totalPts - np.mean(totalPts, axis = 1, keepdims = True)) ** 2, axis = 1))
+
+        #Update the counts of each score of the team
+        teamCounts, teamOffset = addValueCounts(self.ptsCounts[teamInd], self.ptsOffset, totalPts)
+        if teamCounts.shape[-1] != self.ptsCounts.shape[-1]:
+            self.ptsCounts = padValueCounts(self.ptsCounts, self.ptsOffset,
+                                            teamOffset, teamOffset + teamCounts.shape[-1] - 1)
+            self.ptsOffset = teamOffset
+        self.ptsCounts[teamInd] = teamCounts
+
+        #Find the proportion with the max and min score in each sim. Ties in the
+        #max take the lowest proportion, and ties in the min take the highest
+        simInd = np.arange(nNewSims)
+        maxInd = np.argmax(totalPts, axis = 0)
+        minInd = len(self.superShotProps) - 1 - np.argmin(totalPts[::-1], axis = 0)
+        superProp = nSuper / nShots
+        self.maxPropCounts[teamInd] += np.bincount(getSuperPropCats(superProp[maxInd,simInd]), minlength = len(superPropCats))
+        self.minPropCounts[teamInd] += np.bincount(getSuperPropCats(superProp[minInd,simInd]), minlength = len(superPropCats))
+
+        #Update the shot statistics
+        self.shotsSum[teamInd] += np.sum(nShots[0], dtype = np.int64)
+        self.shotsMin[teamInd] = min(self.shotsMin[teamInd], np.min(nShots[0]))
+        self.shotsMax[teamInd] = max(self.shotsMax[teamInd], np.max(nShots[0]))
+        self.nSims[teamInd] += nNewSims
+
+    def merge(self, other):
+
+        # Function for adding the summaries of another set of sims
+        #
+        # Input:    other - StandardSimAccumulator of the other sims
+
+        self.ptsMean, self.ptsM2 = mergeMoments(self.nSims[:,None], self.ptsMean, self.ptsM2,
+                                                other.nSims[:,None], other.ptsMean, other.ptsM2)
+        self.ptsCounts, self.ptsOffset = sumValueCounts(self.ptsCounts, self.ptsOffset,
+                                                        other.ptsCounts, other.ptsOffset)
+        self.maxPropCounts += other.maxPropCounts
+        self.minPropCounts += other.minPropCounts
+        self.shotsSum += other.shotsSum
+        self.shotsMin = np.minimum(self.shotsMin, other.shotsMin)
+        self.shotsMax = np.maximum(self.shotsMax, other.shotsMax)
+        self.nSims += other.nSims
+
+    def getMoments(self):
+
+        # Function for getting the mean and standard deviation of the points
+        #
+        # Output:   ptsMean - array of the mean points with dimensions of team and
+        #                     proportion
+        #           ptsSD - as above for the standard deviation of the points
+
+        ptsSD = np.sqrt(self.ptsM2 / np.maximum(self.nSims[:,None] - 1, 1))
+
+        return self.ptsMean, ptsSD
+
+    def getMaxMinSummary(self):
+
+        # Function for getting the proportion of sims that each proportion bin
+        # gives the max and min score, in the same format as the 'standard' sims
+        # summaries
+        #
+        # Output:   summaryMax - dictionary of lists with the proportion of sims
+        #                        each bin gives the max score and the mean, min and
+        #                        max shots of each team
+        #           summaryMin - as above for the min score
+
+        #Set dictionaries to store the summaries in
+        summaryMax = {'squadNickname': list(self.teamNames)}
+        summaryMin = {'squadNickname': list(self.teamNames)}
+
+        #Get the proportion of sims for each bin
+        for pp in range(len(superPropCats)):
+            summaryMax[superPropCats[pp]] = list(self.maxPropCounts[:,pp] / self.nSims)
+            summaryMin[superPropCats[pp]] = list(self.minPropCounts[:,pp] / self.nSims)
+
+        #Get the shot statistics, which are the same for the max and min
+        for summaryDict in [summaryMax, summaryMin]:
+            summaryDict['meanShots'] = list(self.shotsSum / self.nSims)
+            summaryDict['minShots'] = list(self.shotsMin)
+            summaryDict['maxShots'] = list(self.shotsMax)
+
+        return summaryMax, summaryMin
+
+# %% CompSimAccumulator
+
+class CompSimAccumulator:
+
+    # Running summaries of the 'competitive' sims, for running large numbers of
+    # sims without keeping the result of each sim. The margins of every team,
+    # opponent and pair of proportions are kept as a running mean and standard
+    # deviation and the counts of each margin. The memory used doesn't grow with
+    # the number of sims
+
+    def __init__(self, teamNames = None, compProps = None):
+
+        # Input:    teamNames - list of the team names
+        #           compProps - list of super shot proportions simulated
+
+        self.teamNames = list(teamNames)
+        self.compProps = np.array(compProps, dtype = float)
+        cellShape = (len(self.teamNames), len(self.teamNames), len(self.compProps), len(self.compProps))
+        self.nSims = 0
+        self.marginMean = np.zeros(cellShape)
+        self.marginM2 = np.zeros(cellShape)
+        self.marginCounts = np.zeros(cellShape + (0,), dtype = np.int64)
+        self.marginOffset = 0
+
+    def update(self, margins):
+
+        # Function for adding sims to the summaries
+        #
+        # Input:    margins - array of the margins of each sim, with dimensions of
+        #                     team, opponent, team proportion, opponent proportion
+        #                     and sim (see CompSimResults.getMargins)
+
+        #Check for sims to add
+        nNewSims = margins.shape[-1]
+        if nNewSims == 0:
+            return
+
+        #Count each margin of the new sims. The margins are whole numbers, so the
+        #moments of the new sims are taken from these counts rather than from
+        #further passes over the margins
+        newCounts, newOffset = addValueCounts(np.zeros(margins.shape[:-1] + (0,), dtype = np.int64), 0, margins)
+        marginVals = newOffset + np.arange(newCounts.shape[-1])
+        newMean = np.sum(newCounts * marginVals, axis = -1) / nNewSims
+        newM2 = np.sum(newCounts * ((marginVals - newMean[...,None]) ** 2), axis = -1)
+
+        #Update the running moments and the counts of each margin
+        self.marginMean, self.marginM2 = mergeMoments(self.nSims, self.marginMean, self.marginM2,
+                                                      nNewSims, newMean, newM2)
+        self.marginCounts, self.marginOffset = sumValueCounts(self.marginCounts, self.marginOffset,
+                                                              newCounts, newOffset)
+        self.nSims = self.nSims + nNewSims
+
+    def merge(self, other):
+
+        # Function for adding the summaries of another set of sims
+        #
+        # Input:    other - CompSimAccumulator of the other sims
+
+        self.marginMean, self.marginM2 = mergeMoments(self.nSims, self.marginMean, self.marginM2,
+                                                      other.nSims, other.marginMean, other.marginM2)
+        self.marginCounts, self.marginOffset = sumValueCounts(self.marginCounts, self.marginOffset,
+                                                              other.marginCounts, other.marginOffset)
+        self.nSims = self.nSims + other.nSims
+
+    def getMoments(self):
+
+        # Function for getting the mean and standard deviation of the margins
+        #
+        # Output:   marginMean - array of the mean margins with dimensions of team,
+        #                        opponent, team proportion and opponent proportion
+        #           marginSD - as above for the standard deviation of the margins
+
+        marginSD = np.sqrt(self.marginM2 / max(self.nSims - 1, 1))
+
+        return self.marginMean, marginSD
+
+    def getMarginPmfs(self):
+
+        # Function for getting the proportion of sims with each margin, in the
+        # same format as getMarginPmfs
+        #
+        # Output:   marginVals - array of the margins
+        #           marginPmfs - array of the proportion of sims with each margin,
+        #                        with dimensions of team, opponent, team proportion,
+        #                        opponent proportion and margin
+
+        marginVals = self.marginOffset + np.arange(self.marginCounts.shape[-1])
+        marginPmfs = self.marginCounts / max(self.nSims, 1)
+
+        return marginVals, marginPmfs
+
+    def getPooledSummary(self, teamInd, teamPropInd, oppPropInd):
+
+        # Function for getting the margin summary of a team and pair of proportions
+        # with the sims against every other team pooled together. As with the sim
+        # results table (see CompSimResults.toDataFrame), the team takes the team
+        # (A) shots against the teams after it in the list, and the opponent (B)
+        # shots against the teams before it with the margins flipped
+        #
+        # Input:    teamInd - index of the team
+        #           teamPropInd - index of the team proportion in compProps
+        #           oppPropInd - index of the opponent proportion in compProps
+        #
+        # Output:   pooledSummary - dictionary of the number of sims, win and loss
+        #                           proportions and the mean and standard deviation
+        #                           of the pooled margins
+
+        #Extend the margin counts to the same range of wins and losses, so that
+        #the margins can be flipped by reversing the counts
+        maxMargin = max(abs(self.marginOffset), abs(self.marginOffset + self.marginCounts.shape[-1] - 1))
+        marginCounts = padValueCounts(self.marginCounts, self.marginOffset, -maxMargin, maxMargin)
+        marginVals = np.arange(-maxMargin, maxMargin + 1)
+
+        #Sum the margin counts against each opponent
+        pooledCounts = np.sum(marginCounts[teamInd,teamInd+1:,teamPropInd,oppPropInd], axis = 0) + \
+            np.sum(marginCounts[:teamInd,teamInd,oppPropInd,teamPropInd], axis = 0)[::-1]
+
+        #Get the summary of the pooled margins
+        nPooled = np.sum(pooledCounts)
+        marginMean = np.sum(pooledCounts * marginVals) / nPooled
+        pooledSummary = {'nSims': nPooled,
+                         'winProb': np.sum(pooledCounts[marginVals > 0]) / nPooled,
+                         'lossProb': np.sum(pooledCounts[marginVals < 0]) / nPooled,
+                         'marginMean': marginMean,
+                         'marginSD': np.sqrt(np.sum(pooledCounts * ((marginVals - marginMean) ** 2)) / (nPooled - 1))}
+
+        return pooledSummary
+
+# %% runStandardBatchUnit
+
+def runStandardBatchUnit(simUnit, teamShotStats = None, superShotProps = None,
+                         seedEntropy = None):
+
+    # Function for running a batch of one teams 'standard' sims and getting the
+    # running summaries of the batch (see runStandardSimsOnline)
+    #
+    # Input:    simUnit - tuple of the team index, batch index and number of sims
+    #           teamShotStats - dictionary of lists of the teams shot statistics
+    #           superShotProps - list of super shot proportions to simulate
+    #           seedEntropy - entropy of the seed sequence for the whole run
+    #
+    # Output:   batchSummary - StandardSimAccumulator of the batch of sims
+
+    #Run the batch of sims
+    teamInd, batchInd, nBatchSims = simUnit
+    unitResult = runStandardSimUnit(teamInd, teamShotStats = teamShotStats, superShotProps = superShotProps,
+                                    nSims = nBatchSims, seedEntropy = seedEntropy, batchInd = batchInd)
+
+    #Get the summaries of the batch
+    batchSummary = StandardSimAccumulator(teamNames = teamShotStats['squadNickname'],
+                                          superShotProps = superShotProps)
+    batchSummary.update(teamInd, unitResult)
+
+    return batchSummary
+
+# %% runStandardSimsOnline
+
+def runStandardSimsOnline(teamShotStats = None, superShotProps = None,
+                          nSims = 1000, seed = None, nProcesses = 1,
+                          batchSize = 100000):
+
+    # Function for running the 'standard' super shot sims in batches and only
+    # keeping running summaries of the results, rather than the result of each
+    # sim. Each team and batch is a separate work unit with its own random
+    # generator, so the results are the same for any number of processes (but
+    # not the same as runStandardSims, or with a different batch size)
+    #
+    # Input:    teamShotStats - dictionary of lists of the teams shot statistics
+    #           superShotProps - list of super shot proportions to simulate
+    #           nSims - number of sims to run for each team and proportion
+    #           seed - seed for the random generators
+    #           nProcesses - number of processes to run the units with
+    #           batchSize - number of sims in each batch
+    #
+    # Output:   standardSimSummary - StandardSimAccumulator of the sims
+
+    #Set the units for each team and batch of sims
+    simUnits = [(tt, bb, min(batchSize, nSims - (bb * batchSize)))
+                for tt in range(len(teamShotStats['squadId']))
+                for bb in range(int(np.ceil(nSims / batchSize)))]
+
+    #Run the units and add their summaries together as they finish
+    unitFunc = partial(runStandardBatchUnit, teamShotStats = teamShotStats,
+                       superShotProps = superShotProps,
+                       seedEntropy = np.random.SeedSequence(seed).entropy)
+    standardSimSummary = StandardSimAccumulator(teamNames = teamShotStats['squadNickname'],
+                                                superShotProps = superShotProps)
+    for batchSummary in iterSimUnits(unitFunc, simUnits, nProcesses = nProcesses):
+        standardSimSummary.merge(batchSummary)
+
+    return standardSimSummary
+
+# %% runCompBatchResults
+
+def runCompBatchResults(simUnit, teamShotStats = None, compProps = None, seed = None,
+                        counterBased = False):
+
+    # Function for running a batch of the 'competitive' sims (see iterCompSims
+    # and runCompBatchUnit)
+    #
+    # Input:    simUnit - tuple of the batch index, the index of the first sim in
+    #                     the batch and the team and opponent shot arrays of the
+    #                     batch
+    #           teamShotStats - dictionary of lists of the teams shot statistics
+    #           compProps - list of super shot proportions to simulate
+    #           seed - seed for the random generators
+    #           counterBased - boolean flag whether to use the counter based random
+    #                          numbers of the sims in the batch, rather than the
+    #                          batches own random generators
+    #
+    # Output:   batchResults - CompSimResults object of the batch of sims
+
+    #Run the batch of sims with the counter based random numbers of these sims,
+    #or the random generators of the batch
+    batchInd, simStart, batchShotsA, batchShotsB = simUnit
+    batchResults = runCompSims(teamShotStats = teamShotStats, compProps = compProps,
+                               teamShotsA = batchShotsA, teamShotsB = batchShotsB,
+                               seed = seed, counterBased = counterBased, simStart = simStart,
+                               batchInd = None if counterBased else batchInd)
+
+    return batchResults
+
+# %% iterCompSims
+
+def iterCompSims(teamShotStats = None, compProps = None,
+                 teamShotsA = None, teamShotsB = None, seed = None,
+                 nProcesses = 1, batchSize = 10000, counterBased = False):
+
+    # Function for running the 'competitive' sims in batches and getting the
+    # results of each batch as it finishes, so that only a few batches of sims
+    # are held in memory (e.g. to stream to file with writeSimResults). As in
+    # runCompSimsOnline, each batch has its own random generators, or with
+    # counter based random numbers the sims are the same as those of runCompSims
+    # with counterBased set to True. The results are ordered by batch, and then
+    # in the order of CompSimResults.toDataFrame within each batch
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           compProps - list of super shot proportions to simulate
+    #           teamShotsA - array of the team number of shots in each sim
+    #           teamShotsB - array of the opponent number of shots in each sim
+    #           seed - seed for the random generators
+    #           nProcesses - number of processes to run the batches with
+    #           batchSize - number of sims in each batch
+    #           counterBased - boolean flag whether to use counter based random
+    #                          numbers (see runCompSimUnit)
+    #
+    # Output:   df_compSimResults - generator of dataframes of the sim results of
+    #                               each team and opponent pair in each batch
+
+    #Set the units for each batch of sims
+    teamShotsA = np.asarray(teamShotsA)
+    teamShotsB = np.asarray(teamShotsB)
+    simUnits = [(bb // batchSize, bb, teamShotsA[bb:bb+batchSize], teamShotsB[bb:bb+batchSize])
+                for bb in range(0, len(teamShotsA), batchSize)]
+
+    #Run the units and get their results as they finish
+    unitFunc = partial(runCompBatchResults, teamShotStats = teamShotStats,
+                       compProps = compProps, seed = seed, counterBased = counterBased)
+    for batchResults in iterSimUnits(unitFunc, simUnits, nProcesses = nProcesses):
+        for df_compSimResults in batchResults.iterDataFrames():
+            yield df_compSimResults
+
+# %% runCompBatchUnit
+
+def runCompBatchUnit(simUnit, teamShotStats = None, compProps = None, seed = None,
+                     counterBased = False):
+
+    # Function for running a batch of the 'competitive' sims and getting the
+    # running summaries of the batch (see runCompSimsOnline)
+    #
+    # Input:    simUnit - tuple of the batch index, the index of the first sim in
+    #                     the batch and the team and opponent shot arrays of the
+    #                     batch
+    #           teamShotStats - dictionary of lists of the teams shot statistics
+    #           compProps - list of super shot proportions to simulate
+    #           seed - seed for the random generators
+    #           counterBased - boolean flag whether to use the counter based random
+    #                          numbers of the sims in the batch, rather than the
+    #                          batches own random generators
+    #
+    # Output:   batchSummary - CompSimAccumulator of the batch of sims
+
+    #Run the batch of sims
+    batchResults = runCompBatchResults(simUnit, teamShotStats = teamShotStats, compProps = compProps,
+                                       seed = seed, counterBased = counterBased)
+
+    #Get the summaries of the batch
+    batchSummary = CompSimAccumulator(teamNames = teamShotStats['squadNickname'],
+                                      compProps = compProps)
+    batchSummary.update(batchResults.getMargins())
+
+    return batchSummary
+
+# %% runCompSimsOnline
+
+def runCompSimsOnline(teamShotStats = None, compProps = None,
+                      teamShotsA = None, teamShotsB = None, seed = None,
+                      nProcesses = 1, batchSize = 10000, counterBased = False):
+
+    # Function for running the 'competitive' sims in batches and only keeping
+    # running summaries of the margins, rather than the result of each sim. Each
+    # team, shots, proportion and batch has its own random generator, so the
+    # summaries are the same for any number of processes (but not the same as
+    # runCompSims, or with a different batch size). With counter based random
+    # numbers the summaries are the same as those of runCompSims with
+    # counterBased set to True for any batch size, but the draws are much slower
+    # and the sims take around two and a half times as long
+    #
+    # Input:    teamShotStats - dictionary of lists with the squadNickname, madeStandard,
+    #                           missedStandard, madeSuper and missedSuper of each team
+    #           compProps - list of super shot proportions to simulate
+    #           teamShotsA - array of the team number of shots in each sim
+    #           teamShotsB - array of the opponent number of shots in each sim
+    #           seed - seed for the random generators
+    #           nProcesses - number of processes to run the batches with
+    #           batchSize - number of sims in each batch
+    #           counterBased - boolean flag whether to use counter based random
+    #                          numbers (see runCompSimUnit)
+    #
+    # Output:   compSimSummary - CompSimAccumulator of the sims
+
+    #Set the units for each batch of sims
+    teamShotsA = np.asarray(teamShotsA)
+    teamShotsB = np.asarray(teamShotsB)
+    simUnits = [(bb // batchSize, bb, teamShotsA[bb:bb+batchSize], teamShotsB[bb:bb+batchSize])
+                for bb in range(0, len(teamShotsA), batchSize)]
+
+    #Run the units and add their summaries together as they finish
+    unitFunc = partial(runCompBatchUnit, teamShotStats = teamShotStats,
+                       compProps = compProps, seed = seed, counterBased = counterBased)
+    compSimSummary = CompSimAccumulator(teamNames = teamShotStats['squadNickname'],
+                                        compProps = compProps)
+    for batchSummary in iterSimUnits(unitFunc, simUnits, nProcesses = nProcesses):
+        compSimSummary.merge(batchSummary)
+
+    return compSimSummary
+
+# %% getSimHistograms
+
+def getSimHistograms(df_compSimResults, teamNames, compProps):
+
+    # Function for getting the counts of each score and margin, and the summed
+    # shots, of each match up in the 'competitive' sim results. These hold the
+    # same results as the sim results table in a small fraction of the space, as
+    # the scores and margins only take a small number of integer values
+    #
+    # Input:    df_compSimResults - dataframe of the competitive sim results, from
+    #                               either the shot by shot or batched sims
+    #           teamNames - list of the team names
+    #           compProps - list of super shot proportions simulated
+    #
+    # Output:   simHistograms - dictionary of arrays with the number of sims, the
+    #                           counts of each teamScore, opponentScore and margin
+    #                           (and the value of the first count), and the summed
+    #                           shots and made shots of each team, opponent, team
+    #                           proportion and opponent proportion
+
+    #Get the match up of each result
+    compProps = np.array(compProps, dtype = float)
+    cellShape = (len(teamNames), len(teamNames), len(compProps), len(compProps))
+    cellInd = np.ravel_multi_index((pd.Categorical(df_compSimResults['teamName'], categories = teamNames).codes,
+                                    pd.Categorical(df_compSimResults['opponentName'], categories = teamNames).codes,
+                                    np.argmin(np.abs(df_compSimResults['teamSuperProp'].to_numpy(dtype = float)[:,None] - compProps), axis = 1),
+                                    np.argmin(np.abs(df_compSimResults['opponentSuperProp'].to_numpy(dtype = float)[:,None] - compProps), axis = 1)),
+                                   cellShape)
+    nCells = int(np.prod(cellShape))
+
+    #Set dictionary to store the counts in
+    simHistograms = {'teamNames': np.array(teamNames, dtype = str), 'compProps': compProps,
+                     'nSims': np.bincount(cellInd, minlength = nCells).reshape(cellShape).astype(np.int32)}
+
+    #Count each score and margin value of each match up
+    for valName in ['teamScore', 'opponentScore', 'margin']:
+        vals = df_compSimResults[valName].to_numpy(dtype = np.int64)
+        valOffset = int(vals.min())
+        nVals = int(vals.max()) - valOffset + 1
+        valCounts = np.bincount((cellInd * nVals) + (vals - valOffset), minlength = nCells * nVals)
+        simHistograms[valName+'Counts'] = valCounts.reshape(cellShape + (nVals,)).astype(np.int32)
+        simHistograms[valName+'Offset'] = valOffset
+
+    #Sum the shots and made shots of each match up. The made shots are counted
+    #from the lists of shot outcomes if the results are from the shot by shot sims
+    for sideName in ['team', 'opponent']:
+        if sideName+'MadeStandard' not in df_compSimResults.columns:
+            madeStandard = [shotOutcomes.count('made') for shotOutcomes in df_compSimResults[sideName+'ShotOutcomeStandard']]
+            madeSuper = [shotOutcomes.count('made') for shotOutcomes in df_compSimResults[sideName+'ShotOutcomeSuper']]
+        else:
+            madeStandard = df_compSimResults[sideName+'MadeStandard']
+            madeSuper = df_compSimResults[sideName+'MadeSuper']
+        for colName, colVals in zip(['Shots', 'SuperShots', 'StandardShots', 'MadeStandard', 'MadeSuper'],
+                                    [df_compSimResults[sideName+'Shots'], df_compSimResults[sideName+'SuperShots'],
+                                     df_compSimResults[sideName+'StandardShots'], madeStandard, madeSuper]):
+            simHistograms[sideName+colName] = np.bincount(cellInd, weights = np.asarray(colVals, dtype = float),
+                                                          minlength = nCells).reshape(cellShape).astype(np.int64)
+
+    return simHistograms
+
+# %% saveSimHistograms
+
+def saveSimHistograms(simHistograms, filePath):
+
+    # Function for saving the counts from getSimHistograms to a compressed NumPy
+    # (.npz) file
+    #
+    # Input:    simHistograms - dictionary of arrays from getSimHistograms
+    #           filePath - path of the file to save
+
+    np.savez_compressed(filePath, **simHistograms)
+
+# %% loadSimHistograms
+
+def loadSimHistograms(filePath):
+
+    # Function for loading the counts saved by saveSimHistograms
+    #
+    # Input:    filePath - path of the file to load
+    #
+    # Output:   simHistograms - dictionary of arrays from getSimHistograms
+
+    with np.load(filePath) as histFile:
+        simHistograms = {arrName: histFile[arrName] for arrName in histFile.files}
+    simHistograms['teamNames'] = list(simHistograms['teamNames'])
+    for valName in ['teamScore', 'opponentScore', 'margin']:
+        simHistograms[valName+'Offset'] = int(simHistograms[valName+'Offset'])
+
+    return simHistograms
+
+# %% saveSimSummary
+
+def saveSimSummary(simSummary, filePath):
+
+    # Function for saving the running summaries of the sims to a compressed NumPy
+    # (.npz) file, so that they can be loaded back without re-running the sims
+    #
+    # Input:    simSummary - StandardSimAccumulator or CompSimAccumulator of the sims
+    #           filePath - path of the file to save
+
+    np.savez_compressed(filePath, summaryType = type(simSummary).__name__, **vars(simSummary))
+
+# %% loadSimSummary
+
+def loadSimSummary(filePath):
+
+    # Function for loading the running summaries saved by saveSimSummary
+    #
+    # Input:    filePath - path of the file to load
+    #
+    # Output:   simSummary - StandardSimAccumulator or CompSimAccumulator of the sims
+
+    with np.load(filePath) as summaryFile:
+        summaryArrs = {arrName: summaryFile[arrName] for arrName in summaryFile.files}
+
+    #Set the running summaries of the saved type with the saved counts, offsets,
+    #moments and number of sims
+    summaryClass = {'StandardSimAccumulator': StandardSimAccumulator,
+                    'CompSimAccumulator': CompSimAccumulator}[str(summaryArrs.pop('summaryType'))]
+    simSummary = summaryClass.__new__(summaryClass)
+    for arrName, arrVals in summaryArrs.items():
+        setattr(simSummary, arrName, arrVals.item() if arrVals.ndim == 0 else arrVals)
+    simSummary.teamNames = list(simSummary.teamNames)
+
+    return simSummary
+
+# %% getHistogramResults
+
+def getHistogramResults(simHistograms, bothOrientations = False):
+
+    # Function for getting the margins stored in the counts from getSimHistograms
+    # as a dataframe with a row for each sim, in the format of the sim results
+    # table. This can be used with the competitive sim functions in the figure
+    # helper. Only the margins are given, as the scores and shots are counted
+    # separately so can't be matched to each sim
+    #
+    # Input:    simHistograms - dictionary of arrays from getSimHistograms
+    #           bothOrientations - boolean flag whether to also give each result
+    #                              from the opponents side with the margin flipped,
+    #                              in the format of the sim margins tables
+    #
+    # Output:   df_histResults - dataframe with the teamName, teamSuperProp,
+    #                            opponentName, opponentSuperProp and margin of
+    #                            each sim, ordered by team, opponent, opponent
+    #                            proportion, team proportion and margin
+
+    #Get the match up and margin of each count in the order of the results table
+    marginCounts = np.transpose(simHistograms['marginCounts'], (0, 1, 3, 2, 4))
+    teamInd, oppInd, p2, p1, marginInd = [np.repeat(ind, marginCounts.ravel())
+                                          for ind in np.unravel_index(np.arange(marginCounts.size), marginCounts.shape)]
+
+    #Set the results of each sim
+    compProps = np.array(simHistograms['compProps'], dtype = float)
+    histResults = {'teamName': teamInd, 'teamSuperProp': compProps[p1],
+                   'opponentName': oppInd, 'opponentSuperProp': compProps[p2],
+                   'margin': simHistograms['marginOffset'] + marginInd}
+
+    #Add the results from the opponents side with the margin flipped
+    if bothOrientations:
+        histResults = {'teamName': np.concatenate((teamInd, oppInd)),
+                       'teamSuperProp': np.concatenate((compProps[p1], compProps[p2])),
+                       'opponentName': np.concatenate((oppInd, teamInd)),
+                       'opponentSuperProp': np.concatenate((compProps[p2], compProps[p1])),
+                       'margin': np.concatenate((histResults['margin'], histResults['margin'] * -1))}
+
+    #Set the team names as categories
+    for colName in ['teamName', 'opponentName']:
+        histResults[colName] = pd.Categorical.from_codes(histResults[colName], categories = simHistograms['teamNames'])
+
+    return pd.DataFrame(histResults)
+
+# %% getHistogramSummary
+
+def getHistogramSummary(simHistograms):
+
+    # Function for getting the running summaries of the margins (see
+    # CompSimAccumulator) from the counts from getSimHistograms, so that the
+    # same summaries can be taken from the stored counts
+    #
+    # Input:    simHistograms - dictionary of arrays from getSimHistograms
+    #
+    # Output:   compSimSummary - CompSimAccumulator of the margin counts. Only the
+    #                            match ups in the stored results have counts
+
+    #Set the margin counts
+    compSimSummary = CompSimAccumulator(teamNames = simHistograms['teamNames'],
+                                        compProps = simHistograms['compProps'])
+    compSimSummary.marginCounts = simHistograms['marginCounts'].astype(np.int64)
+    compSimSummary.marginOffset = simHistograms['marginOffset']
+    compSimSummary.nSims = int(np.max(simHistograms['nSims']))
+
+    #Calculate the moments of each match up from the counts
+    marginVals = compSimSummary.marginOffset + np.arange(compSimSummary.marginCounts.shape[-1])
+    nSims = np.maximum(simHistograms['nSims'], 1)
+    compSimSummary.marginMean = np.sum(compSimSummary.marginCounts * marginVals, axis = -1) / nSims
+    compSimSummary.marginM2 = np.sum(compSimSummary.marginCounts * ((marginVals - compSimSummary.marginMean[...,None]) ** 2), axis = -1)
+
+    return compSimSummary
+
+# %% packShotOutcomes
+
+def packShotOutcomes(shotOutcomes):
+
+    # Function for converting lists of shot outcomes to the number of made shots
+    # and a bit mask of the made shots. Bit ss of the mask is set if shot ss in
+    # the list was made, so the lists can be rebuilt with unpackShotOutcomes
+    #
+    # Input:    shotOutcomes - list of the lists of 'made' and 'miss' outcomes in
+    #                          each sim, or the same lists read back as text from a
+    #                          .csv file
+    #
+    # Output:   madeCounts - array of the number of made shots in each sim
+    #           madeMasks - array of the bit masks of the made shots in each sim
+
+    #Set arrays to store the counts and masks in
+    madeCounts = np.zeros(len(shotOutcomes), dtype = np.int16)
+    madeMasks = np.zeros(len(shotOutcomes), dtype = np.uint64)
+
+    #Loop through the sims and pack the outcomes
+    for ss, simOutcomes in enumerate(shotOutcomes):
+        #Get the outcomes from the text of the list if read from file
+        if isinstance(simOutcomes, str):
+            simOutcomes = re.findall('made|miss', simOutcomes)
+        #Check the outcomes fit in the mask
+        if len(simOutcomes) > 64:
+            raise ValueError('Shot outcome masks can only hold up to 64 shots per sim.')
+        madeShots = [shotInd for shotInd, shotOutcome in enumerate(simOutcomes) if shotOutcome == 'made']
+        madeCounts[ss] = len(madeShots)
+        madeMasks[ss] = sum(1 << shotInd for shotInd in madeShots)
+
+    return madeCounts, madeMasks
+
+# %% unpackShotOutcomes
+
+def unpackShotOutcomes(madeMasks, nShots):
+
+    # Function for rebuilding the lists of shot outcomes from the bit masks of
+    # the made shots from packShotOutcomes
+    #
+    # Input:    madeMasks - array of the bit masks of the made shots in each sim
+    #           nShots - array of the number of shots in each sim
+    #
+    # Output:   shotOutcomes - list of the lists of 'made' and 'miss' outcomes in
+    #                          each sim
+
+    #Get the made shots from the bits of each mask
+    madeBits = (np.asarray(madeMasks, dtype = np.uint64)[:,None] >> np.arange(64, dtype = np.uint64)) & np.uint64(1)
+    shotOutcomes = [['made' if madeBit else 'miss' for madeBit in simBits[:simShots]]
+                    for simBits, simShots in zip(madeBits.astype(bool), np.asarray(nShots, dtype = int))]
+
+    return shotOutcomes
+
+# %% getTypedResults
+
+def getTypedResults(df_simResults):
+
+    # Function for converting a sim results table to typed columns, so that it
+    # can be stored in a binary file (e.g. Feather) and read back without parsing
+    # any text. The lists of shot outcomes are replaced with the number of made
+    # shots (named as in the batched sims, e.g. teamShotOutcomeStandard becomes
+    # teamMadeStandard) and a bit mask of the made shots (e.g. teamMadeStandardMask).
+    # The shot, score and margin columns are set to 16 bit integers and the team
+    # names and proportion bins to categories
+    #
+    # Input:    df_simResults - dataframe of 'standard' or 'competitive' sim results
+    #
+    # Output:   df_typedResults - dataframe of the typed sim results
+
+    #Copy the results with a default index, which is needed for Feather files
+    df_typedResults = df_simResults.reset_index(drop = True)
+
+    #Replace the lists of shot outcomes with the made counts and masks
+    for colName in list(df_typedResults.columns):
+        if 'hotOutcome' in colName:
+            madeName = colName.replace('shotOutcome', 'made').replace('ShotOutcome', 'Made')
+            madeCounts, madeMasks = packShotOutcomes(df_typedResults[colName])
+            colInd = df_typedResults.columns.get_loc(colName)
+            df_typedResults = df_typedResults.drop(columns = colName)
+            df_typedResults.insert(colInd, madeName, madeCounts)
+            df_typedResults.insert(colInd+1, madeName+'Mask', madeMasks)
+
+    #Set the data types of the other columns
+    for colName in df_typedResults.columns:
+        if colName in typedCountColumns:
+            df_typedResults[colName] = df_typedResults[colName].astype(np.int16)
+        elif colName in typedNameColumns:
+            df_typedResults[colName] = df_typedResults[colName].astype('category')
+
+    return df_typedResults
+
+# %% MatchupView
+
+class MatchupView:
+
+    # View of the 'competitive' sim results from both sides of each match up. Each
+    # result is stored once, from the side of the team in the results table, and
+    # is given from the opponents side with the margin flipped and the team and
+    # opponent columns swapped when asked for. This gives any part of the sim
+    # margins tables without holding every result twice
+
+    def __init__(self, df_compSimResults, teamNames):
+
+        # Input:    df_compSimResults - dataframe of 'competitive' sim results, with
+        #                               either the made shot counts or the lists of
+        #                               shot outcomes
+        #           teamNames - list of team names to give the match ups of
+
+        #Set the columns of each side in the sim margins tables
+        self.shotCols = ['Shots', 'SuperShots', 'StandardShots']
+        self.perCols = ['ShootingPer', 'StandardShootingPer', 'SuperShootingPer']
+        self.sidePairs = {'team': 'opponent', 'opponent': 'team'}
+
+        #Set the team names, adding any teams not in the list after those in it
+        self.teamNames = list(teamNames)
+        self.allNames = list(teamNames)
+        self.nResults = len(df_compSimResults)
+
+        #Get the names, shots and shooting percentages of each side of the results
+        self.sideResults = {}
+        for sideName in ['team', 'opponent']:
+
+            #Get the team names as codes
+            nameCodes = pd.Categorical(df_compSimResults[sideName+'Name'], categories = self.allNames).codes
+            if np.any(nameCodes < 0):
+                self.allNames.extend(pd.unique(df_compSimResults[sideName+'Name'].to_numpy()[nameCodes < 0]))
+                nameCodes = pd.Categorical(df_compSimResults[sideName+'Name'], categories = self.allNames).codes
+            self.sideResults[sideName+'Name'] = nameCodes.astype(np.int16)
+            self.sideResults[sideName+'SuperProp'] = df_compSimResults[sideName+'SuperProp'].to_numpy()
+
+            #Get the made shot counts, packing the lists of outcomes if needed
+            madeShots = {}
+            for shotType in ['Standard', 'Super']:
+                if sideName+'Made'+shotType in df_compSimResults.columns:
+                    madeShots[shotType] = df_compSimResults[sideName+'Made'+shotType].to_numpy()
+                else:
+                    madeShots[shotType] = packShotOutcomes(df_compSimResults[sideName+'ShotOutcome'+shotType])[0]
+
+            #Get the shots of the side
+            for colName in self.shotCols:
+                self.sideResults[sideName+colName] = df_compSimResults[sideName+colName].to_numpy()
+
+            #Calculate the shooting percentages at each sim (these are missing where
+            #no shots of the type were taken)
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                self.sideResults[sideName+'ShootingPer'] = (madeShots['Standard'].astype(float) + madeShots['Super']) / self.sideResults[sideName+'Shots']
+                self.sideResults[sideName+'StandardShootingPer'] = madeShots['Standard'].astype(float) / self.sideResults[sideName+'StandardShots']
+                self.sideResults[sideName+'SuperShootingPer'] = madeShots['Super'].astype(float) / self.sideResults[sideName+'SuperShots']
+
+        #Set the margins from the team side
+        self.sideResults['margin'] = df_compSimResults['margin'].to_numpy()
+
+    def getMatchups(self, teamName = None, opponentName = None,
+                    teamSuperProp = None, opponentSuperProp = None):
+
+        # Function for getting the results of the match ups from both sides, in the
+        # format of the sim margins tables. Each teams rows are given in the order
+        # of the results where they are the team, followed by the results where
+        # they are the opponent
+        #
+        # Input:    teamName - name of the team to get the match ups of. The default
+        #                      of None gets all teams in the list
+        #           opponentName - as above for the opponent
+        #           teamSuperProp - super shot proportion of the team to get the
+        #                           match ups of. The default of None gets all
+        #                           proportions
+        #           opponentSuperProp - as above for the opponent
+        #
+        # Output:   df_matchups - dataframe of the margins and shooting percentages,
+        #                         with the team names as categories
+
+        #Get the results that match from the team side, and from the opponent side
+        #with the team and opponent swapped
+        sideInds = []
+        for sideName in ['team', 'opponent']:
+            sideMask = self.sideResults[sideName+'Name'] < len(self.teamNames)
+            if teamName is not None:
+                sideMask &= self.sideResults[sideName+'Name'] == self.getNameCode(teamName)
+            if opponentName is not None:
+                sideMask &= self.sideResults[self.sidePairs[sideName]+'Name'] == self.getNameCode(opponentName)
+            if teamSuperProp is not None:
+                sideMask &= self.sideResults[sideName+'SuperProp'] == teamSuperProp
+            if opponentSuperProp is not None:
+                sideMask &= self.sideResults[self.sidePairs[sideName]+'SuperProp'] == opponentSuperProp
+            sideInds.append(np.flatnonzero(sideMask))
+
+        #Put the rows in order, grouped by team and then by side. Rows with the same
+        #team and side stay in the order of the results
+        resultInds = np.concatenate(sideInds)
+        oppSide = np.repeat([False, True], [len(sideInds[0]), len(sideInds[1])])
+        teamCodes = np.concatenate((self.sideResults['teamName'][sideInds[0]],
+                                    self.sideResults['opponentName'][sideInds[1]]))
+        rowOrder = np.argsort(teamCodes * 2 + oppSide, kind = 'stable')
+        resultInds = resultInds[rowOrder]
+        oppSide = oppSide[rowOrder]
+
+        #Set the columns from the team side, or from the opponent side with the
+        #team and opponent columns swapped
+        matchups = {}
+        for colName in ['Name', 'SuperProp'] + self.shotCols + self.perCols:
+            for sideName in ['team', 'opponent']:
+                matchups[sideName+colName] = self.sideResults[sideName+colName][resultInds]
+                matchups[sideName+colName][oppSide] = self.sideResults[self.sidePairs[sideName]+colName][resultInds[oppSide]]
+        matchups['margin'] = self.sideResults['margin'][resultInds]
+        matchups['margin'][oppSide] *= -1
+
+        #Set the team names as categories
+        for colName in ['teamName', 'opponentName']:
+            matchups[colName] = pd.Categorical.from_codes(matchups[colName], categories = self.allNames)
+
+        #Put the columns in the order of the sim margins tables
+        df_matchups = pd.DataFrame({colName: matchups[colName] for colName in
+                                    ['teamName', 'teamSuperProp', 'opponentName', 'opponentSuperProp', 'margin'] +
+                                    ['team'+colName for colName in self.shotCols + self.perCols] +
+                                    ['opponent'+colName for colName in self.shotCols + self.perCols]},
+                                   copy = False)
+
+        return df_matchups
+
+    def getNameCode(self, teamName):
+
+        # Function for getting the code of a team name in the view
+        #
+        # Input:    teamName - name of the team
+        #
+        # Output:   nameCode - code of the team name, or -1 if the team isn't in
+        #                      the results
+
+        if teamName in self.allNames:
+            return self.allNames.index(teamName)
+        else:
+            return -1
+
+# %% getSimMargins
+
+def getSimMargins(df_compSimResults, teamNames):
+
+    # Function for getting the margins and shooting percentages of each
+    # 'competitive' sim from both sides of the match up, in the format of the sim
+    # margins tables (see MatchupView)
+    #
+    # Input:    df_compSimResults - dataframe of 'competitive' sim results, with
+    #                               either the made shot counts or the lists of
+    #                               shot outcomes
+    #           teamNames - list of team names to get the margins for
+    #
+    # Output:   df_simMargins - dataframe of the margins and shooting percentages,
+    #                           with the team names as categories
+
+    return MatchupView(df_compSimResults, teamNames).getMatchups()
+
+# %% SimResultsIndex
+
+class SimResultsIndex:
+
+    # Index of the 'competitive' sim results by team, opponent, team proportion
+    # and opponent proportion. The results are kept sorted so that each match up
+    # and pair of proportions is a block of rows, and the start of each block is
+    # kept in an offset table. Any one block is then taken as a slice of the
+    # results, rather than by checking every row for the teams and proportions
+
+    def __init__(self, df_compSimResults, teamNames, compProps):
+
+        # Input:    df_compSimResults - dataframe of 'competitive' sim results
+        #           teamNames - list of the team names
+        #           compProps - list of the super shot proportions simulated
+
+        self.teamNames = list(teamNames)
+        self.compProps = list(compProps)
+        self.nameInds = {teamName: ii for ii, teamName in enumerate(self.teamNames)}
+        self.propInds = {compProp: ii for ii, compProp in enumerate(self.compProps)}
+
+        #Set the shape of the blocks, in the order of team, opponent, opponent
+        #proportion and team proportion that the sims are run in
+        self.cellShape = (len(self.teamNames), len(self.teamNames), len(self.compProps), len(self.compProps))
+        nCells = int(np.prod(self.cellShape))
+
+        #Get the block of each result, with any results not in the lists of teams
+        #and proportions put after the blocks
+        cellCodes = [pd.Categorical(df_compSimResults['teamName'], categories = self.teamNames).codes,
+                     pd.Categorical(df_compSimResults['opponentName'], categories = self.teamNames).codes,
+                     pd.Categorical(df_compSimResults['opponentSuperProp'], categories = self.compProps).codes,
+                     pd.Categorical(df_compSimResults['teamSuperProp'], categories = self.compProps).codes]
+        missingCodes = np.any([codes < 0 for codes in cellCodes], axis = 0)
+        cellInds = np.ravel_multi_index([np.maximum(codes, 0) for codes in cellCodes], self.cellShape)
+        cellInds[missingCodes] = nCells
+
+        #Sort the results by block, keeping the order of the results in each block.
+        #The results are usually already in this order so don't need to be copied
+        if np.all(np.diff(cellInds) >= 0):
+            self.df_compSimResults = df_compSimResults
+        else:
+            rowOrder = np.argsort(cellInds, kind = 'stable')
+            self.df_compSimResults = df_compSimResults.take(rowOrder)
+            cellInds = cellInds[rowOrder]
+
+        #Get the row each block starts at, with the end of the last block at the end
+        self.cellStarts = np.searchsorted(cellInds, np.arange(nCells + 1))
+
+    def getCell(self, teamName, opponentName, teamSuperProp, opponentSuperProp):
+
+        # Function for getting the results of one match up and pair of proportions.
+        # The rows are a slice of the indexed results, so should be copied before
+        # any columns are changed
+        #
+        # Input:    teamName - name of the team
+        #           opponentName - name of the opponent
+        #           teamSuperProp - super shot proportion of the team
+        #           opponentSuperProp - super shot proportion of the opponent
+        #
+        # Output:   df_cellResults - dataframe of the results
+
+        #Get the block of the results, and give no results if it isn't indexed
+        cellInds = self.getCellInds(teamName, opponentName, teamSuperProp, opponentSuperProp)
+        if len(cellInds) == 0:
+            return self.df_compSimResults.iloc[0:0]
+
+        return self.df_compSimResults.iloc[self.cellStarts[cellInds[0]]:self.cellStarts[cellInds[0]+1]]
+
+    def getCells(self, teamName = None, opponentName = None,
+                 teamSuperProp = None, opponentSuperProp = None):
+
+        # Function for getting the results of any set of match ups and proportions,
+        # taken from the blocks in the index rather than checking every row
+        #
+        # Input:    teamName - name of the team. The default of None gets all teams
+        #           opponentName - as above for the opponent
+        #           teamSuperProp - super shot proportion of the team. The default
+        #                           of None gets all proportions
+        #           opponentSuperProp - as above for the opponent
+        #
+        # Output:   df_cellResults - dataframe of the results, ordered by team,
+        #                            opponent, opponent proportion and team proportion
+
+        #Get the rows of each block
+        cellInds = self.getCellInds(teamName, opponentName, teamSuperProp, opponentSuperProp)
+        cellStarts = self.cellStarts[cellInds]
+        cellLengths = self.cellStarts[cellInds+1] - cellStarts
+        rowInds = np.repeat(cellStarts - np.cumsum(cellLengths) + cellLengths, cellLengths) + np.arange(np.sum(cellLengths))
+
+        return self.df_compSimResults.iloc[rowInds]
+
+    def getCellInds(self, teamName = None, opponentName = None,
+                    teamSuperProp = None, opponentSuperProp = None):
+
+        # Function for getting the blocks of the index for a set of match ups and
+        # proportions
+        #
+        # Input:    as for getCells
+        #
+        # Output:   cellInds - array of the indices of the blocks, in order
+
+        #Get the indices of each part of the blocks, where None gets all of them
+        #and any value not in the index gets none
+        partInds = []
+        for partVal, partLookup, nParts in [(teamName, self.nameInds, self.cellShape[0]),
+                                            (opponentName, self.nameInds, self.cellShape[1]),
+                                            (opponentSuperProp, self.propInds, self.cellShape[2]),
+                                            (teamSuperProp, self.propInds, self.cellShape[3])]:
+            if partVal is None:
+                partInds.append(np.arange(nParts))
+            elif partVal in partLookup:
+                partInds.append(np.array([partLookup[partVal]]))
+            else:
+                partInds.append(np.array([], dtype = int))
+
+        return np.ravel_multi_index(np.ix_(*partInds), self.cellShape).ravel()
+
+# %% SimResultsWriter
+
+class SimResultsWriter:
+
+    # Writer for streaming sim results to a Parquet file in fixed size chunks
+    # while the sims run. Results are buffered until there are enough rows for a
+    # chunk, which is then written to the file as a row group, so only about one
+    # chunk of results is held in memory. Used as a context manager, the file is
+    # closed (and is readable) even if the sims stop with an error part way
+    # through, keeping the chunks written before the error
+
+    def __init__(self, filePath, chunkSize = 100000):
+
+        # Input:    filePath - path of the Parquet file to write
+        #           chunkSize - number of sim results (rows) in each chunk
+
+        self.filePath = filePath
+        self.chunkSize = int(chunkSize)
+        self.parquetWriter = None
+        self.chunkBuffer = []
+        self.nBuffered = 0
+        self.nWritten = 0
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+
+        self.close()
+
+    def write(self, simResults):
+
+        # Function for adding sim results to the file
+        #
+        # Input:    simResults - dictionary of arrays or dataframe of sim results,
+        #                        with the same columns for each call
+
+        #Add the results to the buffer
+        df_simResults = pd.DataFrame(simResults)
+        self.chunkBuffer.append(df_simResults)
+        self.nBuffered = self.nBuffered + len(df_simResults)
+
+        #Write any full chunks
+        if self.nBuffered >= self.chunkSize:
+            self.writeChunks(finalChunk = False)
+
+    def writeChunks(self, finalChunk = False):
+
+        # Function for writing the buffered results to the file in chunks
+        #
+        # Input:    finalChunk - boolean flag whether to also write the last part
+        #                        chunk, otherwise it is kept in the buffer
+
+        #Import pyarrow here, so that it's only needed when streaming results
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        #Join the buffered results
+        if self.nBuffered == 0:
+            return
+        df_buffer = pd.concat(self.chunkBuffer, ignore_index = True)
+
+        #Write each chunk as a row group
+        startInd = 0
+        while len(df_buffer) - startInd >= self.chunkSize or \
+                (finalChunk and startInd < len(df_buffer)):
+            endInd = min(startInd + self.chunkSize, len(df_buffer))
+            if self.parquetWriter is None:
+                chunkTable = pa.Table.from_pandas(df_buffer.iloc[startInd:endInd], preserve_index = False)
+                self.parquetWriter = pq.ParquetWriter(self.filePath, chunkTable.schema)
+            else:
+                chunkTable = pa.Table.from_pandas(df_buffer.iloc[startInd:endInd], preserve_index = False,
+                                                  schema = self.parquetWriter.schema)
+            self.parquetWriter.write_table(chunkTable, row_group_size = self.chunkSize)
+            self.nWritten = self.nWritten + (endInd - startInd)
+            startInd = endInd
+
+        #Keep the remaining results in the buffer
+        self.chunkBuffer = [df_buffer.iloc[startInd:]]
+        self.nBuffered = len(df_buffer) - startInd
+
+    def close(self):
+
+        # Function for writing the remaining results and closing the file
+
+        self.writeChunks(finalChunk = True)
+        if self.parquetWriter is not None:
+            self.parquetWriter.close()
+            self.parquetWriter = None
+
+# %% writeSimResults
+
+def writeSimResults(simChunks, filePath, chunkSize = 100000):
+
+    # Function for streaming sim results to a Parquet file as they are generated
+    #
+    # Input:    simChunks - iterable of dictionaries of arrays or dataframes of sim
+    #                       results (e.g. from iterStandardSims or
+    #                       CompSimResults.iterDataFrames)
+    #           filePath - path of the Parquet file to write
+    #           chunkSize - number of sim results (rows) in each chunk of the file
+    #
+    # Output:   nWritten - number of sim results written to the file
+
+    #Write each set of results as it is generated
+    with SimResultsWriter(filePath, chunkSize = chunkSize) as resultsWriter:
+        for simResults in simChunks:
+            resultsWriter.write(simResults)
+
+    return resultsWriter.nWritten
+
+# %% iterSimResults
+
+def iterSimResults(filePath, columns = None):
+
+    # Function for reading sim results written by writeSimResults back one chunk
+    # at a time, so that summaries can be built without loading the whole file
+    #
+    # Input:    filePath - path of the Parquet file to read
+    #           columns - list of the columns to read. The default of None reads
+    #                     all columns
+    #
+    # Output:   df_simResults - generator of dataframes of each chunk of results
+
+    #Import pyarrow here, so that it's only needed when streaming results
+    import pyarrow.parquet as pq
+
+    #Read each row group of the file
+    parquetFile = pq.ParquetFile(filePath)
+    for rr in range(parquetFile.num_row_groups):
+        yield parquetFile.read_row_group(rr, columns = columns).to_pandas()
+
+# %% iterTeamSimResults
+
+def iterTeamSimResults(filePath, columns = None):
+
+    # Function for reading 'standard' sim results written by writeSimResults back
+    # one team at a time. Each teams results are written together, so only one
+    # teams results and one chunk of the file are held in memory
+    #
+    # Input:    filePath - path of the Parquet file to read
+    #           columns - list of the columns to read, which needs to include the
+    #                     squadNickname. The default of None reads all columns
+    #
+    # Output:   teamSimResults - generator of tuples of each team name and a
+    #                            dataframe of the teams results
+
+    #Set list to store the chunks of the current teams results in
+    teamName = None
+    teamChunks = []
+
+    #Split each chunk of the file where the team changes
+    for df_chunk in iterSimResults(filePath, columns = columns):
+        chunkNames = df_chunk['squadNickname'].astype(str).to_numpy()
+        splitInds = np.concatenate(([0], np.flatnonzero(chunkNames[1:] != chunkNames[:-1]) + 1, [len(df_chunk)]))
+        for startInd, endInd in zip(splitInds[:-1], splitInds[1:]):
+
+            #Return the previous teams results once the next team starts
+            if chunkNames[startInd] != teamName and len(teamChunks) > 0:
+                yield teamName, pd.concat(teamChunks, ignore_index = True)
+                teamChunks = []
+            teamName = chunkNames[startInd]
+            teamChunks.append(df_chunk.iloc[startInd:endInd])
+
+    #Return the last teams results
+    if len(teamChunks) > 0:
+        yield teamName, pd.concat(teamChunks, ignore_index = True)
+
+# %% getStreamedMaxMinSummary
+
+def getStreamedMaxMinSummary(filePath, teamNames, superShotProps):
+
+    # Function for getting the max and min score summaries of the 'standard' sims
+    # (see getStandardMaxMinSummary) from the results streamed to file, reading
+    # the results back one team at a time
+    #
+    # Input:    filePath - path of the Parquet file written by writeSimResults
+    #           teamNames - list of the team names
+    #           superShotProps - list of super shot proportions simulated
+    #
+    # Output:   summaryMaxSimResults - dictionary of lists with the proportion of
+    #                                  sims each bin gives the max score for each
+    #                                  team, along with the mean, min and max shots
+    #           summaryMinSimResults - as above for the min score
+
+    #Get the summaries of each team from its results
+    teamSummaries = dict()
+    for teamName, df_teamSims in iterTeamSimResults(filePath, columns = ['squadNickname', 'nShots', 'superProp', 'totalPts']):
+        teamSummaries[teamName] = getStandardMaxMinSummary(df_teamSims, [teamName], superShotProps)
+
+    #Join the summaries in the order of the team names
+    summaryMaxSimResults = {colName: [] for colName in teamSummaries[teamNames[0]][0].keys()}
+    summaryMinSimResults = {colName: [] for colName in teamSummaries[teamNames[0]][1].keys()}
+    for teamName in teamNames:
+        teamMax, teamMin = teamSummaries[teamName]
+        for colName in summaryMaxSimResults.keys():
+            summaryMaxSimResults[colName].extend(teamMax[colName])
+            summaryMinSimResults[colName].extend(teamMin[colName])
+
+    return summaryMaxSimResults, summaryMinSimResults
+
+# %% getStreamedHistograms
+
+def getStreamedHistograms(filePath, teamNames, compProps):
+
+    # Function for getting the counts of each score and margin of each match up
+    # (see getSimHistograms) from the 'competitive' sim results streamed to file,
+    # reading the results back one chunk at a time and adding the counts
+    #
+    # Input:    filePath - path of the Parquet file written by writeSimResults
+    #           teamNames - list of the team names
+    #           compProps - list of super shot proportions simulated
+    #
+    # Output:   simHistograms - dictionary of arrays from getSimHistograms
+
+    #Add the counts from each chunk of the file
+    simHistograms = None
+    for df_chunk in iterSimResults(filePath):
+        chunkHistograms = getSimHistograms(df_chunk, teamNames, compProps)
+        if simHistograms is None:
+            simHistograms = chunkHistograms
+            continue
+        simHistograms['nSims'] = simHistograms['nSims'] + chunkHistograms['nSims']
+        for valName in ['teamScore', 'opponentScore', 'margin']:
+            simHistograms[valName+'Counts'], simHistograms[valName+'Offset'] = sumValueCounts(simHistograms[valName+'Counts'], simHistograms[valName+'Offset'],
+                                                                                              chunkHistograms[valName+'Counts'], chunkHistograms[valName+'Offset'])
+        for sideName in ['team', 'opponent']:
+            for colName in ['Shots', 'SuperShots', 'StandardShots', 'MadeStandard', 'MadeSuper']:
+                simHistograms[sideName+colName] = simHistograms[sideName+colName] + chunkHistograms[sideName+colName]
+
+    return simHistograms
+
+# %%
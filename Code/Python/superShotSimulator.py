@@ -41,6 +41,7 @@ locale.setlocale(locale.LC_ALL, 'en_US')
 #Custom packages
 import ssn2020DataHelper as dataHelper
 import ssn2020FigHelper as figHelper
+import ssn2020SimHelper as simHelper
 
 # %% Settings
 
@@ -90,27 +91,41 @@ df_squadLists = pd.read_csv('..\\squadLists.csv')
 #Create a variable for starting positions
 starterPositions = ['GS','GA','WA','C','WD','GD','GK']
 
-#Import data using helper function
+#Set the number of processes to parse the match files with. This is left at 1
+#when running the script cell by cell, as parsing in a process pool on Windows
+#requires the call to sit under an if __name__ == '__main__' guard
+nProcesses = 1
+
+#Set the directory to cache the parsed match data in. Subsequent runs load the
+#data from here, and only new or changed .json files are parsed again. Set this
+#to None to parse all of the files each time
+cacheDir = '..\\dataCache'
+
+#Import data using helper function. Only the data used in the sims is extracted
+#here, with the lineup and statistics data extracted if accessed later on (e.g.
+#dataImport['df_lineUp'])
 dataImport = dataHelper.getMatchData(jsonFileList = jsonFileList,
                                      df_squadLists = df_squadLists,
                                      exportDict = True, exportDf = True,
                                      exportTeamData = True, exportPlayerData = True,
                                      exportMatchData = True, exportScoreData = True,
-                                     exportLineUpData = True)
+                                     exportLineUpData = False, exportPlayerStatsData = False,
+                                     exportTeamStatsData = False, nProcesses = nProcesses,
+                                     cacheDir = cacheDir)
 
 #Unpack the imported data
 teamInfo = dataImport['teamInfo']
 matchInfo = dataImport['matchInfo']
 playerInfo = dataImport['playerInfo']
 scoreFlowData = dataImport['scoreFlowData']
-lineUpData = dataImport['lineUpData']
-individualLineUpData = dataImport['individualLineUpData']
 df_teamInfo = dataImport['df_teamInfo']
 df_matchInfo = dataImport['df_matchInfo']
 df_playerInfo = dataImport['df_playerInfo']
 df_scoreFlow = dataImport['df_scoreFlow']
-df_lineUp = dataImport['df_lineUp']
-df_individualLineUp = dataImport['df_individualLineUp']
+
+#Count the shots by team, round, match, quarter, shot type and outcome. These
+#counts are used across each of the analyses below
+shotCounts = dataHelper.getShotCountCube(df_scoreFlow, df_matchInfo)
 
 # %% Relative odds of missing from inner vs. outer circle
 
@@ -141,58 +156,38 @@ if runRelOdds:
     #Calculate shot statistics, distributions and random sampling
     
     #Inner circle - all match
-    madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                     (df_scoreFlow['shotOutcome'] == True),'shotCircle'])
-    missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                       (df_scoreFlow['shotOutcome'] == False),'shotCircle'])
+    madeShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'innerCircle', shotOutcome = True)
+    missedShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'innerCircle', shotOutcome = False)
     betaInnerAll = stats.beta(missedShots,madeShots)
     valsInnerAll = np.random.beta(missedShots, madeShots, size = nTrials)
     
     #Outer circle - all match
-    madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                     (df_scoreFlow['shotOutcome'] == True),'shotCircle'])
-    missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                       (df_scoreFlow['shotOutcome'] == False),'shotCircle'])
+    madeShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'outerCircle', shotOutcome = True)
+    missedShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'outerCircle', shotOutcome = False)
     betaOuterAll = stats.beta(missedShots,madeShots)
     valsOuterAll = np.random.beta(missedShots, madeShots, size = nTrials)
     
     #Inner circle - standard period
-    madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                     (df_scoreFlow['shotOutcome'] == True) &
-                                     (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
-    missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                       (df_scoreFlow['shotOutcome'] == False) &
-                                       (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
+    madeShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'innerCircle', shotOutcome = True, periodCategory = 'standard')
+    missedShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'innerCircle', shotOutcome = False, periodCategory = 'standard')
     betaInnerStandard = stats.beta(missedShots,madeShots)
     valsInnerStandard = np.random.beta(missedShots, madeShots, size = nTrials)
     
     #Outer circle - standard period
-    madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                     (df_scoreFlow['shotOutcome'] == True) &
-                                     (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
-    missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                       (df_scoreFlow['shotOutcome'] == False) &
-                                       (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
+    madeShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'outerCircle', shotOutcome = True, periodCategory = 'standard')
+    missedShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'outerCircle', shotOutcome = False, periodCategory = 'standard')
     betaOuterStandard = stats.beta(missedShots,madeShots)
     valsOuterStandard = np.random.beta(missedShots, madeShots, size = nTrials)
     
     #Inner circle - super period
-    madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                     (df_scoreFlow['shotOutcome'] == True) &
-                                     (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
-    missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                       (df_scoreFlow['shotOutcome'] == False) &
-                                       (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
+    madeShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'innerCircle', shotOutcome = True, periodCategory = 'twoPoint')
+    missedShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'innerCircle', shotOutcome = False, periodCategory = 'twoPoint')
     betaInnerSuper = stats.beta(missedShots,madeShots)
     valsInnerSuper = np.random.beta(missedShots, madeShots, size = nTrials)
     
     #Outer circle - super period
-    madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                     (df_scoreFlow['shotOutcome'] == True) &
-                                     (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
-    missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                       (df_scoreFlow['shotOutcome'] == False) &
-                                       (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
+    madeShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'outerCircle', shotOutcome = True, periodCategory = 'twoPoint')
+    missedShots = dataHelper.sumShotCounts(shotCounts, shotCircle = 'outerCircle', shotOutcome = False, periodCategory = 'twoPoint')
     betaOuterSuper = stats.beta(missedShots,madeShots)
     valsOuterSuper = np.random.beta(missedShots, madeShots, size = nTrials)
     
@@ -302,70 +297,38 @@ if runRelOdds:
         #Calculate shot statistics, distributions and random sampling
         
         #Inner circle - all match
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                         (df_scoreFlow['squadId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                           (df_scoreFlow['squadId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = True)
+        missedShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = False)
         betaInnerAll = stats.beta(missedShots,madeShots)
         valsInnerAll = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Outer circle - all match
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                         (df_scoreFlow['squadId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                           (df_scoreFlow['squadId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = True)
+        missedShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = False)
         betaOuterAll = stats.beta(missedShots,madeShots)
         valsOuterAll = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Inner circle - standard period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                         (df_scoreFlow['squadId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                           (df_scoreFlow['squadId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = True, periodCategory = 'standard')
+        missedShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = False, periodCategory = 'standard')
         betaInnerStandard = stats.beta(missedShots,madeShots)
         valsInnerStandard = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Outer circle - standard period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                         (df_scoreFlow['squadId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                           (df_scoreFlow['squadId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = True, periodCategory = 'standard')
+        missedShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = False, periodCategory = 'standard')
         betaOuterStandard = stats.beta(missedShots,madeShots)
         valsOuterStandard = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Inner circle - super period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                         (df_scoreFlow['squadId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                           (df_scoreFlow['squadId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = True, periodCategory = 'twoPoint')
+        missedShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = False, periodCategory = 'twoPoint')
         betaInnerSuper = stats.beta(missedShots,madeShots)
         valsInnerSuper = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Outer circle - super period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                         (df_scoreFlow['squadId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                           (df_scoreFlow['squadId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = True, periodCategory = 'twoPoint')
+        missedShots = dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = False, periodCategory = 'twoPoint')
         betaOuterSuper = stats.beta(missedShots,madeShots)
         valsOuterSuper = np.random.beta(missedShots, madeShots, size = nTrials)
         
@@ -432,22 +395,9 @@ if runRelOdds:
     #We repeat a similar analysis here, but instead of the shots being taken we
     #look at shots being taken against a team
     
-    #This first requires us to look through the match info and add an opposition id
-    #to the score flow data
-    oppId = []
-    for ss in range(len(df_scoreFlow)):
-        #Grab the relevant row data
-        currMatch = df_scoreFlow['matchNo'][ss]
-        currRound = df_scoreFlow['roundNo'][ss]
-        currSquadId = df_scoreFlow['squadId'][ss]
-        #Match this up to the match info data and figure out which squad to add
-        #to the opposition id list
-        currSquads = df_matchInfo.loc[(df_matchInfo['roundNo'] == currRound) &
-                                      (df_matchInfo['matchNo'] == currMatch),
-                                      ['homeSquadId','awaySquadId']].values.flatten()
-        oppId.append(currSquads[np.where(currSquads != currSquadId)[0][0]])
-    #Append the new list to the dataframe
-    df_scoreFlow['oppId'] = oppId
+    #This first requires us to swap the shot counts over to the opposition team
+    #in each match, so that each teams counts are the shots taken against them
+    oppShotCounts = dataHelper.getOpponentShotCounts(shotCounts, df_matchInfo)
     
     #Loop through teams and extract their defensive shot statistics
     for tt in range(len(df_teamInfo['squadId'])):
@@ -459,70 +409,38 @@ if runRelOdds:
         #Calculate shot statistics, distributions and random sampling
         
         #Inner circle - all match
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                         (df_scoreFlow['oppId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                           (df_scoreFlow['oppId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = True)
+        missedShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = False)
         betaInnerAll = stats.beta(missedShots,madeShots)
         valsInnerAll = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Outer circle - all match
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                         (df_scoreFlow['oppId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                           (df_scoreFlow['oppId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = True)
+        missedShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = False)
         betaOuterAll = stats.beta(missedShots,madeShots)
         valsOuterAll = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Inner circle - standard period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                         (df_scoreFlow['oppId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                           (df_scoreFlow['oppId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = True, periodCategory = 'standard')
+        missedShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = False, periodCategory = 'standard')
         betaInnerStandard = stats.beta(missedShots,madeShots)
         valsInnerStandard = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Outer circle - standard period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                         (df_scoreFlow['oppId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                           (df_scoreFlow['oppId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'standard'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = True, periodCategory = 'standard')
+        missedShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = False, periodCategory = 'standard')
         betaOuterStandard = stats.beta(missedShots,madeShots)
         valsOuterStandard = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Inner circle - super period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                         (df_scoreFlow['oppId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'innerCircle') &
-                                           (df_scoreFlow['oppId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = True, periodCategory = 'twoPoint')
+        missedShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'innerCircle', shotOutcome = False, periodCategory = 'twoPoint')
         betaInnerSuper = stats.beta(missedShots,madeShots)
         valsInnerSuper = np.random.beta(missedShots, madeShots, size = nTrials)
         
         #Outer circle - super period
-        madeShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                         (df_scoreFlow['oppId'] == currSquadId) &
-                                         (df_scoreFlow['shotOutcome'] == True) &
-                                         (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
-        missedShots = len(df_scoreFlow.loc[(df_scoreFlow['shotCircle'] == 'outerCircle') &
-                                           (df_scoreFlow['oppId'] == currSquadId) &
-                                           (df_scoreFlow['shotOutcome'] == False) &
-                                           (df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle'])
+        madeShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = True, periodCategory = 'twoPoint')
+        missedShots = dataHelper.sumShotCounts(oppShotCounts, squadId = currSquadId, shotCircle = 'outerCircle', shotOutcome = False, periodCategory = 'twoPoint')
         betaOuterSuper = stats.beta(missedShots,madeShots)
         valsOuterSuper = np.random.beta(missedShots, madeShots, size = nTrials)
         
@@ -606,7 +524,7 @@ else:
 
 # #Calculate average rate of shots each team gets in the Power 5 period
 # nMatches = len(df_matchInfo)
-# nShotsPer5 = len(df_scoreFlow.loc[(df_scoreFlow['periodCategory'] == 'twoPoint'),'shotCircle']) / nMatches / 4 / 2 #divided across 4 quarters and 2 teams
+# nShotsPer5 = dataHelper.sumShotCounts(shotCounts, periodCategory = 'twoPoint') / nMatches / 4 / 2 #divided across 4 quarters and 2 teams
 
 # #Loop through the different proportions and calculate goals scored under the two
 # #different scoring rules, considering that missed sampling values for the inside
@@ -719,12 +637,127 @@ superShotProps = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5,
 #Set number of simulations
 nSims = 1000
 
+#Set whether to run the sims with the vectorized engine in the sim helper. This
+#draws the made shots for each sim at once and is fast enough for millions of
+#sims, but gives different random draws to the original shot by shot loops and
+#the made shot counts in place of the lists of shot outcomes. Leave this as False
+#to reproduce the results from the original loops and seeds. Each team gets its
+#own random stream from the seed, so the vectorized sims can be run with
+#nProcesses and give the same results for any number of processes
+#(as with the parsing above, a process pool on Windows requires the call to sit
+#under an if __name__ == '__main__' guard, so leave nProcesses at 1 when running
+#the script cell by cell)
+vectorizedStandardSims = False
+
+#Set whether the vectorized and batched sims stream their results to Parquet files
+#in chunks of streamChunkSize sims while they run, in place of the .csv files. Only
+#about one chunk of results is held in memory while writing, and the competitive
+#sims are run in batches that are written as each batch finishes. As in the online
+#sims, each batch draws from its own random generators unless counterBasedCompSims
+#is set to True, which gives the same sims as without streaming. The summaries read
+#the results back one chunk at a time with simHelper.iterSimResults, and the
+#results are only loaded in whole for the figures. This is used by the standard
+#and competitive sims with the vectorized and batched engines, and the shot by
+#shot sims still write and load the .csv or Feather files
+streamSimResults = False
+streamChunkSize = 100000
+
+#Set whether to store the sim results with typed columns in binary Feather files
+#(see simHelper.getTypedResults), in place of the .csv files. The lists of shot
+#outcomes from the shot by shot sims are stored as made shot counts and bit masks,
+#so the results can be loaded back without parsing the text of each list. This is
+#used by the standard and competitive sims
+typedSimResults = False
+
+#Set whether to run the sims in batches and only keep running summaries of each
+#team and proportion (see simHelper.runStandardSimsOnline), rather than the result
+#of every sim. The memory used then doesn't grow with nSims, so tens of millions of
+#sims can be run. The running summaries are saved to file and the max and min
+#summaries are taken from these, but there is no sim results table for the visuals
+onlineStandardSims = False
+
 #Set a check in place for whether to run the sims or load in existing results
 #Note that the results generated should be the same given the seeds being set
 #throughout. If you wish to generate 'new' results then you can alter the seed
 #values throughout
 runStandardSims = False ##### change to True to re-run sims
 
+#Get alphabetically ordered teams to loop through
+teamList = list(colourDict.keys())
+
+#Set list to store actual team super shot proportions in
+teamSuperProps = list()
+
+#Set dictionary to store the teams shot statistics in
+teamShotStats = {'squadId': [], 'squadNickname': [],
+                 'totalShotsM': [], 'totalShotsSD': [], 'nQuarters': [],
+                 'madeStandard': [], 'missedStandard': [],
+                 'madeSuper': [], 'missedSuper': []}
+
+#Loop through teams and get their shot statistics in the super shot period
+for tt in range(len(teamList)):
+    
+    #Set current squad labels
+    currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[tt])]
+    currSquadName = teamInfo['squadNickname'][teamInfo['squadId'].index(currSquadId)]
+
+    #Get the number of rounds the current team has shots in during the super shot period
+    roundShots = dataHelper.sumShotCounts(shotCounts, keepAxes = ['roundNo'],
+                                          squadId = currSquadId, periodCategory = 'twoPoint')
+    nRounds = shotCounts['roundNo'][np.nonzero(roundShots)[0][-1]]
+    
+    #Extract frequencies for different shots in each round and quarter
+    roundQuarters = {'roundNo': list(range(1,nRounds+1)), 'period': [1,2,3,4]}
+    #Made standard shots
+    madeStandard = dataHelper.sumShotCounts(shotCounts, keepAxes = ['roundNo','period'],
+                                            squadId = currSquadId, periodCategory = 'twoPoint',
+                                            shotType = 'standard', shotOutcome = True,
+                                            **roundQuarters).flatten()
+    #Missed standard shots
+    missedStandard = dataHelper.sumShotCounts(shotCounts, keepAxes = ['roundNo','period'],
+                                              squadId = currSquadId, periodCategory = 'twoPoint',
+                                              shotType = 'standard', shotOutcome = False,
+                                              **roundQuarters).flatten()
+    #Made super shots
+    madeSuper = dataHelper.sumShotCounts(shotCounts, keepAxes = ['roundNo','period'],
+                                         squadId = currSquadId, periodCategory = 'twoPoint',
+                                         shotType = 'super', shotOutcome = True,
+                                         **roundQuarters).flatten()
+    #Missed super shots
+    missedSuper = dataHelper.sumShotCounts(shotCounts, keepAxes = ['roundNo','period'],
+                                           squadId = currSquadId, periodCategory = 'twoPoint',
+                                           shotType = 'super', shotOutcome = False,
+                                           **roundQuarters).flatten()
+    #Total shots
+    #Note that this takes the shots from the first entries of the lists for each
+    #round rather than each round and quarter. This is kept on purpose so that the
+    #baseline sim results can be reproduced
+    totalShots = [madeStandard[rr]+missedStandard[rr]+madeSuper[rr]+missedSuper[rr] for rr in range(nRounds) for qq in range(4)]
+    
+    #Calculate mean and standard deviation for total shots per quarter
+    totalShotsM = np.mean(totalShots)
+    totalShotsSD = np.std(totalShots)
+    
+    #Calculate the current teams actual super shot proportions
+    teamSuperProps.append((np.sum(madeSuper)+np.sum(missedSuper)) / np.sum(totalShots))  
+    
+    #Calculate made and missed shots from the different zones for beta distributions
+    totalMadeStandard = np.sum(madeStandard)
+    totalMissedStandard = np.sum(missedStandard)
+    totalMadeSuper = np.sum(madeSuper)
+    totalMissedSuper = np.sum(missedSuper)
+    
+    #Store the teams shot statistics
+    teamShotStats['squadId'].append(currSquadId)
+    teamShotStats['squadNickname'].append(currSquadName)
+    teamShotStats['totalShotsM'].append(totalShotsM)
+    teamShotStats['totalShotsSD'].append(totalShotsSD)
+    teamShotStats['nQuarters'].append(len(totalShots))
+    teamShotStats['madeStandard'].append(totalMadeStandard)
+    teamShotStats['missedStandard'].append(totalMissedStandard)
+    teamShotStats['madeSuper'].append(totalMadeSuper)
+    teamShotStats['missedSuper'].append(totalMissedSuper)
+
 if runStandardSims:
 
     #Set numpy seed for consistency
@@ -739,410 +772,250 @@ if runStandardSims:
                        'shotOutcomeStandard': [], 'shotOutcomeSuper': [],
                        'superProp': [], 'superPropCat': [], 'totalPts': []}
     
-    #Set list to store actual team super shot proportions in
-    teamSuperProps = list()
-    
-    #Get alphabetically ordered teams to loop through
-    teamList = list(colourDict.keys())
-    
-    #Loop through teams
-    for tt in range(len(teamList)):
-        
-        #Set current squad labels
-        currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[tt])]
-        currSquadName = teamInfo['squadNickname'][teamInfo['squadId'].index(currSquadId)]
-    
-        #Extract a dataframe of shots for the current team during super shot period
-        df_currSquadShots = df_scoreFlow.loc[(df_scoreFlow['squadId'] == currSquadId) &
-                                             (df_scoreFlow['periodCategory'] == 'twoPoint'),]
-        
-        #Loop through rounds, extract frequencies for different shots
-        #Get number of rounds
-        nRounds = max(df_currSquadShots['roundNo'])
-        #Set lists to store data in
-        madeStandard = list()
-        missedStandard = list()
-        madeSuper = list()
-        missedSuper = list()
-        totalShots = list()
-        #Get data from each round
-        for rr in range(nRounds):
-            #Loop through quarters within rounds too
-            for qq in range(0,4):
-                #Made standard shots
-                madeStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                          (df_currSquadShots['period'] == qq+1) & 
-                                                          (df_currSquadShots['scoreName'] == 'goal'),
-                                                          ['roundNo']].count()[0])
-                #Missed standard shots
-                missedStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                            (df_currSquadShots['period'] == qq+1) & 
-                                                            (df_currSquadShots['scoreName'] == 'miss'),
-                                                            ['roundNo']].count()[0])
-                #Made super shots
-                madeSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                       (df_currSquadShots['period'] == qq+1) & 
-                                                       (df_currSquadShots['scoreName'] == '2pt Goal'),
-                                                       ['roundNo']].count()[0])
-                #Missed standard shots
-                missedSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                         (df_currSquadShots['period'] == qq+1) & 
-                                                         (df_currSquadShots['scoreName'] == '2pt Miss'),
-                                                         ['roundNo']].count()[0])
-                #Total shots
-                totalShots.append(madeStandard[rr]+missedStandard[rr]+madeSuper[rr]+missedSuper[rr])
-        
-        #Calculate mean and standard deviation for total shots per quarter
-        totalShotsM = np.mean(totalShots)
-        totalShotsSD = np.std(totalShots)
-        
-        #Calculate the current teams actual super shot proportions
-        teamSuperProps.append((np.sum(madeSuper)+np.sum(missedSuper)) / np.sum(totalShots))  
-        
-        #Create a truncated normal distribution of the total shots mean/SD
-        #Truncate it at 0 so that a team can't get less than no shots
-        #Randomly sample values from the distribution to use in simulations
-        
-        #Sample from truncated normal distribution with mean/SD parameters
-        #We choose to sample between the 95% CI of the mean here. This might
-        #mean shots sometimes go below zero, but we have a check in place to not
-        #analyse these later (although this is unlikely to happen...)
-        lowLim = totalShotsM - (1.96 * (totalShotsSD / math.sqrt(len(totalShots))))
-        uppLim = totalShotsM + (1.96 * (totalShotsSD / math.sqrt(len(totalShots))))
-        nShotVals = stats.truncnorm((lowLim - totalShotsM) / totalShotsSD,
-                                    (uppLim - totalShotsM) / totalShotsSD,
-                                    loc = totalShotsM, scale = totalShotsSD).rvs(nSims)
-        #Round shot values to nearest whole number
-        nShotVals = np.around(nShotVals)
-        
-        #Calculate made and missed shots from the different zones for beta distributions
-        totalMadeStandard = np.sum(madeStandard)
-        totalMissedStandard = np.sum(missedStandard)
-        totalMadeSuper = np.sum(madeSuper)
-        totalMissedSuper = np.sum(missedSuper)
-        
-        #Loop through the different super shot proportions
-        for pp in range(len(superShotProps)):
+    #Run the sims in batches and only keep the running summaries
+    if onlineStandardSims:
+        standardSimSummary = simHelper.runStandardSimsOnline(teamShotStats = teamShotStats,
+                                                             superShotProps = superShotProps,
+                                                             nSims = nSims, seed = 123,
+                                                             nProcesses = nProcesses)
+        simHelper.saveSimSummary(standardSimSummary, '..\\..\\Results\\standardSims\\tables\\standardSimSummary.npz')
+    
+    #Run the sims with the vectorized engine, streaming the results to file
+    elif vectorizedStandardSims and streamSimResults:
+        simHelper.writeSimResults(simHelper.iterStandardSims(teamShotStats = teamShotStats,
+                                                             superShotProps = superShotProps,
+                                                             nSims = nSims, seed = 123,
+                                                             nProcesses = nProcesses),
+                                  '..\\..\\Results\\standardSims\\tables\\superSimResults.parquet',
+                                  chunkSize = streamChunkSize)
+    
+    #Run the sims for all teams at once with the vectorized engine
+    elif vectorizedStandardSims:
+        superSimResults = simHelper.runStandardSims(teamShotStats = teamShotStats,
+                                                    superShotProps = superShotProps,
+                                                    nSims = nSims, seed = 123,
+                                                    nProcesses = nProcesses)
+    
+    #Otherwise run the sims shot by shot for each team
+    else:
+        
+        #Loop through teams
+        for tt in range(len(teamList)):
             
-            #Loop through the simulations
-            for nn in range(nSims):
+            #Get the current teams shot statistics
+            currSquadId = teamShotStats['squadId'][tt]
+            currSquadName = teamShotStats['squadNickname'][tt]
+            totalShotsM = teamShotStats['totalShotsM'][tt]
+            totalShotsSD = teamShotStats['totalShotsSD'][tt]
+            totalMadeStandard = teamShotStats['madeStandard'][tt]
+            totalMissedStandard = teamShotStats['missedStandard'][tt]
+            totalMadeSuper = teamShotStats['madeSuper'][tt]
+            totalMissedSuper = teamShotStats['missedSuper'][tt]
+            
+            #Create a truncated normal distribution of the total shots mean/SD
+            #Truncate it at 0 so that a team can't get less than no shots
+            #Randomly sample values from the distribution to use in simulations
+        
+            #Sample from truncated normal distribution with mean/SD parameters
+            #We choose to sample between the 95% CI of the mean here. This might
+            #mean shots sometimes go below zero, but we have a check in place to not
+            #analyse these later (although this is unlikely to happen...)
+            lowLim = totalShotsM - (1.96 * (totalShotsSD / math.sqrt(teamShotStats['nQuarters'][tt])))
+            uppLim = totalShotsM + (1.96 * (totalShotsSD / math.sqrt(teamShotStats['nQuarters'][tt])))
+            nShotVals = stats.truncnorm((lowLim - totalShotsM) / totalShotsSD,
+                                        (uppLim - totalShotsM) / totalShotsSD,
+                                        loc = totalShotsM, scale = totalShotsSD).rvs(nSims)
+            #Round shot values to nearest whole number
+            nShotVals = np.around(nShotVals)
+        
+            #Loop through the different super shot proportions
+            for pp in range(len(superShotProps)):
+            
+                #Loop through the simulations
+                for nn in range(nSims):
                 
-                #Get the current number of shots for the quarter
-                nShots = int(nShotVals[nn])
+                    #Get the current number of shots for the quarter
+                    nShots = int(nShotVals[nn])
                 
-                #Put a check in place to see if any shots are given to the team
-                #Simply don't run the analysis if there aren't any shots
-                if nShots > 0:
+                    #Put a check in place to see if any shots are given to the team
+                    #Simply don't run the analysis if there aren't any shots
+                    if nShots > 0:
                 
-                    #Set total points counter for current iteration
-                    totalPts = 0
+                        #Set total points counter for current iteration
+                        totalPts = 0
                     
-                    #Get the standard and super shot attempts based on proportion
-                    nSuper = nShots * superShotProps[pp]
-                    #Round to ensure a whole number
-                    nSuper = int(np.around(nSuper))
-                    #Get standard based on difference
-                    nStandard = int(nShots - nSuper)
+                        #Get the standard and super shot attempts based on proportion
+                        nSuper = nShots * superShotProps[pp]
+                        #Round to ensure a whole number
+                        nSuper = int(np.around(nSuper))
+                        #Get standard based on difference
+                        nStandard = int(nShots - nSuper)
                 
-                    #Calculate the actual proportion of the current super shot number
-                    actualProp = nSuper / nShots
+                        #Calculate the actual proportion of the current super shot number
+                        actualProp = nSuper / nShots
                     
-                    #Set super shot category bin
-                    if actualProp <= 0.1:
-                        propCat = '0%-10%'
-                    elif actualProp > 0.1 and actualProp <= 0.2:
-                        propCat = '10%-20%'
-                    elif actualProp > 0.2 and actualProp <= 0.3:
-                        propCat = '20%-30%'
-                    elif actualProp > 0.3 and actualProp <= 0.4:
-                        propCat = '30%-40%'
-                    elif actualProp > 0.4 and actualProp <= 0.5:
-                        propCat = '40%-50%'
-                    elif actualProp > 0.5 and actualProp <= 0.6:
-                        propCat = '50%-60%'
-                    elif actualProp > 0.6 and actualProp <= 0.7:
-                        propCat = '60%-70%'
-                    elif actualProp > 0.7 and actualProp <= 0.8:
-                        propCat = '70%-80%'
-                    elif actualProp > 0.8 and actualProp <= 0.9:
-                        propCat = '80%-90%'
-                    elif actualProp > 0.9:
-                        propCat = '90%-100%'
+                        #Set super shot category bin
+                        if actualProp <= 0.1:
+                            propCat = '0%-10%'
+                        elif actualProp > 0.1 and actualProp <= 0.2:
+                            propCat = '10%-20%'
+                        elif actualProp > 0.2 and actualProp <= 0.3:
+                            propCat = '20%-30%'
+                        elif actualProp > 0.3 and actualProp <= 0.4:
+                            propCat = '30%-40%'
+                        elif actualProp > 0.4 and actualProp <= 0.5:
+                            propCat = '40%-50%'
+                        elif actualProp > 0.5 and actualProp <= 0.6:
+                            propCat = '50%-60%'
+                        elif actualProp > 0.6 and actualProp <= 0.7:
+                            propCat = '60%-70%'
+                        elif actualProp > 0.7 and actualProp <= 0.8:
+                            propCat = '70%-80%'
+                        elif actualProp > 0.8 and actualProp <= 0.9:
+                            propCat = '80%-90%'
+                        elif actualProp > 0.9:
+                            propCat = '90%-100%'
                     
-                    #Set list for storing standard shot outcomes
-                    standardOutcome = []                    
-                    #Loop through standard shots and determine score
-                    if nStandard > 0:
-                        #Sample shot success probability for the shots from beta distribution
-                        shotProb = np.random.beta(totalMadeStandard, totalMissedStandard,
-                                                  size = nStandard)
-                        #Loop through shots            
-                        for ss in range(nStandard):
-                            #Get random number to determine shot success
-                            r = random.random()
-                            #Check shot success and add to total points if successful
-                            if r < shotProb[ss]:
-                                #Add to total points
-                                totalPts = totalPts + 1
-                                #Append shot outcome
-                                standardOutcome.append('made')
-                            else:
-                                #Append shot outcome
-                                standardOutcome.append('miss')
+                        #Set list for storing standard shot outcomes
+                        standardOutcome = []                    
+                        #Loop through standard shots and determine score
+                        if nStandard > 0:
+                            #Sample shot success probability for the shots from beta distribution
+                            shotProb = np.random.beta(totalMadeStandard, totalMissedStandard,
+                                                      size = nStandard)
+                            #Loop through shots            
+                            for ss in range(nStandard):
+                                #Get random number to determine shot success
+                                r = random.random()
+                                #Check shot success and add to total points if successful
+                                if r < shotProb[ss]:
+                                    #Add to total points
+                                    totalPts = totalPts + 1
+                                    #Append shot outcome
+                                    standardOutcome.append('made')
+                                else:
+                                    #Append shot outcome
+                                    standardOutcome.append('miss')
                     
-                    #Set list for storing super shot outcomes
-                    superOutcome = []
-                    #Loop through super shots and determine score
-                    if nSuper > 0:
-                        #Sample shot success probability for the shots from beta distribution
-                        shotProb = np.random.beta(totalMadeSuper, totalMissedSuper,
-                                                  size = nSuper)
-                        #Loop through shots            
-                        for ss in range(0,nSuper):
-                            #Get random number to determine shot success
-                            r = random.random()
-                            #Check shot success and add to total points if successful
-                            if r < shotProb[ss]:
-                                #Add to total points
-                                totalPts = totalPts + 2
-                                #Append shot outcome
-                                superOutcome.append('made')
-                            else:
-                                #Append shot outcome
-                                superOutcome.append('miss')
+                        #Set list for storing super shot outcomes
+                        superOutcome = []
+                        #Loop through super shots and determine score
+                        if nSuper > 0:
+                            #Sample shot success probability for the shots from beta distribution
+                            shotProb = np.random.beta(totalMadeSuper, totalMissedSuper,
+                                                      size = nSuper)
+                            #Loop through shots            
+                            for ss in range(0,nSuper):
+                                #Get random number to determine shot success
+                                r = random.random()
+                                #Check shot success and add to total points if successful
+                                if r < shotProb[ss]:
+                                    #Add to total points
+                                    totalPts = totalPts + 2
+                                    #Append shot outcome
+                                    superOutcome.append('made')
+                                else:
+                                    #Append shot outcome
+                                    superOutcome.append('miss')
                                 
-                    #Store values in dictionary
-                    superSimResults['squadId'].append(currSquadId)
-                    superSimResults['squadNickname'].append(currSquadName)
-                    superSimResults['nShots'].append(nShots)
-                    superSimResults['nStandard'].append(nStandard)
-                    superSimResults['nSuper'].append(nSuper)
-                    superSimResults['superProp'].append(actualProp)
-                    superSimResults['superPropCat'].append(propCat)
-                    superSimResults['totalPts'].append(totalPts)
-                    superSimResults['shotOutcomeStandard'].append(standardOutcome)
-                    superSimResults['shotOutcomeSuper'].append(superOutcome)
-    
-    #Convert sim dictionary to dataframe
-    df_superSimResults = pd.DataFrame.from_dict(superSimResults)
-    
-    #Store the simulation results to file
-    df_superSimResults.to_csv('..\\..\\Results\\standardSims\\tables\\superSimResults.csv',
-                              index = False)
+                        #Store values in dictionary
+                        superSimResults['squadId'].append(currSquadId)
+                        superSimResults['squadNickname'].append(currSquadName)
+                        superSimResults['nShots'].append(nShots)
+                        superSimResults['nStandard'].append(nStandard)
+                        superSimResults['nSuper'].append(nSuper)
+                        superSimResults['superProp'].append(actualProp)
+                        superSimResults['superPropCat'].append(propCat)
+                        superSimResults['totalPts'].append(totalPts)
+                        superSimResults['shotOutcomeStandard'].append(standardOutcome)
+                        superSimResults['shotOutcomeSuper'].append(superOutcome)
+    
+    #There is no sim results table with only the running summaries kept
+    if onlineStandardSims:
+        df_superSimResults = None
+    
+    #The streamed sim results are read back from file when they're needed, rather
+    #than loaded in whole
+    elif vectorizedStandardSims and streamSimResults:
+        df_superSimResults = None
+    
+    else:
+        
+        #Convert sim dictionary to dataframe
+        df_superSimResults = pd.DataFrame.from_dict(superSimResults)
+        
+        #Store the simulation results to file with typed columns
+        if typedSimResults:
+            df_superSimResults = simHelper.getTypedResults(df_superSimResults)
+            df_superSimResults.to_feather('..\\..\\Results\\standardSims\\tables\\superSimResults.feather')
+        
+        #Otherwise store the simulation results as text
+        else:
+            df_superSimResults.to_csv('..\\..\\Results\\standardSims\\tables\\superSimResults.csv',
+                                      index = False)
     
 else:
     
     #Get number of rounds (for later use)
     nRounds = max(df_scoreFlow['roundNo'])
     
-    #Get alphabetically ordered teams to loop through (for later use)
-    teamList = list(colourDict.keys())
-    
-    #Load the sim data from file
-    df_superSimResults = pd.read_csv('..\\..\\Results\\standardSims\\tables\\superSimResults.csv')
+    #Load the sim data from file, or the running summaries if only these were kept
+    if onlineStandardSims:
+        standardSimSummary = simHelper.loadSimSummary('..\\..\\Results\\standardSims\\tables\\standardSimSummary.npz')
+        df_superSimResults = None
+    elif vectorizedStandardSims and streamSimResults:
+        df_superSimResults = None
+    elif typedSimResults:
+        df_superSimResults = pd.read_feather('..\\..\\Results\\standardSims\\tables\\superSimResults.feather')
+    else:
+        df_superSimResults = pd.read_csv('..\\..\\Results\\standardSims\\tables\\superSimResults.csv')
 
 # %% Get 'standard' sims summaries
 
 #Get max and min scores with different proportions
 
-#Get the proportion category names as a list
-propCats = df_superSimResults['superPropCat'].unique()
-
-#Set list to work through of % bins
-perBins = ['0%-10%', '10%-20%', '20%-30%', '30%-40%', '40%-50%',
-           '50%-60%', '60%-70%', '70%-80%', '80%-90%', '90%-100%']
+#Get the proportion category names as a list, reading the streamed sim results
+#one chunk at a time
+if df_superSimResults is not None:
+    propCats = df_superSimResults['superPropCat'].unique()
+elif vectorizedStandardSims and streamSimResults and not onlineStandardSims:
+    propCats = pd.unique(np.concatenate([df_chunk['superPropCat'].unique()
+                                         for df_chunk in simHelper.iterSimResults('..\\..\\Results\\standardSims\\tables\\superSimResults.parquet',
+                                                                                  columns = ['superPropCat'])]))
+else:
+    propCats = None
 
 #Set a check in place for whether to analyse the sims or just load existing data
 analyseStandardSims = False ##### change to True to re-analyse sims
 
+#Set whether to calculate the summaries exactly from each teams score distributions
+#rather than from the sim results. This gives the proportions the sims converge
+#to as the number of sims increases, without any sampling
+exactStandardSummaries = False
+
 if analyseStandardSims:
 
-    #Calculate proportion of results that maximise and minimise score in each 10% bin
+    #Get the proportion of times each bin gives the max and min score from the
+    #running summaries of the sims
+    if onlineStandardSims:
+        summaryMaxSimResults, summaryMinSimResults = standardSimSummary.getMaxMinSummary()
     
-    #Set data dictionary to store max results in to
-    maxSuperSimResults = {'squadNickname': [], 
-                          'score': [], 'nShots': [],
-                          'actualProp': [], 'superPropCat': []}
+    #Get the exact proportion of times each bin gives the max and min score
+    #from the score distributions of each team and proportion
+    elif exactStandardSummaries:
+        summaryMaxSimResults, summaryMinSimResults = simHelper.getStandardSimSummary(teamShotStats = teamShotStats,
+                                                                                     superShotProps = superShotProps)
     
-    #Set data dictionary to store min results in to
-    minSuperSimResults = {'squadNickname': [], 
-                          'score': [], 'nShots': [],
-                          'actualProp': [], 'superPropCat': []}
+    #Count the max and min score of each sim from the streamed results, reading
+    #the results back one team at a time
+    elif vectorizedStandardSims and streamSimResults:
+        summaryMaxSimResults, summaryMinSimResults = simHelper.getStreamedMaxMinSummary('..\\..\\Results\\standardSims\\tables\\superSimResults.parquet',
+                                                                                        teamList, superShotProps)
     
-    #Loop through teams
-    for tt in range(0,len(teamList)):
-        
-        #Extract current teams data
-        df_currTeamSims = df_superSimResults.loc[(df_superSimResults['squadNickname'] == teamList[tt]),]
-        
-        #Get the number of simulations ran for the current teams shots
-        nTeamSims = int(len(df_currTeamSims)/len(superShotProps))
-        
-        #Loop through sims and extract the values for each to compare
-        for nn in range(0,nTeamSims):
-            
-            #Get the results for each super shot proportion
-            currShotResults = list()
-            currShotProp = list()
-            currShotNo = list()
-            for pp in range(0,len(superShotProps)):
-                currShotResults.append(df_currTeamSims.iloc[pp*nTeamSims+nn]['totalPts'])
-                currShotProp.append(df_currTeamSims.iloc[pp*nTeamSims+nn]['superProp'])
-                currShotNo.append(df_currTeamSims.iloc[pp*nTeamSims+nn]['nShots'])
-            
-            #Find the index of the maximum and minimum score
-            mx = max(currShotResults)
-            mn = min(currShotResults)
-            mxInd = [ii for ii, jj in enumerate(currShotResults) if jj == mx]
-            mnInd = [ii for ii, jj in enumerate(currShotResults) if jj == mn]
-            #Check and see if there are more than one max, and take the smaller 
-            #super shot proportion --- this assumes 'less risk'
-            if len(mxInd) > 1:
-                #Grab smaller super shot proportion value index
-                for mm in range(0,len(mxInd)):
-                    if mm == 0:
-                        #Just grab the first proportion to compare to the next
-                        currSmallestProp = currShotProp[mxInd[mm]]
-                    else:
-                        #Check to see if the next one is a smaller proportion
-                        if currShotProp[mxInd[mm]] < currSmallestProp:
-                            currSmallestProp = currShotProp[mxInd[mm]]
-                            
-                #Reset the mxInd value
-                mxInd = currShotProp.index(currSmallestProp)
-                
-            else:
-                
-                #Set mxInd to int
-                mxInd = int(mxInd[0])
-    
-            #Check and see if there are more than one min, and take the higher 
-            #super shot proportion --- this assumes 'less risk'
-            if len(mnInd) > 1:
-                #Grab smaller super shot proportion value index
-                for mm in range(0,len(mnInd)):
-                    if mm == 0:
-                        #Just grab the first proportion to compare to the next
-                        currSmallestProp = currShotProp[mnInd[mm]]
-                    else:
-                        #Check to see if the next one is a greater proportion
-                        if currShotProp[mnInd[mm]] > currSmallestProp:
-                            currSmallestProp = currShotProp[mnInd[mm]]
-                            
-                #Reset the mxInd value
-                mnInd = currShotProp.index(currSmallestProp)
-                
-            else:
-                
-                #Set mxInd to int
-                mnInd = int(mnInd[0])         
-            
-            #Set values in data dictionary
-            #Max value
-            maxSuperSimResults['squadNickname'].append(teamList[tt])
-            maxSuperSimResults['score'].append(currShotResults[mxInd])
-            maxSuperSimResults['nShots'].append(currShotNo[mxInd])
-            maxSuperSimResults['actualProp'].append(currShotProp[mxInd])
-            #Min value
-            minSuperSimResults['squadNickname'].append(teamList[tt])
-            minSuperSimResults['score'].append(currShotResults[mnInd])
-            minSuperSimResults['nShots'].append(currShotNo[mnInd])
-            minSuperSimResults['actualProp'].append(currShotProp[mnInd])
-            
-            #Identify which bin the max and min super shot result falls in to, and append
-            #Max value
-            if currShotProp[mxInd] <= 0.1:
-                maxSuperSimResults['superPropCat'].append('0%-10%')
-            elif currShotProp[mxInd] > 0.1 and currShotProp[mxInd] <= 0.2:
-                maxSuperSimResults['superPropCat'].append('10%-20%')
-            elif currShotProp[mxInd] > 0.2 and currShotProp[mxInd] <= 0.3:
-                maxSuperSimResults['superPropCat'].append('20%-30%')
-            elif currShotProp[mxInd] > 0.3 and currShotProp[mxInd] <= 0.4:
-                maxSuperSimResults['superPropCat'].append('30%-40%')
-            elif currShotProp[mxInd] > 0.4 and currShotProp[mxInd] <= 0.5:
-                maxSuperSimResults['superPropCat'].append('40%-50%')
-            elif currShotProp[mxInd] > 0.5 and currShotProp[mxInd] <= 0.6:
-                maxSuperSimResults['superPropCat'].append('50%-60%')
-            elif currShotProp[mxInd] > 0.6 and currShotProp[mxInd] <= 0.7:
-                maxSuperSimResults['superPropCat'].append('60%-70%')
-            elif currShotProp[mxInd] > 0.7 and currShotProp[mxInd] <= 0.8:
-                maxSuperSimResults['superPropCat'].append('70%-80%')
-            elif currShotProp[mxInd] > 0.8 and currShotProp[mxInd] <= 0.9:
-                maxSuperSimResults['superPropCat'].append('80%-90%')
-            elif currShotProp[mxInd] > 0.9:
-                maxSuperSimResults['superPropCat'].append('90%-100%')
-            #Min value
-            if currShotProp[mnInd] <= 0.1:
-                minSuperSimResults['superPropCat'].append('0%-10%')
-            elif currShotProp[mnInd] > 0.1 and currShotProp[mnInd] <= 0.2:
-                minSuperSimResults['superPropCat'].append('10%-20%')
-            elif currShotProp[mnInd] > 0.2 and currShotProp[mnInd] <= 0.3:
-                minSuperSimResults['superPropCat'].append('20%-30%')
-            elif currShotProp[mnInd] > 0.3 and currShotProp[mnInd] <= 0.4:
-                minSuperSimResults['superPropCat'].append('30%-40%')
-            elif currShotProp[mnInd] > 0.4 and currShotProp[mnInd] <= 0.5:
-                minSuperSimResults['superPropCat'].append('40%-50%')
-            elif currShotProp[mnInd] > 0.5 and currShotProp[mnInd] <= 0.6:
-                minSuperSimResults['superPropCat'].append('50%-60%')
-            elif currShotProp[mnInd] > 0.6 and currShotProp[mnInd] <= 0.7:
-                minSuperSimResults['superPropCat'].append('60%-70%')
-            elif currShotProp[mnInd] > 0.7 and currShotProp[mnInd] <= 0.8:
-                minSuperSimResults['superPropCat'].append('70%-80%')
-            elif currShotProp[mnInd] > 0.8 and currShotProp[mnInd] <= 0.9:
-                minSuperSimResults['superPropCat'].append('80%-90%')
-            elif currShotProp[mnInd] > 0.9:
-                minSuperSimResults['superPropCat'].append('90%-100%')
-    
-    #Convert max sim dictionary to dataframe
-    df_maxSuperSimResults = pd.DataFrame.from_dict(maxSuperSimResults)
-    df_minSuperSimResults = pd.DataFrame.from_dict(minSuperSimResults)
-    
-    #Get counts in each 10% bin for each team and normalise these to the total 
-    #number of sims the team went through
-    
-    #Set dictionary to store data into
-    summaryMaxSimResults = {'squadNickname': [], '0%-10%': [], '10%-20%': [],
-                            '20%-30%': [], '30%-40%': [], '40%-50%': [],
-                            '50%-60%': [], '60%-70%': [], '70%-80%': [],
-                            '80%-90%': [], '90%-100%': [],
-                            'meanShots': [], 'minShots': [], 'maxShots': []}
-    summaryMinSimResults = {'squadNickname': [], '0%-10%': [], '10%-20%': [],
-                            '20%-30%': [], '30%-40%': [], '40%-50%': [],
-                            '50%-60%': [], '60%-70%': [], '70%-80%': [],
-                            '80%-90%': [], '90%-100%': [],
-                            'meanShots': [], 'minShots': [], 'maxShots': []}
-    
-    #Loop through teams
-    for tt in range(0,len(teamList)):
-        
-        #Extract current teams data
-        df_currTeamSims = df_superSimResults.loc[(df_superSimResults['squadNickname'] == teamList[tt]),]
-        
-        #Get the number of simulations ran for the current teams shots
-        nTeamSims = int(len(df_currTeamSims)/len(superShotProps))
-        
-        #Append squadname to dictionary
-        summaryMaxSimResults['squadNickname'].append(teamList[tt])
-        summaryMinSimResults['squadNickname'].append(teamList[tt])
-        
-        #Get current team results for each proportion and set in each dictionary list
-        for pp in range(0,len(perBins)):
-            #Max results
-            summaryMaxSimResults[perBins[pp]].append(len(df_maxSuperSimResults.loc[(df_maxSuperSimResults['squadNickname'] == teamList[tt]) &
-                                                                                   (df_maxSuperSimResults['superPropCat'] == perBins[pp]),]) / nTeamSims)
-            #Min results
-            summaryMinSimResults[perBins[pp]].append(len(df_maxSuperSimResults.loc[(df_minSuperSimResults['squadNickname'] == teamList[tt]) &
-                                                                                   (df_minSuperSimResults['superPropCat'] == perBins[pp]),]) / nTeamSims)
-        
-        #Get the summary of shot statistics for current team
-        #Max results
-        summaryMaxSimResults['meanShots'].append(df_maxSuperSimResults.loc[(df_maxSuperSimResults['squadNickname'] == teamList[tt]),]['nShots'].mean())
-        summaryMaxSimResults['minShots'].append(df_maxSuperSimResults.loc[(df_maxSuperSimResults['squadNickname'] == teamList[tt]),]['nShots'].min())
-        summaryMaxSimResults['maxShots'].append(df_maxSuperSimResults.loc[(df_maxSuperSimResults['squadNickname'] == teamList[tt]),]['nShots'].max())
-        #Min results
-        summaryMinSimResults['meanShots'].append(df_minSuperSimResults.loc[(df_minSuperSimResults['squadNickname'] == teamList[tt]),]['nShots'].mean())
-        summaryMinSimResults['minShots'].append(df_minSuperSimResults.loc[(df_minSuperSimResults['squadNickname'] == teamList[tt]),]['nShots'].min())
-        summaryMinSimResults['maxShots'].append(df_minSuperSimResults.loc[(df_minSuperSimResults['squadNickname'] == teamList[tt]),]['nShots'].max())
+    #Otherwise count the max and min score of each sim from the results
+    else:
+        summaryMaxSimResults, summaryMinSimResults = simHelper.getStandardMaxMinSummary(df_superSimResults, teamList,
+                                                                                        superShotProps)
         
     #Convert summary dictionary to dataframe
     df_summaryMaxSimResults = pd.DataFrame.from_dict(summaryMaxSimResults)  
@@ -1180,7 +1053,17 @@ else:
 #Set a check in place for whether to create standard sim visuals
 visStandardSims = False ##### change to True to re-do visuals
 
-if visStandardSims:
+if visStandardSims and onlineStandardSims:
+    
+    #There are no sim results for the heatmaps with only the running summaries kept
+    print('Visuals not available, as only the running summaries of the sims are kept (see onlineStandardSims).')
+
+elif visStandardSims:
+    
+    #Load the streamed sim results for the heatmaps, with only the columns used
+    if df_superSimResults is None and vectorizedStandardSims and streamSimResults and not onlineStandardSims:
+        df_superSimResults = pd.read_parquet('..\\..\\Results\\standardSims\\tables\\superSimResults.parquet',
+                                             columns = ['squadNickname', 'superPropCat', 'totalPts'])
 
     #Create all teams heatmap using fighelper functions
     figHelper.allTeamsHeatmap(df_superSimResults, teamList, superShotProps,
@@ -1232,28 +1115,53 @@ nSims = 1000
 #values throughout
 runCompSimsMatched = False ##### change to True to re-run sims
 
+#Set whether to run the sims for all match ups at once with the batched engine in
+#the sim helper. This gives the made shot counts in place of the lists of shot
+#outcomes, and different random draws to the original shot by shot sims. The
+#results are the same for any number of processes set in nProcesses
+#(as with the parsing above, a process pool on Windows requires the call to sit
+#under an if __name__ == '__main__' guard, so leave nProcesses at 1 when running
+#the script cell by cell)
+vectorizedCompSimsMatched = False
+
+#Set whether the batched competitive sims use counter based random numbers. Any
+#single sim of a match up can then be regenerated on its own with
+#simHelper.getCompSimReplicates (e.g. to check an odd margin in a figure)
+counterBasedCompSims = False
+
+#Set whether to store the competitive sim results and margins as the counts of
+#each score and margin of each match up in a compressed NumPy (.npz) file (see
+#simHelper.getSimHistograms), rather than a row for each sim in the .csv files.
+#The results loaded back from the counts only have the margins of each sim, which
+#is what the figures and collated summaries use
+histogramCompSims = False
+
+#Calculate made and missed shots for each team for the beta distributions
+#These are taken from the super shot period across each round and quarter
+compShotStats = {'squadNickname': teamList,
+                 'madeStandard': [], 'missedStandard': [],
+                 'madeSuper': [], 'missedSuper': []}
+roundQuarters = {'roundNo': list(range(1,nRounds+1)), 'period': [1,2,3,4]}
+for tt in range(len(teamList)):
+    currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[tt])]
+    compShotStats['madeStandard'].append(dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, periodCategory = 'twoPoint',
+                                                                  shotType = 'standard', shotOutcome = True, **roundQuarters))
+    compShotStats['missedStandard'].append(dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, periodCategory = 'twoPoint',
+                                                                    shotType = 'standard', shotOutcome = False, **roundQuarters))
+    compShotStats['madeSuper'].append(dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, periodCategory = 'twoPoint',
+                                                               shotType = 'super', shotOutcome = True, **roundQuarters))
+    compShotStats['missedSuper'].append(dataHelper.sumShotCounts(shotCounts, squadId = currSquadId, periodCategory = 'twoPoint',
+                                                                 shotType = 'super', shotOutcome = False, **roundQuarters))
+
 if runCompSimsMatched:
 
     #Generate values for the number of shots in power 5 periods across the league
     #This also grabs the proportions of these shots performed by the 'home' team as
     #a means to later allocate the proportion of the total shots to a team in the sims
-    leagueShots = list()
-    #Get data from each round
-    for rr in range(nRounds):
-        #Loop through match number
-        for mm in range(4):
-            
-            #Get home squad ID for identification
-            homeSquadId = matchInfo['homeSquadId'][(mm+1)+(rr*4)-1]
-            
-            #Loop through quarters within rounds too
-            for qq in range(0,4):
-                #Shot attempt count for current quarter and round
-                leagueShots.append(df_scoreFlow.loc[(df_scoreFlow['roundNo'] == rr+1) & 
-                                                    (df_scoreFlow['matchNo'] == mm+1) &
-                                                    (df_scoreFlow['period'] == qq+1) & 
-                                                    (df_scoreFlow['periodCategory'] == 'twoPoint'),
-                                                    ['roundNo']].count()[0])
+    #Shot attempt count for each quarter of each match
+    leagueShots = dataHelper.sumShotCounts(shotCounts, keepAxes = ['roundNo','matchNo','period'],
+                                           roundNo = list(range(1,nRounds+1)), matchNo = [1,2,3,4],
+                                           period = [1,2,3,4], periodCategory = 'twoPoint').flatten()
                    
     #Calculate mean for league shots per power 5
     leagueShotsM = np.mean(leagueShots)
@@ -1265,330 +1173,134 @@ if runCompSimsMatched:
     teamShotsA = np.array([leagueShotsN/2] * nSims, dtype = int)
     teamShotsB = np.array([leagueShotsN/2] * nSims, dtype = int)
     
-    #Set a dictionary to store simulation results in
-    compSimResultsMatched = {'teamName': [], 'teamSuperProp': [],
-                              'teamShots': [], 'teamSuperShots': [], 'teamStandardShots': [],
-                              'teamShotOutcomeStandard': [], 'teamShotOutcomeSuper': [],
-                              'opponentName': [], 'opponentSuperProp': [],
-                              'opponentShots': [], 'opponentSuperShots': [], 'opponentStandardShots': [],
-                              'opponentShotOutcomeStandard': [], 'opponentShotOutcomeSuper': [],
-                              'teamScore': [], 'opponentScore': [], 'margin': []}
-    
     #Set proportions to compare teams against. In these sims we'll go with 0%, 33%,
     #50%, 66% and 100% to separate with a bit more distinction & given 6 shots are offerred
     compPropsMatched = np.array([0.0,1/3,1/2,2/3,1.0])
     
-    #Loop through teams and run 'competitive' power 5 period sims
-    for tt in range(len(teamList)):
-        
-        #Set seed to same for each team
-        np.random.seed(999)
-        random.seed(999)
-        
-        #Set current squad labels
-        currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[tt])]
-        
-        #Calculate standard and super shot statistics for the current team
-        
-        #Extract a dataframe of shots for the current team during super shot period
-        df_currSquadShots = df_scoreFlow.loc[(df_scoreFlow['squadId'] == currSquadId) &
-                                             (df_scoreFlow['periodCategory'] == 'twoPoint'),]
-        
-        #Loop through rounds, extract frequencies for different shots
-        #Set lists to store data in
-        madeStandard = list()
-        missedStandard = list()
-        madeSuper = list()
-        missedSuper = list()
-        #Get data from each round
-        for rr in range(nRounds):
-            #Loop through quarters within rounds too
-            for qq in range(4):
-                #Made standard shots
-                madeStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                          (df_currSquadShots['period'] == qq+1) & 
-                                                          (df_currSquadShots['scoreName'] == 'goal'),
-                                                          ['roundNo']].count()[0])
-                #Missed standard shots
-                missedStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                            (df_currSquadShots['period'] == qq+1) & 
-                                                            (df_currSquadShots['scoreName'] == 'miss'),
-                                                            ['roundNo']].count()[0])
-                #Made super shots
-                madeSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                       (df_currSquadShots['period'] == qq+1) & 
-                                                       (df_currSquadShots['scoreName'] == '2pt Goal'),
-                                                       ['roundNo']].count()[0])
-                #Missed standard shots
-                missedSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                         (df_currSquadShots['period'] == qq+1) & 
-                                                         (df_currSquadShots['scoreName'] == '2pt Miss'),
-                                                         ['roundNo']].count()[0])
-    
-        
-        #Calculate made and missed shots from the different zones for beta distributions
-        totalMadeStandard = np.sum(madeStandard)
-        totalMissedStandard = np.sum(missedStandard)
-        totalMadeSuper = np.sum(madeSuper)
-        totalMissedSuper = np.sum(missedSuper)
-        
-        #Calculate the current teams score for different super shot proportions
-        #using the team A number of shots
-        
-        #Set variable for total score and shots
-        teamScore = list()
-        teamShots = list()
-        teamSuperShots = list()
-        teamStandardShots = list()
-        teamSuperProp = list()
-        teamStandardOutcomes = list()
-        teamSuperOutcomes = list()
-        
-        #Loop through the proportions
-        for pp in range(len(compPropsMatched)):
-            
-            #Loop through the number of simulations
-            for nn in range(nSims):
-                
-                #Set standard and super shot proportions
-                superProp = compPropsMatched[pp]
-                standardProp = 1 - superProp
-                
-                #Calculate number of standard and super shots to 'take'
-                superShots = np.around(teamShotsA[nn] * superProp)
-                standardShots = teamShotsA[nn] - superShots
-                
-                #Set variable to tally current score
-                currTeamScore = 0
-                
-                #Set list to store standard shot outcomes in
-                standardOutcomes = []
-                #Loop through standard shots and add to total
-                if standardShots > 0:
-                    #Sample shot success probability from teams data
-                    shotProb = np.random.beta(totalMadeStandard, totalMissedStandard,
-                                              size = int(standardShots))
-                    #Loop through shots
-                    for ss in range(int(standardShots)):
-                        #Get random number to determine shot success
-                        r = random.random()
-                        #Check shot success and add to total points if successful
-                        if r < shotProb[ss]:
-                            #Add to team score
-                            currTeamScore = currTeamScore + 1
-                            #Append outcome to list
-                            standardOutcomes.append('made')
-                        else:
-                            #Append outcome to list
-                            standardOutcomes.append('miss')
-                            
-                #Set list to store standard shot outcomes in
-                superOutcomes = []
-                #Loop through super shots and add to total
-                if superShots > 0:
-                    #Sample shot success probability from teams data
-                    shotProb = np.random.beta(totalMadeSuper, totalMissedSuper,
-                                              size = int(superShots))
-                    #Loop through shots
-                    for ss in range(0,int(superShots)):
-                        #Get random number to determine shot success
-                        r = random.random()
-                        #Check shot success and add to total points if successful
-                        if r < shotProb[ss]:
-                            #Add to team score
-                            currTeamScore = currTeamScore + 2
-                            #Append outcome to list
-                            superOutcomes.append('made')
-                        else:
-                            #Append outcome to list
-                            superOutcomes.append('miss')
-                            
-                            
-                #Append data to team list
-                teamScore.append(currTeamScore)
-                teamShots.append(teamShotsA[nn])
-                teamSuperShots.append(superShots)
-                teamStandardShots.append(standardShots)
-                teamSuperProp.append(compPropsMatched[pp])
-                teamStandardOutcomes.append(standardOutcomes)
-                teamSuperOutcomes.append(superOutcomes)
+    #Run the sims in batches with the batched engine and stream the results to
+    #file as each batch finishes, unless they're stored as counts. The results
+    #are read back from file when they're needed
+    if vectorizedCompSimsMatched and streamSimResults and not histogramCompSims:
+        simHelper.writeSimResults(simHelper.iterCompSims(teamShotStats = compShotStats, compProps = compPropsMatched,
+                                                         teamShotsA = teamShotsA, teamShotsB = teamShotsB,
+                                                         seed = 999, nProcesses = nProcesses,
+                                                         counterBased = counterBasedCompSims),
+                                  '..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.parquet',
+                                  chunkSize = streamChunkSize)
+        df_compSimResultsMatched = None
+    
+    #Run the sims for all match ups at once with the batched engine
+    elif vectorizedCompSimsMatched:
+        compSimResultsMatched = simHelper.runCompSims(teamShotStats = compShotStats, compProps = compPropsMatched,
+                                                      teamShotsA = teamShotsA, teamShotsB = teamShotsB,
+                                                      seed = 999, nProcesses = nProcesses,
+                                                      counterBased = counterBasedCompSims)
+        
+        #Convert 'competitive' sim results to dataframe
+        df_compSimResultsMatched = compSimResultsMatched.toDataFrame()
+    
+    #Otherwise run the sims shot by shot for each team
+    else:
+        
+        #Set a dictionary to store simulation results in
+        compSimResultsMatched = {'teamName': [], 'teamSuperProp': [],
+                                  'teamShots': [], 'teamSuperShots': [], 'teamStandardShots': [],
+                                  'teamShotOutcomeStandard': [], 'teamShotOutcomeSuper': [],
+                                  'opponentName': [], 'opponentSuperProp': [],
+                                  'opponentShots': [], 'opponentSuperShots': [], 'opponentStandardShots': [],
+                                  'opponentShotOutcomeStandard': [], 'opponentShotOutcomeSuper': [],
+                                  'teamScore': [], 'opponentScore': [], 'margin': []}
+    
+        #Set a cache to store each teams simulated scores in, so that each team is
+        #only simulated once for each number of shots and seed rather than for each
+        #match up
+        compScoreCache = dict()
+    
+        #Loop through teams and run 'competitive' power 5 period sims
+        for tt in range(len(teamList)):
+        
+            #Get the current teams score for different super shot proportions
+            #using the team A number of shots. The seed is the same for each team
+            teamScores = simHelper.getCachedTeamScores(scoreCache = compScoreCache, teamShotStats = compShotStats,
+                                                       teamInd = tt, compProps = compPropsMatched, teamShots = teamShotsA,
+                                                       shotModel = 'matchedTeamA', seed = 999)
+            teamScore = teamScores['score']
+            teamShots = teamScores['shots']
+            teamSuperShots = teamScores['superShots']
+            teamStandardShots = teamScores['standardShots']
+            teamSuperProp = teamScores['superProp']
+            teamStandardOutcomes = teamScores['standardOutcomes']
+            teamSuperOutcomes = teamScores['superOutcomes']
                         
-        #Loop through opponents
-        for cc in range(tt+1,len(teamList)):
-            
-            #Set seed to same for each opponent
-            np.random.seed(12345)
-            random.seed(12345)
-            
-            #Set current squad labels
-            currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[cc])]
-            
-            #Calculate standard and super shot statistics for the current opponent
-            
-            #Extract a dataframe of shots for the current team during super shot period
-            df_currSquadShots = df_scoreFlow.loc[(df_scoreFlow['squadId'] == currSquadId) &
-                                                 (df_scoreFlow['periodCategory'] == 'twoPoint'),]
+            #Loop through opponents
+            for cc in range(tt+1,len(teamList)):
             
-            #Loop through rounds, extract frequencies for different shots
-            #Set lists to store data in
-            madeStandard = list()
-            missedStandard = list()
-            madeSuper = list()
-            missedSuper = list()
-            #Get data from each round
-            for rr in range(nRounds):
-                #Loop through quarters within rounds too
-                for qq in range(4):
-                    #Made standard shots
-                    madeStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                              (df_currSquadShots['period'] == qq+1) & 
-                                                              (df_currSquadShots['scoreName'] == 'goal'),
-                                                              ['roundNo']].count()[0])
-                    #Missed standard shots
-                    missedStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                                (df_currSquadShots['period'] == qq+1) & 
-                                                                (df_currSquadShots['scoreName'] == 'miss'),
-                                                                ['roundNo']].count()[0])
-                    #Made super shots
-                    madeSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                           (df_currSquadShots['period'] == qq+1) & 
-                                                           (df_currSquadShots['scoreName'] == '2pt Goal'),
-                                                           ['roundNo']].count()[0])
-                    #Missed standard shots
-                    missedSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                             (df_currSquadShots['period'] == qq+1) & 
-                                                             (df_currSquadShots['scoreName'] == '2pt Miss'),
-                                                             ['roundNo']].count()[0])
-        
-            
-            #Calculate made and missed shots from the different zones for beta distributions
-            totalMadeStandard = np.sum(madeStandard)
-            totalMissedStandard = np.sum(missedStandard)
-            totalMadeSuper = np.sum(madeSuper)
-            totalMissedSuper = np.sum(missedSuper)
-            
-            #Calculate the opponents score for different super shot proportions
-            #using the team B number of shots
+                #Get the opponents score for different super shot proportions using
+                #the team B number of shots. The seed is the same for each opponent
+                oppScores = simHelper.getCachedTeamScores(scoreCache = compScoreCache, teamShotStats = compShotStats,
+                                                          teamInd = cc, compProps = compPropsMatched, teamShots = teamShotsB,
+                                                          shotModel = 'matchedTeamB', seed = 12345)
             
-            #Loop through the proportions
-            for pp in range(len(compPropsMatched)):
+                #Loop through the proportions
+                for pp in range(len(compPropsMatched)):
                 
-                #Set variable for total score and shots
-                oppScore = list()
-                oppShots = list()
-                oppSuperShots = list()
-                oppStandardShots = list()
-                oppSuperProp = list()
-                oppStandardOutcomes = list()
-                oppSuperOutcomes = list()
-                
-                #Loop through the number of simulations
-                for nn in range(nSims):
-                    
-                    #Set standard and super shot proportions
-                    superProp = compPropsMatched[pp]
-                    standardProp = 1 - superProp
-                    
-                    #Calculate number of standard and super shots to 'take'
-                    superShots = np.around(teamShotsB[nn] * superProp)
-                    standardShots = teamShotsB[nn] - superShots
-                    
-                    #Set variable to tally current score
-                    currOppScore = 0
-                    
-                    #Set list to store standard shot outcomes in
-                    standardOutcomes = []                    
-                    #Loop through standard shots and add to total
-                    if standardShots > 0:
-                        #Sample shot success probability from teams data
-                        shotProb = np.random.beta(totalMadeStandard, totalMissedStandard,
-                                                  size = int(standardShots))
-                        #Loop through shots
-                        for ss in range(0,int(standardShots)):
-                            #Get random number to determine shot success
-                            r = random.random()
-                            #Check shot success and add to total points if successful
-                            if r < shotProb[ss]:
-                                #Add to opp score
-                                currOppScore = currOppScore + 1
-                                #Append outcome to list
-                                standardOutcomes.append('made')
-                            else:
-                                #Append outcome to list
-                                standardOutcomes.append('miss')
-                    
-                    #Set list to store standard shot outcomes in
-                    superOutcomes = []
-                    #Loop through super shots and add to total
-                    if superShots > 0:
-                        #Sample shot success probability from teams data
-                        shotProb = np.random.beta(totalMadeSuper, totalMissedSuper,
-                                                  size = int(superShots))
-                        #Loop through shots
-                        for ss in range(0,int(superShots)):
-                            #Get random number to determine shot success
-                            r = random.random()
-                            #Check shot success and add to total points if successful
-                            if r < shotProb[ss]:
-                                #Add to opp score
-                                currOppScore = currOppScore + 2
-                                #Append outcome to list
-                                superOutcomes.append('made')
-                            else:
-                                #Append outcome to list
-                                superOutcomes.append('miss')
-                                
-                    #Append data to team list
-                    oppScore.append(currOppScore)
-                    oppShots.append(teamShotsB[nn])
-                    oppSuperShots.append(superShots)
-                    oppStandardShots.append(standardShots)
-                    oppSuperProp.append(compPropsMatched[pp])
-                    oppStandardOutcomes.append(standardOutcomes)
-                    oppSuperOutcomes.append(superOutcomes)
+                    #Within each proportion we duplicate the opposition results
+                    #so that they can be compared to each of the other teams
+                    #simulated proportions
+                    propSims = slice(pp*nSims, (pp+1)*nSims)
+                    oppScore = oppScores['score'][propSims] * len(compPropsMatched)
+                    oppShots = oppScores['shots'][propSims] * len(compPropsMatched)
+                    oppSuperShots = oppScores['superShots'][propSims] * len(compPropsMatched)
+                    oppStandardShots = oppScores['standardShots'][propSims] * len(compPropsMatched)
+                    oppSuperProp = oppScores['superProp'][propSims] * len(compPropsMatched)
+                    oppStandardOutcomes = oppScores['standardOutcomes'][propSims] * len(compPropsMatched)
+                    oppSuperOutcomes = oppScores['superOutcomes'][propSims] * len(compPropsMatched)
                     
-                #Within each proportion we duplicate the opposition results
-                #so that they can be compared to each of the other teams
-                #simulated proportions
-                oppScore = oppScore * len(compPropsMatched)
-                oppShots = oppShots * len(compPropsMatched)
-                oppSuperShots = oppSuperShots * len(compPropsMatched)
-                oppStandardShots = oppStandardShots * len(compPropsMatched)
-                oppSuperProp = oppSuperProp * len(compPropsMatched)
-                oppStandardOutcomes = oppStandardOutcomes * len(compPropsMatched)
-                oppSuperOutcomes = oppSuperOutcomes * len(compPropsMatched)
-                    
-                #Calculate margin between current opponent proportion and all team scores
-                #Append to the data dictionary
-                for kk in range(len(teamScore)):
-    
-                    #Main team
-                    compSimResultsMatched['teamName'].append(teamList[tt])
-                    compSimResultsMatched['teamSuperProp'].append(teamSuperProp[kk])
-                    compSimResultsMatched['teamShots'].append(teamShots[kk])
-                    compSimResultsMatched['teamSuperShots'].append(teamSuperShots[kk])
-                    compSimResultsMatched['teamStandardShots'].append(teamStandardShots[kk])
-                    compSimResultsMatched['teamShotOutcomeStandard'].append(teamStandardOutcomes[kk])
-                    compSimResultsMatched['teamShotOutcomeSuper'].append(teamSuperOutcomes[kk])
-                    #Opponent team
-                    compSimResultsMatched['opponentName'].append(teamList[cc])
-                    compSimResultsMatched['opponentSuperProp'].append(oppSuperProp[kk])
-                    compSimResultsMatched['opponentShots'].append(oppShots[kk])
-                    compSimResultsMatched['opponentSuperShots'].append(oppSuperShots[kk])
-                    compSimResultsMatched['opponentStandardShots'].append(oppStandardShots[kk])
-                    compSimResultsMatched['opponentShotOutcomeStandard'].append(oppStandardOutcomes[kk])
-                    compSimResultsMatched['opponentShotOutcomeSuper'].append(oppSuperOutcomes[kk])
-                    #Scoring
-                    compSimResultsMatched['teamScore'].append(teamScore[kk])
-                    compSimResultsMatched['opponentScore'].append(oppScore[kk])
-                    compSimResultsMatched['margin'].append(teamScore[kk] - oppScore[kk])
-    
-    #Convert 'competitive' sim results to dataframe
-    df_compSimResultsMatched = pd.DataFrame.from_dict(compSimResultsMatched)
-    
-    #Write competitive sim results to file
-    df_compSimResultsMatched.to_csv('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.csv',
-                             index = False)
+                    #Calculate margin between current opponent proportion and all team scores
+                    #Append to the data dictionary
+                    for kk in range(len(teamScore)):
+    
+                        #Main team
+                        compSimResultsMatched['teamName'].append(teamList[tt])
+                        compSimResultsMatched['teamSuperProp'].append(teamSuperProp[kk])
+                        compSimResultsMatched['teamShots'].append(teamShots[kk])
+                        compSimResultsMatched['teamSuperShots'].append(teamSuperShots[kk])
+                        compSimResultsMatched['teamStandardShots'].append(teamStandardShots[kk])
+                        compSimResultsMatched['teamShotOutcomeStandard'].append(teamStandardOutcomes[kk])
+                        compSimResultsMatched['teamShotOutcomeSuper'].append(teamSuperOutcomes[kk])
+                        #Opponent team
+                        compSimResultsMatched['opponentName'].append(teamList[cc])
+                        compSimResultsMatched['opponentSuperProp'].append(oppSuperProp[kk])
+                        compSimResultsMatched['opponentShots'].append(oppShots[kk])
+                        compSimResultsMatched['opponentSuperShots'].append(oppSuperShots[kk])
+                        compSimResultsMatched['opponentStandardShots'].append(oppStandardShots[kk])
+                        compSimResultsMatched['opponentShotOutcomeStandard'].append(oppStandardOutcomes[kk])
+                        compSimResultsMatched['opponentShotOutcomeSuper'].append(oppSuperOutcomes[kk])
+                        #Scoring
+                        compSimResultsMatched['teamScore'].append(teamScore[kk])
+                        compSimResultsMatched['opponentScore'].append(oppScore[kk])
+                        compSimResultsMatched['margin'].append(teamScore[kk] - oppScore[kk])
+        
+        #Convert 'competitive' sim results to dataframe
+        df_compSimResultsMatched = pd.DataFrame.from_dict(compSimResultsMatched)
+    
+    #Replace the lists of shot outcomes with typed made shot counts and masks
+    if typedSimResults and df_compSimResultsMatched is not None:
+        df_compSimResultsMatched = simHelper.getTypedResults(df_compSimResultsMatched)
+    
+    #Store the counts of each score and margin of each match up
+    if histogramCompSims:
+        compSimHistogramsMatched = simHelper.getSimHistograms(df_compSimResultsMatched, teamList, compPropsMatched)
+        simHelper.saveSimHistograms(compSimHistogramsMatched, '..\\competitiveSimsMatched\\tables\\compSimHistogramsMatched_all.npz')
+    
+    #Write competitive sim results to file, unless they were streamed to file or
+    #stored as counts
+    if not histogramCompSims and not (vectorizedCompSimsMatched and streamSimResults):
+        if typedSimResults:
+            df_compSimResultsMatched.to_feather('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.feather')
+        else:
+            df_compSimResultsMatched.to_csv('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.csv',
+                                     index = False)
 
 else:
     
@@ -1596,13 +1308,35 @@ else:
     compPropsMatched = np.array([0.0,1/3,0.50,2/3,1.0])
     
     #Load existing data
-    df_compSimResultsMatched = pd.read_csv('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.csv')
+    if histogramCompSims:
+        compSimHistogramsMatched = simHelper.loadSimHistograms('..\\competitiveSimsMatched\\tables\\compSimHistogramsMatched_all.npz')
+        df_compSimResultsMatched = simHelper.getHistogramResults(compSimHistogramsMatched)
+    elif vectorizedCompSimsMatched and streamSimResults:
+        df_compSimResultsMatched = None
+    elif typedSimResults:
+        df_compSimResultsMatched = pd.read_feather('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.feather')
+    else:
+        df_compSimResultsMatched = pd.read_csv('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.csv')
     
 # %% Visualise 'competitive' sims - matched
 
 #Set a check in place for whether to create standard sim visuals
 visCompSimsMatched = True ##### change to True to re-do visuals
 
+#Set whether to get the margins of each team from a view of the results that holds
+#each match up once (see simHelper.MatchupView), rather than building and exporting
+#the margins tables with every result from both sides
+matchupViewCompSims = False
+
+#Set whether to index the results by match up and proportions (see
+#simHelper.SimResultsIndex), so that the figures and collated summaries take each
+#match up as a slice of the results rather than searching all of the results
+indexedCompSims = False
+
+#Load the streamed sim results for the figures and margins, which use every result
+if (visCompSimsMatched or matchupViewCompSims) and df_compSimResultsMatched is None:
+    df_compSimResultsMatched = pd.read_parquet('..\\competitiveSimsMatched\\tables\\compSimResultsMatchedShots_all.parquet')
+
 if visCompSimsMatched:
 
     # Firstly, compare each relevant match up between teams to see how these
@@ -1610,6 +1344,12 @@ if visCompSimsMatched:
     # at each teams match-up against everyone else in total -- which gives an idea
     # of overall strategy for each team.
     
+    #Set the results to plot from, indexed by match up and proportions if needed
+    if indexedCompSims:
+        compSimResultsMatched = simHelper.SimResultsIndex(df_compSimResultsMatched, teamList, compPropsMatched)
+    else:
+        compSimResultsMatched = df_compSimResultsMatched
+    
     #Compare individual teams over each iteration of 'match-ups'
     for tt in range(len(teamList)):
         for cc in range(len(teamList)):
@@ -1622,18 +1362,18 @@ if visCompSimsMatched:
                 team2 = teamList[cc]
                 
                 #Plot figure
-                figHelper.indCompSimVis(df_compSimResultsMatched, team1, team2, compPropsMatched, colourDict,
+                figHelper.indCompSimVis(compSimResultsMatched, team1, team2, compPropsMatched, colourDict,
                                        tt, cc, saveDir = '..\\competitiveSimsMatched\\figures')
     
     #Compare each teams match-ups against all other teams
     for tt in range(len(teamList)):
         
         #Plot figure
-        figHelper.allCompSimVis(df_compSimResultsMatched, teamList[tt], compPropsMatched, colourDict,
+        figHelper.allCompSimVis(compSimResultsMatched, teamList[tt], compPropsMatched, colourDict,
                                 saveDir = '..\\competitiveSimsMatched\\figures')
         
     #Compare grouped results across all teams for super shot proportions
-    figHelper.groupedCompSimVis(df_compSimResultsMatched, compPropsMatched,
+    figHelper.groupedCompSimVis(compSimResultsMatched, compPropsMatched,
                                 saveDir = '..\\competitiveSimsMatched\\figures')
     
     #Visualise 'competitive' sim margins for each team
@@ -1641,112 +1381,41 @@ if visCompSimsMatched:
     #This firstly requires the data to be manipulated into a dataframe with specific
     #variables and columns to suit the seaborn package
     
-    #Create dictionary to append these data to
-    marginDictMatched = {'teamName': [], 'teamSuperProp': [],
-                         'opponentName': [], 'opponentSuperProp': [],
-                         'margin': [],
-                         'teamShots': [], 'teamSuperShots': [], 'teamStandardShots': [],
-                         'teamShootingPer': [], 'teamStandardShootingPer': [], 'teamSuperShootingPer': [],
-                         'opponentShots': [], 'opponentSuperShots': [], 'opponentStandardShots': [],
-                         'opponentShootingPer': [], 'opponentStandardShootingPer': [], 'opponentSuperShootingPer': []}
-    
-    #Loop through teams and extract their margin results and the proportions
-    for tt in range (len(teamList)):
-        
-        #Extract teams data
-        #This is done separately given the need to modify margin
-        df_currTeam1 = df_compSimResultsMatched.loc[(df_compSimResultsMatched['teamName'] == teamList[tt]),]
-        df_currTeam2 = df_compSimResultsMatched.loc[(df_compSimResultsMatched['opponentName'] == teamList[tt]),]
-        df_currTeam1.reset_index(inplace = True)
-        df_currTeam2.reset_index(inplace = True)
-        
-        #Calculate shooting percentage outcomes for each dataframe
-        #Get counts of each made list
-        standardTeam1 = []
-        superTeam1 = []
-        standardTeam2 = []
-        superTeam2 = []
-        standardOpp1 = []
-        superOpp1 = []
-        standardOpp2 = []
-        superOpp2 = []
-        for cc in range(len(df_currTeam1)):
-            standardTeam1.append(df_currTeam1['teamShotOutcomeStandard'][cc].count('made'))
-            superTeam1.append(df_currTeam1['teamShotOutcomeSuper'][cc].count('made'))
-            standardOpp1.append(df_currTeam1['opponentShotOutcomeStandard'][cc].count('made'))
-            superOpp1.append(df_currTeam1['opponentShotOutcomeSuper'][cc].count('made'))
-        for cc in range(len(df_currTeam2)):
-            standardTeam2.append(df_currTeam2['teamShotOutcomeStandard'][cc].count('made'))
-            superTeam2.append(df_currTeam2['teamShotOutcomeSuper'][cc].count('made'))
-            standardOpp2.append(df_currTeam2['opponentShotOutcomeStandard'][cc].count('made'))
-            superOpp2.append(df_currTeam2['opponentShotOutcomeSuper'][cc].count('made'))
-        #Calculate shooting percentages at each simulation
-        standardPerTeam1 = standardTeam1 / df_currTeam1['teamStandardShots']
-        superPerTeam1 = superTeam1 / df_currTeam1['teamSuperShots']
-        allPerTeam1 = [x + y for x, y in zip(standardTeam1, superTeam1)] / df_currTeam1['teamShots']
-        standardPerTeam2 = standardTeam2 / df_currTeam2['teamStandardShots']
-        superPerTeam2 = superTeam2 / df_currTeam2['teamSuperShots']
-        allPerTeam2 = [x + y for x, y in zip(standardTeam2, superTeam2)] / df_currTeam2['teamShots']
-        standardPerOpp1 = standardOpp1 / df_currTeam1['opponentStandardShots']
-        superPerOpp1 = superOpp1 / df_currTeam1['opponentSuperShots']
-        allPerOpp1 = [x + y for x, y in zip(standardOpp1, superOpp1)] / df_currTeam1['opponentShots']
-        standardPerOpp2 = standardOpp2 / df_currTeam2['opponentStandardShots']
-        superPerOpp2 = superOpp2 / df_currTeam2['opponentSuperShots']
-        allPerOpp2 = [x + y for x, y in zip(standardOpp2, superOpp2)] / df_currTeam2['opponentShots']
-        
-        #Add data to dictionary
-        #First dataframe - use normal margin and 'team' data
-        marginDictMatched['teamName'].extend(list(df_currTeam1['teamName'].values))
-        marginDictMatched['teamSuperProp'].extend(list(df_currTeam1['teamSuperProp'].values))
-        marginDictMatched['opponentName'].extend(list(df_currTeam1['opponentName'].values))
-        marginDictMatched['opponentSuperProp'].extend(list(df_currTeam1['opponentSuperProp'].values))
-        marginDictMatched['margin'].extend(list(df_currTeam1['margin'].values))
-        marginDictMatched['teamShots'].extend(list(df_currTeam1['teamShots'].values))
-        marginDictMatched['teamSuperShots'].extend(list(df_currTeam1['teamSuperShots'].values))
-        marginDictMatched['teamStandardShots'].extend(list(df_currTeam1['teamStandardShots'].values))
-        marginDictMatched['teamShootingPer'].extend(allPerTeam1)
-        marginDictMatched['teamStandardShootingPer'].extend(standardPerTeam1)
-        marginDictMatched['teamSuperShootingPer'].extend(superPerTeam1)
-        marginDictMatched['opponentShots'].extend(list(df_currTeam1['opponentShots'].values))
-        marginDictMatched['opponentSuperShots'].extend(list(df_currTeam1['opponentSuperShots'].values))
-        marginDictMatched['opponentStandardShots'].extend(list(df_currTeam1['opponentStandardShots'].values))
-        marginDictMatched['opponentShootingPer'].extend(allPerOpp1)
-        marginDictMatched['opponentStandardShootingPer'].extend(standardPerOpp1)
-        marginDictMatched['opponentSuperShootingPer'].extend(superPerOpp1)
-        #Second dataframe - invert margin and use 'opponent' data
-        marginDictMatched['teamName'].extend(list(df_currTeam2['opponentName'].values))
-        marginDictMatched['teamSuperProp'].extend(list(df_currTeam2['opponentSuperProp'].values))
-        marginDictMatched['opponentName'].extend(list(df_currTeam2['teamName'].values))
-        marginDictMatched['opponentSuperProp'].extend(list(df_currTeam2['teamSuperProp'].values))
-        marginDictMatched['margin'].extend(list(df_currTeam2['margin'].values*-1))
-        marginDictMatched['teamShots'].extend(list(df_currTeam2['opponentShots'].values))
-        marginDictMatched['teamSuperShots'].extend(list(df_currTeam2['opponentSuperShots'].values))
-        marginDictMatched['teamStandardShots'].extend(list(df_currTeam2['opponentStandardShots'].values))
-        marginDictMatched['teamShootingPer'].extend(allPerOpp2)
-        marginDictMatched['teamStandardShootingPer'].extend(standardPerOpp2)
-        marginDictMatched['teamSuperShootingPer'].extend(superPerOpp2)
-        marginDictMatched['opponentShots'].extend(list(df_currTeam2['teamShots'].values))
-        marginDictMatched['opponentSuperShots'].extend(list(df_currTeam2['teamSuperShots'].values))
-        marginDictMatched['opponentStandardShots'].extend(list(df_currTeam2['teamStandardShots'].values))
-        marginDictMatched['opponentShootingPer'].extend(allPerTeam2)
-        marginDictMatched['opponentStandardShootingPer'].extend(standardPerTeam2)
-        marginDictMatched['opponentSuperShootingPer'].extend(superPerTeam2)
-        
-    #Convert to dataframe
-    df_compSimMarginsMatched = pd.DataFrame.from_dict(marginDictMatched)
+    #Get the margins from both sides of each result from the stored counts. The
+    #shots and shooting percentages of each sim aren't kept in the counts
+    if histogramCompSims:
+        df_compSimMarginsMatched = simHelper.getHistogramResults(compSimHistogramsMatched, bothOrientations = True)
     
-    #Export to file
-    df_compSimMarginsMatched.to_csv('..\\competitiveSimsMatched\\tables\\compSimMarginsMatched_all.csv',
-                                    index = False)
+    #Get a view of the margins from both sides of each result
+    elif matchupViewCompSims:
+        compSimMatchupsMatched = simHelper.MatchupView(df_compSimResultsMatched, teamList)
+    
+    #Otherwise get the margins and shooting percentages from each result
+    else:
+        df_compSimMarginsMatched = simHelper.getSimMargins(df_compSimResultsMatched, teamList)
+    
+    #Export to file, unless the results are stored as counts or viewed
+    if not histogramCompSims and not matchupViewCompSims:
+        df_compSimMarginsMatched.to_csv('..\\competitiveSimsMatched\\tables\\compSimMarginsMatched_all.csv',
+                                        index = False)
     
     #Visualise the margins for each team and super shot proportions
-    figHelper.marginCompSimVis(df_compSimMarginsMatched, compPropsMatched, colourDict,
-                               saveDir = '..\\competitiveSimsMatched\\figures')
+    if matchupViewCompSims and not histogramCompSims:
+        figHelper.marginCompSimVis(compSimMatchupsMatched, compPropsMatched, colourDict,
+                                   saveDir = '..\\competitiveSimsMatched\\figures')
+    else:
+        figHelper.marginCompSimVis(df_compSimMarginsMatched, compPropsMatched, colourDict,
+                                   saveDir = '..\\competitiveSimsMatched\\figures')
     
 else:
     
     #Load existing data
-    df_compSimMarginsMatched = pd.read_csv('..\\competitiveSimsMatched\\tables\\compSimMarginsMatched_all.csv')
+    if histogramCompSims:
+        df_compSimMarginsMatched = simHelper.getHistogramResults(compSimHistogramsMatched, bothOrientations = True)
+    elif matchupViewCompSims:
+        compSimMatchupsMatched = simHelper.MatchupView(df_compSimResultsMatched, teamList)
+    else:
+        df_compSimMarginsMatched = pd.read_csv('..\\competitiveSimsMatched\\tables\\compSimMarginsMatched_all.csv')
 
 # %% Run 'competitive' sims - variable shots
 
@@ -1759,47 +1428,62 @@ nSims = 1000
 #values throughout
 runCompSims = False ##### change to True to re-run sims
 
-if runCompSims:
-
-    #Generate values for the number of shots in power 5 periods across the league
-    #This also grabs the proportions of these shots performed by the 'home' team as
-    #a means to later allocate the proportion of the total shots to a team in the sims
-    leagueShots = list()
-    homeShots = list()
-    #Get data from each round
-    for rr in range(nRounds):
-        #Loop through match number
-        for mm in range(4):
-            
-            #Get home squad ID for identification
-            homeSquadId = matchInfo['homeSquadId'][(mm+1)+(rr*4)-1]
+#Set whether to run the sims for all match ups at once with the batched engine in
+#the sim helper. This gives the made shot counts in place of the lists of shot
+#outcomes, and different random draws to the original shot by shot sims. The
+#results are the same for any number of processes set in nProcesses
+#(as with the parsing above, a process pool on Windows requires the call to sit
+#under an if __name__ == '__main__' guard, so leave nProcesses at 1 when running
+#the script cell by cell)
+vectorizedCompSims = False
+
+#Set whether to run the batched sims in batches and only keep running summaries of
+#the margins of each match up (see simHelper.runCompSimsOnline). The memory used
+#then doesn't grow with nSims. Each batch draws from its own random generators, so
+#the results are the same for any number of processes. With counterBasedCompSims
+#set to True the results are instead the same as the batched sims with counter
+#based random numbers, but the draws are much slower and the sims take around two
+#and a half times as long (on one process, around 9 rather than 3.5 seconds for
+#every 100,000 sims of eight teams). The running summaries are saved to file and
+#the collated summaries are taken from these, but there are no sim results or
+#margins tables for the visuals
+onlineCompSims = False
+
+#Generate values for the number of shots in power 5 periods across the league
+#This also grabs the proportions of these shots performed by the 'home' team as
+#a means to later allocate the proportion of the total shots to a team in the sims
+leagueShots = list()
+homeShots = list()
+#Get data from each round
+for rr in range(nRounds):
+    #Loop through match number
+    for mm in range(4):
+        
+        #Get home squad ID for identification
+        homeSquadId = matchInfo['homeSquadId'][(mm+1)+(rr*4)-1]
+        
+        #Shot attempt count for each quarter of the match
+        leagueShots.extend(dataHelper.sumShotCounts(shotCounts, keepAxes = ['period'],
+                                                    roundNo = rr+1, matchNo = mm+1,
+                                                    period = [1,2,3,4], periodCategory = 'twoPoint'))
+        #Home team proportion of these shots
+        homeShots.extend(dataHelper.sumShotCounts(shotCounts, keepAxes = ['period'],
+                                                  roundNo = rr+1, matchNo = mm+1,
+                                                  period = [1,2,3,4], squadId = homeSquadId,
+                                                  periodCategory = 'twoPoint'))
             
-            #Loop through quarters within rounds too
-            for qq in range(0,4):
-                #Shot attempt count for current quarter and round
-                leagueShots.append(df_scoreFlow.loc[(df_scoreFlow['roundNo'] == rr+1) & 
-                                                    (df_scoreFlow['matchNo'] == mm+1) &
-                                                    (df_scoreFlow['period'] == qq+1) & 
-                                                    (df_scoreFlow['periodCategory'] == 'twoPoint'),
-                                                    ['roundNo']].count()[0])
-                #Home team proportion of these shots
-                homeShots.append(df_scoreFlow.loc[(df_scoreFlow['roundNo'] == rr+1) & 
-                                                    (df_scoreFlow['matchNo'] == mm+1) &
-                                                    (df_scoreFlow['period'] == qq+1) & 
-                                                    (df_scoreFlow['squadId'] == homeSquadId) & 
-                                                    (df_scoreFlow['periodCategory'] == 'twoPoint'),
-                                                    ['roundNo']].count()[0])
-                
-    #Calculate home team props
-    leagueProps = np.array(homeShots) / np.array(leagueShots)
-    
-    #Calculate mean and standard deviation for league shots per power 5
-    leagueShotsM = np.mean(leagueShots)
-    leagueShotsSD = np.std(leagueShots)
-    
-    #Calculate mean and standard deviation for league props per power 5
-    leaguePropsM = np.mean(leagueProps)
-    leaguePropsSD = np.std(leagueProps)
+#Calculate home team props
+leagueProps = np.array(homeShots) / np.array(leagueShots)
+
+#Calculate mean and standard deviation for league shots per power 5
+leagueShotsM = np.mean(leagueShots)
+leagueShotsSD = np.std(leagueShots)
+
+#Calculate mean and standard deviation for league props per power 5
+leaguePropsM = np.mean(leagueProps)
+leaguePropsSD = np.std(leagueProps)
+
+if runCompSims:
     
     #Set numpy seeds for consistent sampling from league distribution
     np.random.seed(111)
@@ -1818,351 +1502,194 @@ if runCompSims:
     teamShotsA = np.around(leagueShotVals * leaguePropVals)
     teamShotsB = np.around(leagueShotVals * (1-leaguePropVals))
     
-    #Set a dictionary to store simulation results in
-    compSimResults = {'teamName': [], 'teamSuperProp': [],
-                      'teamShots': [], 'teamSuperShots': [], 'teamStandardShots': [],
-                      'teamShotOutcomeStandard': [], 'teamShotOutcomeSuper': [],
-                      'opponentName': [], 'opponentSuperProp': [],
-                      'opponentShots': [], 'opponentSuperShots': [], 'opponentStandardShots': [],
-                      'opponentShotOutcomeStandard': [], 'opponentShotOutcomeSuper': [],
-                      'teamScore': [], 'opponentScore': [], 'margin': []}
-    
     #Set proportions to compare teams against. In these sims we'll go with 0%, 25%,
     #50%, 75% and 100% to separate with a bit more distinction
     compProps = np.array([0.0,0.25,0.50,0.75,1.0])
     
-    #Loop through teams and run 'competitive' power 5 period sims
-    for tt in range(len(teamList)):
-        
-        #Set seed to same for each team
-        np.random.seed(999)
-        random.seed(999)
-        
-        #Set current squad labels
-        currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[tt])]
-        
-        #Calculate standard and super shot statistics for the current team
-        
-        #Extract a dataframe of shots for the current team during super shot period
-        df_currSquadShots = df_scoreFlow.loc[(df_scoreFlow['squadId'] == currSquadId) &
-                                             (df_scoreFlow['periodCategory'] == 'twoPoint'),]
-        
-        #Loop through rounds, extract frequencies for different shots
-        #Set lists to store data in
-        madeStandard = list()
-        missedStandard = list()
-        madeSuper = list()
-        missedSuper = list()
-        #Get data from each round
-        for rr in range(nRounds):
-            #Loop through quarters within rounds too
-            for qq in range(4):
-                #Made standard shots
-                madeStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                          (df_currSquadShots['period'] == qq+1) & 
-                                                          (df_currSquadShots['scoreName'] == 'goal'),
-                                                          ['roundNo']].count()[0])
-                #Missed standard shots
-                missedStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                            (df_currSquadShots['period'] == qq+1) & 
-                                                            (df_currSquadShots['scoreName'] == 'miss'),
-                                                            ['roundNo']].count()[0])
-                #Made super shots
-                madeSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                       (df_currSquadShots['period'] == qq+1) & 
-                                                       (df_currSquadShots['scoreName'] == '2pt Goal'),
-                                                       ['roundNo']].count()[0])
-                #Missed standard shots
-                missedSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                         (df_currSquadShots['period'] == qq+1) & 
-                                                         (df_currSquadShots['scoreName'] == '2pt Miss'),
-                                                         ['roundNo']].count()[0])
-    
-        
-        #Calculate made and missed shots from the different zones for beta distributions
-        totalMadeStandard = np.sum(madeStandard)
-        totalMissedStandard = np.sum(missedStandard)
-        totalMadeSuper = np.sum(madeSuper)
-        totalMissedSuper = np.sum(missedSuper)
-        
-        #Calculate the current teams score for different super shot proportions
-        #using the team A number of shots
-        
-        #Set variable for total score and shots
-        teamScore = list()
-        teamShots = list()
-        teamSuperShots = list()
-        teamStandardShots = list()
-        teamSuperProp = list()
-        teamStandardOutcomes = list()
-        teamSuperOutcomes = list()
-        
-        #Loop through the proportions
-        for pp in range(len(compProps)):
-            
-            #Loop through the number of simulations
-            for nn in range(nSims):
-                
-                #Set standard and super shot proportions
-                superProp = compProps[pp]
-                standardProp = 1 - superProp
-                
-                #Calculate number of standard and super shots to 'take'
-                superShots = np.around(teamShotsA[nn] * superProp)
-                standardShots = teamShotsA[nn] - superShots
-                
-                #Set variable to tally current score
-                currTeamScore = 0
-                
-                #Set list to store standard shot outcomes in
-                standardOutcomes = []
-                #Loop through standard shots and add to total
-                if standardShots > 0:
-                    #Sample shot success probability from teams data
-                    shotProb = np.random.beta(totalMadeStandard, totalMissedStandard,
-                                              size = int(standardShots))
-                    #Loop through shots
-                    for ss in range(int(standardShots)):
-                        #Get random number to determine shot success
-                        r = random.random()
-                        #Check shot success and add to total points if successful
-                        if r < shotProb[ss]:
-                            #Add to team score
-                            currTeamScore = currTeamScore + 1
-                            #Append outcome to list
-                            standardOutcomes.append('made')
-                        else:
-                            #Append outcome to list
-                            standardOutcomes.append('miss')
-                            
-                #Set list to store standard shot outcomes in
-                superOutcomes = []
-                #Loop through super shots and add to total
-                if superShots > 0:
-                    #Sample shot success probability from teams data
-                    shotProb = np.random.beta(totalMadeSuper, totalMissedSuper,
-                                              size = int(superShots))
-                    #Loop through shots
-                    for ss in range(0,int(superShots)):
-                        #Get random number to determine shot success
-                        r = random.random()
-                        #Check shot success and add to total points if successful
-                        if r < shotProb[ss]:
-                            #Add to team score
-                            currTeamScore = currTeamScore + 2
-                            #Append outcome to list
-                            superOutcomes.append('made')
-                        else:
-                            #Append outcome to list
-                            superOutcomes.append('miss')
-                            
-                            
-                #Append data to team list
-                teamScore.append(currTeamScore)
-                teamShots.append(teamShotsA[nn])
-                teamSuperShots.append(superShots)
-                teamStandardShots.append(standardShots)
-                teamSuperProp.append(compProps[pp])
-                teamStandardOutcomes.append(standardOutcomes)
-                teamSuperOutcomes.append(superOutcomes)
+    #Run the sims in batches and only keep the running summaries of the margins
+    if onlineCompSims:
+        compSimSummary = simHelper.runCompSimsOnline(teamShotStats = compShotStats, compProps = compProps,
+                                                     teamShotsA = teamShotsA, teamShotsB = teamShotsB,
+                                                     seed = 999, nProcesses = nProcesses,
+                                                     counterBased = counterBasedCompSims)
+        simHelper.saveSimSummary(compSimSummary, '..\\competitiveSims\\tables\\compSimSummary_all.npz')
+        
+        #There is no sim results table with only the running summaries kept
+        df_compSimResults = None
+    
+    #Run the sims in batches with the batched engine and stream the results to
+    #file as each batch finishes, unless they're stored as counts. The results
+    #are read back from file when they're needed
+    elif vectorizedCompSims and streamSimResults and not histogramCompSims:
+        simHelper.writeSimResults(simHelper.iterCompSims(teamShotStats = compShotStats, compProps = compProps,
+                                                         teamShotsA = teamShotsA, teamShotsB = teamShotsB,
+                                                         seed = 999, nProcesses = nProcesses,
+                                                         counterBased = counterBasedCompSims),
+                                  '..\\competitiveSims\\tables\\compSimResults_all.parquet',
+                                  chunkSize = streamChunkSize)
+        df_compSimResults = None
+    
+    #Run the sims for all match ups at once with the batched engine
+    elif vectorizedCompSims:
+        compSimResults = simHelper.runCompSims(teamShotStats = compShotStats, compProps = compProps,
+                                               teamShotsA = teamShotsA, teamShotsB = teamShotsB,
+                                               seed = 999, nProcesses = nProcesses,
+                                               counterBased = counterBasedCompSims)
+        
+        #Convert 'competitive' sim results to dataframe
+        df_compSimResults = compSimResults.toDataFrame()
+    
+    #Otherwise run the sims shot by shot for each team
+    else:
+        
+        #Set a dictionary to store simulation results in
+        compSimResults = {'teamName': [], 'teamSuperProp': [],
+                          'teamShots': [], 'teamSuperShots': [], 'teamStandardShots': [],
+                          'teamShotOutcomeStandard': [], 'teamShotOutcomeSuper': [],
+                          'opponentName': [], 'opponentSuperProp': [],
+                          'opponentShots': [], 'opponentSuperShots': [], 'opponentStandardShots': [],
+                          'opponentShotOutcomeStandard': [], 'opponentShotOutcomeSuper': [],
+                          'teamScore': [], 'opponentScore': [], 'margin': []}
+    
+        #Set a cache to store each teams simulated scores in, so that each team is
+        #only simulated once for each number of shots and seed rather than for each
+        #match up
+        compScoreCache = dict()
+    
+        #Loop through teams and run 'competitive' power 5 period sims
+        for tt in range(len(teamList)):
+        
+            #Get the current teams score for different super shot proportions
+            #using the team A number of shots. The seed is the same for each team
+            teamScores = simHelper.getCachedTeamScores(scoreCache = compScoreCache, teamShotStats = compShotStats,
+                                                       teamInd = tt, compProps = compProps, teamShots = teamShotsA,
+                                                       shotModel = 'variableTeamA', seed = 999)
+            teamScore = teamScores['score']
+            teamShots = teamScores['shots']
+            teamSuperShots = teamScores['superShots']
+            teamStandardShots = teamScores['standardShots']
+            teamSuperProp = teamScores['superProp']
+            teamStandardOutcomes = teamScores['standardOutcomes']
+            teamSuperOutcomes = teamScores['superOutcomes']
                         
-        #Loop through opponents
-        for cc in range(tt+1,len(teamList)):
+            #Loop through opponents
+            for cc in range(tt+1,len(teamList)):
             
-            #Set seed to same for each opponent
-            np.random.seed(12345)
-            random.seed(12345)
+                #Get the opponents score for different super shot proportions using
+                #the team B number of shots. The seed is the same for each opponent
+                oppScores = simHelper.getCachedTeamScores(scoreCache = compScoreCache, teamShotStats = compShotStats,
+                                                          teamInd = cc, compProps = compProps, teamShots = teamShotsB,
+                                                          shotModel = 'variableTeamB', seed = 12345)
             
-            #Set current squad labels
-            currSquadId = teamInfo['squadId'][teamInfo['squadNickname'].index(teamList[cc])]
-            
-            #Calculate standard and super shot statistics for the current opponent
-            
-            #Extract a dataframe of shots for the current team during super shot period
-            df_currSquadShots = df_scoreFlow.loc[(df_scoreFlow['squadId'] == currSquadId) &
-                                                 (df_scoreFlow['periodCategory'] == 'twoPoint'),]
-            
-            #Loop through rounds, extract frequencies for different shots
-            #Set lists to store data in
-            madeStandard = list()
-            missedStandard = list()
-            madeSuper = list()
-            missedSuper = list()
-            #Get data from each round
-            for rr in range(nRounds):
-                #Loop through quarters within rounds too
-                for qq in range(4):
-                    #Made standard shots
-                    madeStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                              (df_currSquadShots['period'] == qq+1) & 
-                                                              (df_currSquadShots['scoreName'] == 'goal'),
-                                                              ['roundNo']].count()[0])
-                    #Missed standard shots
-                    missedStandard.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                                (df_currSquadShots['period'] == qq+1) & 
-                                                                (df_currSquadShots['scoreName'] == 'miss'),
-                                                                ['roundNo']].count()[0])
-                    #Made super shots
-                    madeSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                           (df_currSquadShots['period'] == qq+1) & 
-                                                           (df_currSquadShots['scoreName'] == '2pt Goal'),
-                                                           ['roundNo']].count()[0])
-                    #Missed standard shots
-                    missedSuper.append(df_currSquadShots.loc[(df_currSquadShots['roundNo'] == rr+1) & 
-                                                             (df_currSquadShots['period'] == qq+1) & 
-                                                             (df_currSquadShots['scoreName'] == '2pt Miss'),
-                                                             ['roundNo']].count()[0])
-        
-            
-            #Calculate made and missed shots from the different zones for beta distributions
-            totalMadeStandard = np.sum(madeStandard)
-            totalMissedStandard = np.sum(missedStandard)
-            totalMadeSuper = np.sum(madeSuper)
-            totalMissedSuper = np.sum(missedSuper)
-            
-            #Calculate the opponents score for different super shot proportions
-            #using the team B number of shots
-            
-            #Loop through the proportions
-            for pp in range(len(compProps)):
-                
-                #Set variable for total score and shots
-                oppScore = list()
-                oppShots = list()
-                oppSuperShots = list()
-                oppStandardShots = list()
-                oppSuperProp = list()
-                oppStandardOutcomes = list()
-                oppSuperOutcomes = list()
+                #Loop through the proportions
+                for pp in range(len(compProps)):
                 
-                #Loop through the number of simulations
-                for nn in range(nSims):
-                    
-                    #Set standard and super shot proportions
-                    superProp = compProps[pp]
-                    standardProp = 1 - superProp
-                    
-                    #Calculate number of standard and super shots to 'take'
-                    superShots = np.around(teamShotsB[nn] * superProp)
-                    standardShots = teamShotsB[nn] - superShots
+                    #Within each proportion we duplicate the opposition results
+                    #so that they can be compared to each of the other teams
+                    #simulated proportions
+                    propSims = slice(pp*nSims, (pp+1)*nSims)
+                    oppScore = oppScores['score'][propSims] * len(compProps)
+                    oppShots = oppScores['shots'][propSims] * len(compProps)
+                    oppSuperShots = oppScores['superShots'][propSims] * len(compProps)
+                    oppStandardShots = oppScores['standardShots'][propSims] * len(compProps)
+                    oppSuperProp = oppScores['superProp'][propSims] * len(compProps)
+                    oppStandardOutcomes = oppScores['standardOutcomes'][propSims] * len(compProps)
+                    oppSuperOutcomes = oppScores['superOutcomes'][propSims] * len(compProps)
                     
-                    #Set variable to tally current score
-                    currOppScore = 0
-                    
-                    #Set list to store standard shot outcomes in
-                    standardOutcomes = []                    
-                    #Loop through standard shots and add to total
-                    if standardShots > 0:
-                        #Sample shot success probability from teams data
-                        shotProb = np.random.beta(totalMadeStandard, totalMissedStandard,
-                                                  size = int(standardShots))
-                        #Loop through shots
-                        for ss in range(0,int(standardShots)):
-                            #Get random number to determine shot success
-                            r = random.random()
-                            #Check shot success and add to total points if successful
-                            if r < shotProb[ss]:
-                                #Add to opp score
-                                currOppScore = currOppScore + 1
-                                #Append outcome to list
-                                standardOutcomes.append('made')
-                            else:
-                                #Append outcome to list
-                                standardOutcomes.append('miss')
-                    
-                    #Set list to store standard shot outcomes in
-                    superOutcomes = []
-                    #Loop through super shots and add to total
-                    if superShots > 0:
-                        #Sample shot success probability from teams data
-                        shotProb = np.random.beta(totalMadeSuper, totalMissedSuper,
-                                                  size = int(superShots))
-                        #Loop through shots
-                        for ss in range(0,int(superShots)):
-                            #Get random number to determine shot success
-                            r = random.random()
-                            #Check shot success and add to total points if successful
-                            if r < shotProb[ss]:
-                                #Add to opp score
-                                currOppScore = currOppScore + 2
-                                #Append outcome to list
-                                superOutcomes.append('made')
-                            else:
-                                #Append outcome to list
-                                superOutcomes.append('miss')
-                                
-                    #Append data to team list
-                    oppScore.append(currOppScore)
-                    oppShots.append(teamShotsB[nn])
-                    oppSuperShots.append(superShots)
-                    oppStandardShots.append(standardShots)
-                    oppSuperProp.append(compProps[pp])
-                    oppStandardOutcomes.append(standardOutcomes)
-                    oppSuperOutcomes.append(superOutcomes)
-                    
-                #Within each proportion we duplicate the opposition results
-                #so that they can be compared to each of the other teams
-                #simulated proportions
-                oppScore = oppScore * len(compProps)
-                oppShots = oppShots * len(compProps)
-                oppSuperShots = oppSuperShots * len(compProps)
-                oppStandardShots = oppStandardShots * len(compProps)
-                oppSuperProp = oppSuperProp * len(compProps)
-                oppStandardOutcomes = oppStandardOutcomes * len(compProps)
-                oppSuperOutcomes = oppSuperOutcomes * len(compProps)
-                    
-                #Calculate margin between current opponent proportion and all team scores
-                #Append to the data dictionary
-                for kk in range(len(teamScore)):
-    
-                    #Main team
-                    compSimResults['teamName'].append(teamList[tt])
-                    compSimResults['teamSuperProp'].append(teamSuperProp[kk])
-                    compSimResults['teamShots'].append(teamShots[kk])
-                    compSimResults['teamSuperShots'].append(teamSuperShots[kk])
-                    compSimResults['teamStandardShots'].append(teamStandardShots[kk])
-                    compSimResults['teamShotOutcomeStandard'].append(teamStandardOutcomes[kk])
-                    compSimResults['teamShotOutcomeSuper'].append(teamSuperOutcomes[kk])
-                    #Opponent team
-                    compSimResults['opponentName'].append(teamList[cc])
-                    compSimResults['opponentSuperProp'].append(oppSuperProp[kk])
-                    compSimResults['opponentShots'].append(oppShots[kk])
-                    compSimResults['opponentSuperShots'].append(oppSuperShots[kk])
-                    compSimResults['opponentStandardShots'].append(oppStandardShots[kk])
-                    compSimResults['opponentShotOutcomeStandard'].append(oppStandardOutcomes[kk])
-                    compSimResults['opponentShotOutcomeSuper'].append(oppSuperOutcomes[kk])
-                    #Scoring
-                    compSimResults['teamScore'].append(teamScore[kk])
-                    compSimResults['opponentScore'].append(oppScore[kk])
-                    compSimResults['margin'].append(teamScore[kk] - oppScore[kk])
-    
-    #Convert 'competitive' sim results to dataframe
-    df_compSimResults = pd.DataFrame.from_dict(compSimResults)
-    
-    #Write competitive sim results to file
-    df_compSimResults.to_csv('..\\competitiveSims\\tables\\compSimResults_all.csv',
-                             index = False)
+                    #Calculate margin between current opponent proportion and all team scores
+                    #Append to the data dictionary
+                    for kk in range(len(teamScore)):
+    
+                        #Main team
+                        compSimResults['teamName'].append(teamList[tt])
+                        compSimResults['teamSuperProp'].append(teamSuperProp[kk])
+                        compSimResults['teamShots'].append(teamShots[kk])
+                        compSimResults['teamSuperShots'].append(teamSuperShots[kk])
+                        compSimResults['teamStandardShots'].append(teamStandardShots[kk])
+                        compSimResults['teamShotOutcomeStandard'].append(teamStandardOutcomes[kk])
+                        compSimResults['teamShotOutcomeSuper'].append(teamSuperOutcomes[kk])
+                        #Opponent team
+                        compSimResults['opponentName'].append(teamList[cc])
+                        compSimResults['opponentSuperProp'].append(oppSuperProp[kk])
+                        compSimResults['opponentShots'].append(oppShots[kk])
+                        compSimResults['opponentSuperShots'].append(oppSuperShots[kk])
+                        compSimResults['opponentStandardShots'].append(oppStandardShots[kk])
+                        compSimResults['opponentShotOutcomeStandard'].append(oppStandardOutcomes[kk])
+                        compSimResults['opponentShotOutcomeSuper'].append(oppSuperOutcomes[kk])
+                        #Scoring
+                        compSimResults['teamScore'].append(teamScore[kk])
+                        compSimResults['opponentScore'].append(oppScore[kk])
+                        compSimResults['margin'].append(teamScore[kk] - oppScore[kk])
+        
+        #Convert 'competitive' sim results to dataframe
+        df_compSimResults = pd.DataFrame.from_dict(compSimResults)
+    
+    #Replace the lists of shot outcomes with typed made shot counts and masks
+    if typedSimResults and not onlineCompSims and df_compSimResults is not None:
+        df_compSimResults = simHelper.getTypedResults(df_compSimResults)
+    
+    #Store the counts of each score and margin of each match up
+    if histogramCompSims and not onlineCompSims:
+        compSimHistograms = simHelper.getSimHistograms(df_compSimResults, teamList, compProps)
+        simHelper.saveSimHistograms(compSimHistograms, '..\\competitiveSims\\tables\\compSimHistograms_all.npz')
+    
+    #Write competitive sim results to file, unless they were streamed to file,
+    #stored as counts or only the running summaries were kept
+    if not onlineCompSims and not histogramCompSims and not (vectorizedCompSims and streamSimResults):
+        if typedSimResults:
+            df_compSimResults.to_feather('..\\competitiveSims\\tables\\compSimResults_all.feather')
+        else:
+            df_compSimResults.to_csv('..\\competitiveSims\\tables\\compSimResults_all.csv',
+                                     index = False)
 
 else:
     
     #Define competitive proportions for later use
     compProps = np.array([0.0,0.25,0.50,0.75,1.0])
     
-    #Load existing data
-    df_compSimResults = pd.read_csv('..\\competitiveSims\\tables\\compSimResults_all.csv')
+    #Load existing data, or the running summaries if only these were kept
+    if onlineCompSims:
+        compSimSummary = simHelper.loadSimSummary('..\\competitiveSims\\tables\\compSimSummary_all.npz')
+        df_compSimResults = None
+    elif histogramCompSims:
+        compSimHistograms = simHelper.loadSimHistograms('..\\competitiveSims\\tables\\compSimHistograms_all.npz')
+        df_compSimResults = simHelper.getHistogramResults(compSimHistograms)
+    elif vectorizedCompSims and streamSimResults:
+        df_compSimResults = None
+    elif typedSimResults:
+        df_compSimResults = pd.read_feather('..\\competitiveSims\\tables\\compSimResults_all.feather')
+    else:
+        df_compSimResults = pd.read_csv('..\\competitiveSims\\tables\\compSimResults_all.csv')
 
 # %% Visualise 'competitive' sims
 
 #Set a check in place for whether to create standard sim visuals
 visCompSims = False ##### change to True to re-do visuals
 
-if visCompSims:
+#Load the streamed sim results for the figures and margins, which use every result
+if (visCompSims or matchupViewCompSims) and df_compSimResults is None and not onlineCompSims:
+    df_compSimResults = pd.read_parquet('..\\competitiveSims\\tables\\compSimResults_all.parquet')
+
+if visCompSims and onlineCompSims:
+    
+    #There are no sim results for the figures or margins with only the running
+    #summaries kept
+    print('Visuals not available, as only the running summaries of the sims are kept (see onlineCompSims).')
+    df_compSimMargins = None
+
+elif visCompSims:
 
     # Firstly, compare each relevant match up between teams to see how these
     # individual comparisons shake out. A better comparison here though is looking
     # at each teams match-up against everyone else in total -- which gives an idea
     # of overall strategy for each team.
     
+    #Set the results to plot from, indexed by match up and proportions if needed
+    if indexedCompSims:
+        compSimResults = simHelper.SimResultsIndex(df_compSimResults, teamList, compProps)
+    else:
+        compSimResults = df_compSimResults
+    
     #Compare individual teams over each iteration of 'match-ups'
     for tt in range(len(teamList)):
         for cc in range(len(teamList)):
@@ -2175,18 +1702,18 @@ if visCompSims:
                 team2 = teamList[cc]
                 
                 #Plot figure
-                figHelper.indCompSimVis(df_compSimResults, team1, team2, compProps, colourDict,
+                figHelper.indCompSimVis(compSimResults, team1, team2, compProps, colourDict,
                                        tt, cc, saveDir = '..\\competitiveSims\\figures')
     
     #Compare each teams match-ups against all other teams
     for tt in range(len(teamList)):
         
         #Plot figure
-        figHelper.allCompSimVis(df_compSimResults, teamList[tt], compProps, colourDict,
+        figHelper.allCompSimVis(compSimResults, teamList[tt], compProps, colourDict,
                                 saveDir = '..\\competitiveSims\\figures')
         
     #Compare grouped results across all teams for super shot proportions
-    figHelper.groupedCompSimVis(df_compSimResults, compProps,
+    figHelper.groupedCompSimVis(compSimResults, compProps,
                                 saveDir = '..\\competitiveSims\\figures')
     
     #Visualise 'competitive' sim margins for each team
@@ -2194,118 +1721,86 @@ if visCompSims:
     #This firstly requires the data to be manipulated into a dataframe with specific
     #variables and columns to suit the seaborn package
     
-    #Create dictionary to append these data to
-    marginDict = {'teamName': [], 'teamSuperProp': [],
-                  'opponentName': [], 'opponentSuperProp': [],
-                  'margin': [],
-                  'teamShots': [], 'teamSuperShots': [], 'teamStandardShots': [],
-                  'teamShootingPer': [], 'teamStandardShootingPer': [], 'teamSuperShootingPer': [],
-                  'opponentShots': [], 'opponentSuperShots': [], 'opponentStandardShots': [],
-                  'opponentShootingPer': [], 'opponentStandardShootingPer': [], 'opponentSuperShootingPer': []}
-    
-    #Loop through teams and extract their margin results and the proportions
-    for tt in range (len(teamList)):
-        
-        #Extract teams data
-        #This is done separately given the need to modify margin
-        df_currTeam1 = df_compSimResults.loc[(df_compSimResults['teamName'] == teamList[tt]),]
-        df_currTeam2 = df_compSimResults.loc[(df_compSimResults['opponentName'] == teamList[tt]),]
-        df_currTeam1.reset_index(inplace = True)
-        df_currTeam2.reset_index(inplace = True)
-        
-        #Calculate shooting percentage outcomes for each dataframe
-        #Get counts of each made list
-        standardTeam1 = []
-        superTeam1 = []
-        standardTeam2 = []
-        superTeam2 = []
-        standardOpp1 = []
-        superOpp1 = []
-        standardOpp2 = []
-        superOpp2 = []
-        for cc in range(len(df_currTeam1)):
-            standardTeam1.append(df_currTeam1['teamShotOutcomeStandard'][cc].count('made'))
-            superTeam1.append(df_currTeam1['teamShotOutcomeSuper'][cc].count('made'))
-            standardOpp1.append(df_currTeam1['opponentShotOutcomeStandard'][cc].count('made'))
-            superOpp1.append(df_currTeam1['opponentShotOutcomeSuper'][cc].count('made'))
-        for cc in range(len(df_currTeam2)):
-            standardTeam2.append(df_currTeam2['teamShotOutcomeStandard'][cc].count('made'))
-            superTeam2.append(df_currTeam2['teamShotOutcomeSuper'][cc].count('made'))
-            standardOpp2.append(df_currTeam2['opponentShotOutcomeStandard'][cc].count('made'))
-            superOpp2.append(df_currTeam2['opponentShotOutcomeSuper'][cc].count('made'))
-        #Calculate shooting percentages at each simulation
-        standardPerTeam1 = standardTeam1 / df_currTeam1['teamStandardShots']
-        superPerTeam1 = superTeam1 / df_currTeam1['teamSuperShots']
-        allPerTeam1 = [x + y for x, y in zip(standardTeam1, superTeam1)] / df_currTeam1['teamShots']
-        standardPerTeam2 = standardTeam2 / df_currTeam2['teamStandardShots']
-        superPerTeam2 = superTeam2 / df_currTeam2['teamSuperShots']
-        allPerTeam2 = [x + y for x, y in zip(standardTeam2, superTeam2)] / df_currTeam2['teamShots']
-        standardPerOpp1 = standardOpp1 / df_currTeam1['opponentStandardShots']
-        superPerOpp1 = superOpp1 / df_currTeam1['opponentSuperShots']
-        allPerOpp1 = [x + y for x, y in zip(standardOpp1, superOpp1)] / df_currTeam1['opponentShots']
-        standardPerOpp2 = standardOpp2 / df_currTeam2['opponentStandardShots']
-        superPerOpp2 = superOpp2 / df_currTeam2['opponentSuperShots']
-        allPerOpp2 = [x + y for x, y in zip(standardOpp2, superOpp2)] / df_currTeam2['opponentShots']
-        
-        #Add data to dictionary
-        #First dataframe - use normal margin and 'team' data
-        marginDict['teamName'].extend(list(df_currTeam1['teamName'].values))
-        marginDict['teamSuperProp'].extend(list(df_currTeam1['teamSuperProp'].values))
-        marginDict['opponentName'].extend(list(df_currTeam1['opponentName'].values))
-        marginDict['opponentSuperProp'].extend(list(df_currTeam1['opponentSuperProp'].values))
-        marginDict['margin'].extend(list(df_currTeam1['margin'].values))
-        marginDict['teamShots'].extend(list(df_currTeam1['teamShots'].values))
-        marginDict['teamSuperShots'].extend(list(df_currTeam1['teamSuperShots'].values))
-        marginDict['teamStandardShots'].extend(list(df_currTeam1['teamStandardShots'].values))
-        marginDict['teamShootingPer'].extend(allPerTeam1)
-        marginDict['teamStandardShootingPer'].extend(standardPerTeam1)
-        marginDict['teamSuperShootingPer'].extend(superPerTeam1)
-        marginDict['opponentShots'].extend(list(df_currTeam1['opponentShots'].values))
-        marginDict['opponentSuperShots'].extend(list(df_currTeam1['opponentSuperShots'].values))
-        marginDict['opponentStandardShots'].extend(list(df_currTeam1['opponentStandardShots'].values))
-        marginDict['opponentShootingPer'].extend(allPerOpp1)
-        marginDict['opponentStandardShootingPer'].extend(standardPerOpp1)
-        marginDict['opponentSuperShootingPer'].extend(superPerOpp1)
-        #Second dataframe - invert margin and use 'opponent' data
-        marginDict['teamName'].extend(list(df_currTeam2['opponentName'].values))
-        marginDict['teamSuperProp'].extend(list(df_currTeam2['opponentSuperProp'].values))
-        marginDict['opponentName'].extend(list(df_currTeam2['teamName'].values))
-        marginDict['opponentSuperProp'].extend(list(df_currTeam2['teamSuperProp'].values))
-        marginDict['margin'].extend(list(df_currTeam2['margin'].values*-1))
-        marginDict['teamShots'].extend(list(df_currTeam2['opponentShots'].values))
-        marginDict['teamSuperShots'].extend(list(df_currTeam2['opponentSuperShots'].values))
-        marginDict['teamStandardShots'].extend(list(df_currTeam2['opponentStandardShots'].values))
-        marginDict['teamShootingPer'].extend(allPerOpp2)
-        marginDict['teamStandardShootingPer'].extend(standardPerOpp2)
-        marginDict['teamSuperShootingPer'].extend(superPerOpp2)
-        marginDict['opponentShots'].extend(list(df_currTeam2['teamShots'].values))
-        marginDict['opponentSuperShots'].extend(list(df_currTeam2['teamSuperShots'].values))
-        marginDict['opponentStandardShots'].extend(list(df_currTeam2['teamStandardShots'].values))
-        marginDict['opponentShootingPer'].extend(allPerTeam2)
-        marginDict['opponentStandardShootingPer'].extend(standardPerTeam2)
-        marginDict['opponentSuperShootingPer'].extend(superPerTeam2)
-        
-    #Convert to dataframe
-    df_compSimMargins = pd.DataFrame.from_dict(marginDict)
+    #Get the margins from both sides of each result from the stored counts. The
+    #shots and shooting percentages of each sim aren't kept in the counts
+    if histogramCompSims:
+        df_compSimMargins = simHelper.getHistogramResults(compSimHistograms, bothOrientations = True)
     
-    #Export to file
-    df_compSimMargins.to_csv('..\\competitiveSims\\tables\\compSimMargins_all.csv',
-                             index = False)
+    #Get a view of the margins from both sides of each result
+    elif matchupViewCompSims:
+        compSimMatchups = simHelper.MatchupView(df_compSimResults, teamList)
+    
+    #Otherwise get the margins and shooting percentages from each result
+    else:
+        df_compSimMargins = simHelper.getSimMargins(df_compSimResults, teamList)
+    
+    #Export to file, unless the results are stored as counts or viewed
+    if not histogramCompSims and not matchupViewCompSims:
+        df_compSimMargins.to_csv('..\\competitiveSims\\tables\\compSimMargins_all.csv',
+                                 index = False)
     
     #Visualise the margins for each team and super shot proportions
-    figHelper.marginCompSimVis(df_compSimMargins, compProps, colourDict,
-                               saveDir = '..\\competitiveSims\\figures')
+    if matchupViewCompSims and not histogramCompSims:
+        figHelper.marginCompSimVis(compSimMatchups, compProps, colourDict,
+                                   saveDir = '..\\competitiveSims\\figures')
+    else:
+        figHelper.marginCompSimVis(df_compSimMargins, compProps, colourDict,
+                                   saveDir = '..\\competitiveSims\\figures')
     
 else:
     
-    #Load existing data
-    df_compSimMargins = pd.read_csv('..\\competitiveSims\\tables\\compSimMargins_all.csv')
+    #Load existing data. There are no margins with only the running summaries kept
+    if onlineCompSims:
+        df_compSimMargins = None
+    elif histogramCompSims:
+        df_compSimMargins = simHelper.getHistogramResults(compSimHistograms, bothOrientations = True)
+    elif matchupViewCompSims:
+        compSimMatchups = simHelper.MatchupView(df_compSimResults, teamList)
+    else:
+        df_compSimMargins = pd.read_csv('..\\competitiveSims\\tables\\compSimMargins_all.csv')
 
 # %% Collate competitive sim results
 
 #Generate a table with each teams margin +/- 95% CI's for the different proportions
 #Generate a similar looking table that records win proportion for each of these comparisons
 
+#Set whether to calculate the margins exactly from each teams score distributions
+#rather than from the sim results. This gives the mean margins and win and loss
+#proportions without any sampling, so no CI's are given for the margins
+exactCompSummaries = False
+
+if exactCompSummaries:
+    
+    #Get the chance of each pair of team and opponent shots from the league values
+    shotPairs = simHelper.getShotCountPairPmf(leagueShotsM, leagueShotsSD,
+                                              leaguePropsM, leaguePropsSD)
+    
+    #Get the exact margin distributions and summary of each match up
+    marginVals, marginPmfs = simHelper.getMarginPmfs(teamShotStats = compShotStats,
+                                                     compProps = compProps,
+                                                     shotPairs = shotPairs)
+    df_compMarginSummary = pd.DataFrame.from_dict(simHelper.getMarginSummary(marginVals, marginPmfs,
+                                                                             teamList, compProps))
+    
+    #Export the margin summary of each match up
+    df_compMarginSummary.to_csv('..\\competitiveSims\\tables\\compSimMarginsExact_all.csv',
+                                index = False)
+
+#Get the summaries of the margins from the stored counts
+if histogramCompSims and not onlineCompSims:
+    compSimSummary = simHelper.getHistogramSummary(compSimHistograms)
+
+#Get the summaries of the margins from the counts of the streamed results, reading
+#the results back one chunk at a time
+elif not exactCompSummaries and not onlineCompSims and df_compSimResults is None:
+    compSimSummary = simHelper.getHistogramSummary(simHelper.getStreamedHistograms('..\\competitiveSims\\tables\\compSimResults_all.parquet',
+                                                                                   teamList, compProps))
+
+#Index the results by match up and proportions if they're taken from the results
+if indexedCompSims and not (exactCompSummaries or onlineCompSims or histogramCompSims or matchupViewCompSims or
+                            df_compSimResults is None):
+    compSimIndex = simHelper.SimResultsIndex(df_compSimResults, teamList, compProps)
+
 #Set lists to store data in
 rowCats = []
 
@@ -2328,23 +1823,62 @@ for tt in range(len(teamList)):
                 rowLabel = 'Team '+str(int(compProps[p1]*100))+'% / '+'Opp. '+str(int(compProps[p2]*100))+'%'
                 rowCats.append(rowLabel)
             
-            #Extract current teams data and the relevant proportions
-            #Note this is done separately to account for the fact that sometimes
-            #the current team might be the 'team' or the 'opponent'
-            df_currComp1 = df_compSimResults.loc[(df_compSimResults['teamName'] == teamList[tt]) &
-                                                 (df_compSimResults['teamSuperProp'] == compProps[p2])&
-                                                 (df_compSimResults['opponentName'] != teamList[tt]) &
-                                                 (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
-            df_currComp2 = df_compSimResults.loc[(df_compSimResults['opponentName'] == teamList[tt]) &
-                                                 (df_compSimResults['opponentSuperProp'] == compProps[p2]) &
-                                                 (df_compSimResults['teamName'] != teamList[tt]) &
-                                                 (df_compSimResults['teamSuperProp'] == compProps[p1]),]
-            #For the second dataframe, the margin needs to be flipped to be
-            #relative to the current team of interest
-            df_currComp2['margin'] = df_currComp2['margin'] * -1
+            #Get the exact results averaged across the opponents
+            if exactCompSummaries:
+                df_currComp = df_compMarginSummary.loc[(df_compMarginSummary['teamName'] == teamList[tt]) &
+                                                       (df_compMarginSummary['teamSuperProp'] == compProps[p2]) &
+                                                       (df_compMarginSummary['opponentSuperProp'] == compProps[p1]),]
+                winProps.append(df_currComp['winProb'].mean())
+                lossProps.append(df_currComp['lossProb'].mean())
+                summData.append('{:.2f}'.format(df_currComp['marginMean'].mean()))
+                continue
             
-            #Now the two dataframes can be concatenated together
-            df_currComp = pd.concat([df_currComp1,df_currComp2])
+            #Get the results from the running summaries or counts, pooled across the opponents
+            if onlineCompSims or histogramCompSims or df_compSimResults is None:
+                pooledSummary = compSimSummary.getPooledSummary(tt, p2, p1)
+                winProps.append(pooledSummary['winProb'])
+                lossProps.append(pooledSummary['lossProb'])
+                marginM = pooledSummary['marginMean']
+                marginCI_plus = pooledSummary['marginMean'] + (1.96 * (pooledSummary['marginSD'] / np.sqrt(nSims)))
+                marginCI_minus = pooledSummary['marginMean'] - (1.96 * (pooledSummary['marginSD'] / np.sqrt(nSims)))
+                summData.append('{:.2f}'.format(marginM)+' ['+'{:.2f}'.format(marginCI_minus)+', '+
+                                '{:.2f}'.format(marginCI_plus)+']')
+                continue
+            
+            #Get the current teams data and the relevant proportions from both
+            #sides of the match ups in the view of the results
+            if matchupViewCompSims:
+                df_currComp = compSimMatchups.getMatchups(teamName = teamList[tt],
+                                                          teamSuperProp = compProps[p2],
+                                                          opponentSuperProp = compProps[p1])
+            
+            else:
+                
+                #Extract current teams data and the relevant proportions
+                #Note this is done separately to account for the fact that sometimes
+                #the current team might be the 'team' or the 'opponent'
+                if indexedCompSims:
+                    df_currComp1 = compSimIndex.getCells(teamName = teamList[tt],
+                                                         teamSuperProp = compProps[p2],
+                                                         opponentSuperProp = compProps[p1])
+                    df_currComp2 = compSimIndex.getCells(opponentName = teamList[tt],
+                                                         opponentSuperProp = compProps[p2],
+                                                         teamSuperProp = compProps[p1])
+                else:
+                    df_currComp1 = df_compSimResults.loc[(df_compSimResults['teamName'] == teamList[tt]) &
+                                                         (df_compSimResults['teamSuperProp'] == compProps[p2])&
+                                                         (df_compSimResults['opponentName'] != teamList[tt]) &
+                                                         (df_compSimResults['opponentSuperProp'] == compProps[p1]),]
+                    df_currComp2 = df_compSimResults.loc[(df_compSimResults['opponentName'] == teamList[tt]) &
+                                                         (df_compSimResults['opponentSuperProp'] == compProps[p2]) &
+                                                         (df_compSimResults['teamName'] != teamList[tt]) &
+                                                         (df_compSimResults['teamSuperProp'] == compProps[p1]),]
+                #For the second dataframe, the margin needs to be flipped to be
+                #relative to the current team of interest
+                df_currComp2['margin'] = df_currComp2['margin'] * -1
+                
+                #Now the two dataframes can be concatenated together
+                df_currComp = pd.concat([df_currComp1,df_currComp2])
             
             #Calculate proportion of wins & losses for current 'team'
             winProps.append(sum(n > 0 for n in list(df_currComp['margin'])) / len(df_currComp['margin']))